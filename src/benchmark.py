@@ -0,0 +1,790 @@
+import re
+import sys
+import json
+import platform
+import time
+import random
+import os
+import argparse
+import tempfile
+import subprocess
+from expression_parser import ExpressionParser, TERM_PATTERN
+from root_finder import find_roots
+from sturm import SturmSequence
+from solver import Solver
+from polynomial import Polynomial
+from formatter import OutputFormatter
+from numeric import sqrt, nth_root, _sqrt_newton, _nth_root_newton
+from pipeline import iter_records, iter_equations, solve_record
+from parallel import solve_parallel, solve_threaded
+from client import SolverClient
+from session import SolveSession
+from evaluation import evaluate
+from mapped_reader import mapped_file, iter_mapped_lines, iter_mapped_records
+from pipeline import iter_terms_records
+from structured_input import (
+    reduce_terms, pack_terms, iter_json_equations, iter_array_equations,
+    iter_packed_equations, INPUT_MAGIC,
+)
+
+
+def _time_call(func, *args, repeat=5):
+    """Best wall time of several runs, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def _random_side(rng, term_count, max_degree):
+    terms = []
+    for i in range(term_count):
+        coef = f"{rng.uniform(0, 100):.3f}"
+        sign = rng.choice("+-")
+        if i == 0:
+            sign = "-" if sign == "-" else ""
+        terms.append(f"{sign} {coef} * X^{rng.randint(0, max_degree)}")
+    return " ".join(terms)
+
+
+def _legacy_parse(equation_str):
+    """Regex + reconstruction parser this tree used before the lexer"""
+    equation = equation_str.replace(" ", "")
+    if not re.match(r'^[0-9\+\-\*\.\^X=]+$', equation):
+        raise ValueError("Invalid equation: contains invalid characters")
+    left, right = equation.split("=")
+    return _legacy_extract_terms(left), _legacy_extract_terms(right)
+
+
+def _legacy_extract_terms(expression):
+    matches = list(re.finditer(TERM_PATTERN, expression))
+    reconstructed = ""
+    for i, match in enumerate(matches):
+        sign = match.group(1)
+        if i == 0 and sign == '+':
+            sign = ''
+        elif i > 0 and sign == '':
+            sign = '+'
+        reconstructed += sign + match.group(2) + "*X^" + match.group(3)
+    expr_clean = expression[1:] if expression.startswith('+') else expression
+    recon_clean = reconstructed[1:] if reconstructed.startswith('+') else reconstructed
+    if expr_clean != recon_clean:
+        raise ValueError("Invalid equation format: expression contains invalid terms")
+    terms = {}
+    for match in matches:
+        coef = float(match.group(2))
+        if match.group(1) == '-':
+            coef = -coef
+        exp = int(match.group(3))
+        terms[exp] = terms.get(exp, 0) + coef
+    return terms
+
+
+def bench_lexer(args):
+    """Legacy regex parser against the single-pass lexer"""
+    rng = random.Random(args.seed)
+    parser = ExpressionParser(cache_size=0)
+
+    print(f"{'terms':>8} {'legacy ms':>12} {'lexer ms':>12} {'speedup':>8}")
+    for term_count in (10, 1_000, 100_000):
+        equation = (
+            _random_side(rng, term_count, 2) + " = " + _random_side(rng, term_count, 2)
+        )
+        assert _legacy_parse(equation) == parser.parse(equation)
+
+        repeat = 5 if term_count < 100_000 else 3
+        legacy = _time_call(_legacy_parse, equation, repeat=repeat)
+        lexer = _time_call(parser.parse, equation, repeat=repeat)
+        print(
+            f"{term_count:>8} {legacy * 1e3:>12.3f} {lexer * 1e3:>12.3f} "
+            f"{legacy / lexer:>7.2f}x"
+        )
+
+
+def bench_roots(args):
+    """Aberth-Ehrlich time per polynomial across degrees 3-500"""
+    rng = random.Random(args.seed)
+
+    print(f"{'degree':>7} {'ms/poly':>10} {'iterations':>11} {'max error':>10}")
+    for degree in (3, 5, 10, 20, 50, 100, 200, 350, 500):
+        polys = [
+            [rng.uniform(-1, 1) for _ in range(degree)] + [rng.uniform(0.5, 1)]
+            for _ in range(max(1, 200 // degree))
+        ]
+        start = time.perf_counter()
+        results = [find_roots(coefficients) for coefficients in polys]
+        elapsed = (time.perf_counter() - start) / len(polys)
+
+        iterations = max(result.iterations for result in results)
+        max_error = max(max(result.errors) for result in results)
+        print(f"{degree:>7} {elapsed * 1e3:>10.3f} {iterations:>11} {max_error:>10.1e}")
+
+
+def bench_sturm(args):
+    """Sturm counting and real root isolation against a full Aberth solve"""
+    rng = random.Random(args.seed)
+
+    print(
+        f"{'degree':>7} {'real':>5} {'count ms':>9} {'real ms':>8} "
+        f"{'aberth ms':>10} {'count x':>8} {'real x':>7}"
+    )
+    for degree in (5, 10, 20, 50, 100, 200, 350):
+        polys = [
+            [rng.uniform(-1, 1) for _ in range(degree)] + [rng.uniform(0.5, 1)]
+            for _ in range(max(1, 100 // degree))
+        ]
+
+        def count_all():
+            return [SturmSequence(coefficients).count() for coefficients in polys]
+
+        def real_all():
+            return [SturmSequence(coefficients).real_roots() for coefficients in polys]
+
+        def aberth_all():
+            return [find_roots(coefficients) for coefficients in polys]
+
+        real = sum(count_all()) / len(polys)
+        count_time = _time_call(count_all, repeat=3) / len(polys)
+        real_time = _time_call(real_all, repeat=3) / len(polys)
+        aberth_time = _time_call(aberth_all, repeat=1) / len(polys)
+        print(
+            f"{degree:>7} {real:>5.1f} {count_time * 1e3:>9.2f} {real_time * 1e3:>8.2f} "
+            f"{aberth_time * 1e3:>10.2f} {aberth_time / count_time:>7.1f}x "
+            f"{aberth_time / real_time:>6.1f}x"
+        )
+
+
+def bench_closed_form(args):
+    """Closed-form cubic and quartic solves against Aberth iteration"""
+    rng = random.Random(args.seed)
+
+    print(f"{'degree':>7} {'closed us':>10} {'aberth us':>10} {'speedup':>8} {'fallbacks':>10}")
+    for degree in (3, 4):
+        solvers = [
+            Solver({k: rng.uniform(-1, 1) * 10 ** rng.uniform(-3, 3) for k in range(degree + 1)})
+            for _ in range(2000)
+        ]
+
+        def closed_all():
+            return [(s.solve_degree_3() if degree == 3 else s.solve_degree_4()) for s in solvers]
+
+        def aberth_all():
+            return [s._solve_higher_degree() for s in solvers]
+
+        fallbacks = sum(result[0] == "numeric" for result in closed_all())
+        closed = _time_call(closed_all, repeat=3) / len(solvers)
+        aberth = _time_call(aberth_all, repeat=3) / len(solvers)
+        print(
+            f"{degree:>7} {closed * 1e6:>10.1f} {aberth * 1e6:>10.1f} "
+            f"{aberth / closed:>7.2f}x {fallbacks:>10}"
+        )
+
+
+def bench_evaluate(args):
+    """Vectorized Horner evaluation against a per-point loop"""
+    import numpy as np
+    rng = random.Random(args.seed)
+
+    print(f"{'degree':>7} {'points':>8} {'loop ms':>9} {'vector ms':>10} {'speedup':>8}")
+    for degree in (2, 10, 100):
+        coefficients = [rng.uniform(-1, 1) for _ in range(degree + 1)]
+        for count in (100, 10_000):
+            points = np.linspace(-1, 1, count)
+            scalars = points.tolist()
+
+            def loop():
+                return [evaluate(coefficients, x, derivative=True) for x in scalars]
+
+            def vector():
+                return evaluate(coefficients, points, derivative=True)
+
+            loop_time = _time_call(loop, repeat=3)
+            vector_time = _time_call(vector, repeat=3)
+            print(
+                f"{degree:>7} {count:>8} {loop_time * 1e3:>9.2f} {vector_time * 1e3:>10.3f} "
+                f"{loop_time / vector_time:>7.1f}x"
+            )
+
+
+def bench_solve_many(args):
+    """Vectorized Solver.solve_many against a per-equation Solver loop"""
+    import numpy as np
+
+    rng = np.random.default_rng(args.seed)
+    count = 1_000_000
+    a, b, c = (rng.uniform(-10, 10, count) for _ in range(3))
+    # Degenerate lanes exercise the masks
+    a[::50] = 0
+    b[::200] = 0
+
+    loop_count = 50_000
+    lanes = list(zip(a[:loop_count].tolist(), b.tolist(), c.tolist()))
+    start = time.perf_counter()
+    for a_i, b_i, c_i in lanes:
+        Solver({2: a_i, 1: b_i, 0: c_i}).solve()
+    loop = (time.perf_counter() - start) / loop_count
+
+    vectorized = _time_call(Solver.solve_many, a, b, c, repeat=3) / count
+
+    print(f"loop:       {loop * 1e9:>10.1f} ns/equation")
+    print(f"solve_many: {vectorized * 1e9:>10.1f} ns/equation")
+    print(f"speedup:    {loop / vectorized:>10.1f}x")
+
+
+def bench_escalation(args):
+    """Share of quadratics solved exactly, its cost, and the double roots it finds"""
+    rng = random.Random(args.seed)
+    parser = ExpressionParser(strict_mode=True)
+    uniform, close, doubles = [], [], []
+    for _ in range(args.count):
+        uniform.append(Polynomial({k: rng.uniform(-10, 10) for k in range(3)}))
+    for _ in range(args.count // 10):
+        # Roots 1e-9 apart, and double roots written to 3 decimals
+        r = rng.uniform(-10, 10)
+        close.append(Polynomial({2: 1.0, 1: -(2 * r + 1e-9), 0: r * (r + 1e-9)}))
+        r = round(r, 3)
+        sign = "+" if r < 0 else "-"
+        doubles.append(parser.parse_reduced(
+            f"1 * X^2 {sign} {abs(2 * r):.3f} * X^1 + {r * r:.6f} * X^0 = 0 * X^0"
+        ))
+
+    for label, equations in (("uniform", uniform), ("close roots", close), ("double roots", doubles)):
+        results = [Solver(equation).solve() for equation in equations]
+        escalated = [eq for eq, result in zip(equations, results) if result.escalated]
+        plain = [eq for eq, result in zip(equations, results) if not result.escalated]
+        zero = sum(result.solution_type == "zero" for result in results)
+        float_zero = sum(eq[1] * eq[1] == 4 * eq[2] * eq.get(0, 0.0) for eq in equations)
+        print(
+            f"{label}: {len(escalated)} of {len(equations)} escalated "
+            f"({len(escalated) / len(equations):.3%}), {zero} double roots "
+            f"({float_zero} from the float discriminant)"
+        )
+        for name, subset in (("float path", plain), ("escalated", escalated)):
+            if subset:
+                elapsed = _time_call(lambda: [Solver(eq).solve() for eq in subset], repeat=3)
+                print(f"  {name:>10}: {elapsed / len(subset) * 1e6:8.2f} us/equation")
+
+
+def _legacy_sqrt_iterations(x, precision=1e-18, cap=10_000):
+    """Iterations the old absolute-tolerance sqrt needed, None if it cycles"""
+    x_sqrt = x / 2
+    for iteration in range(1, cap + 1):
+        x_new = (x_sqrt + x / x_sqrt) / 2
+        if abs(x_new - x_sqrt) < precision:
+            return iteration
+        x_sqrt = x_new
+    return None
+
+
+def _ns_per_call(func, *args, calls=20_000):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func(*args)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def bench_sqrt(args):
+    """Iteration counts and ns/call of the numeric kernel over 1e-300..1e300"""
+    print(
+        f"{'x':>8} {'legacy it':>10} {'sqrt it':>8} {'sqrt ns':>8} "
+        f"{'cbrt it':>8} {'cbrt ns':>8}"
+    )
+    for power in range(-300, 301, 50):
+        x = 1.2345 * 10.0 ** power
+        legacy = _legacy_sqrt_iterations(x)
+        print(
+            f"{x:>8.0e} {legacy if legacy else 'cycles':>10} "
+            f"{_sqrt_newton(x)[1]:>8} {_ns_per_call(sqrt, x):>8.0f} "
+            f"{_nth_root_newton(x, 3)[1]:>8} {_ns_per_call(nth_root, x, 3):>8.0f}"
+        )
+
+
+def _quadratic_lines(rng, count):
+    lines = []
+    for _ in range(count):
+        a, b, c, d = (rng.uniform(0.1, 9) for _ in range(4))
+        lines.append(f"{c:.2f} * X^0 - {b:.2f} * X^1 + {a:.2f} * X^2 = {d:.2f} * X^0")
+    return lines
+
+
+def bench_parallel(args):
+    """Process-pool throughput at 1, 2, 4 and N workers"""
+    rng = random.Random(args.seed)
+    lines = _quadratic_lines(rng, 200_000)
+
+    start = time.perf_counter()
+    for _ in iter_records(lines):
+        pass
+    serial = time.perf_counter() - start
+    print(f"{'in-process':>10} {len(lines) / serial:>12.0f} equations/s")
+
+    cpus = os.cpu_count() or 1
+    for workers in sorted({1, 2, 4, cpus}):
+        start = time.perf_counter()
+        for _ in solve_parallel(lines, workers, chunk_size=2000):
+            pass
+        elapsed = time.perf_counter() - start
+        print(
+            f"{workers:>10} {len(lines) / elapsed:>12.0f} equations/s "
+            f"({serial / elapsed:.2f}x in-process)"
+        )
+
+
+def bench_threads(args):
+    """Thread-pool against process-pool throughput at 1, 2, 4 and N workers"""
+    # sys._is_gil_enabled only exists from 3.13; older builds always have the GIL
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled'}")
+    rng = random.Random(args.seed)
+    lines = _quadratic_lines(rng, args.count)
+
+    start = time.perf_counter()
+    for _ in iter_records(lines):
+        pass
+    serial = time.perf_counter() - start
+    print(f"{'in-process':>10} {len(lines) / serial:>12.0f} equations/s")
+
+    cpus = os.cpu_count() or 1
+    print(f"{'workers':>10} {'threads/s':>12} {'processes/s':>12}")
+    for workers in sorted({1, 2, 4, cpus}):
+        rates = []
+        for solve in (solve_threaded, solve_parallel):
+            start = time.perf_counter()
+            for _ in solve(lines, workers, chunk_size=2000):
+                pass
+            rates.append(len(lines) / (time.perf_counter() - start))
+        threads, processes = rates
+        print(
+            f"{workers:>10} {threads:>12.0f} {processes:>12.0f} "
+            f"(threads {threads * serial / len(lines):.2f}x, "
+            f"processes {processes * serial / len(lines):.2f}x in-process)"
+        )
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    p50 = samples[len(samples) // 2]
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    return p50, p99
+
+
+def bench_server(args):
+    """p50/p99 latency: warm socket service against one-shot main.py"""
+    equation = "5 * X^0 + 4 * X^1 - 9.3 * X^2 = 1 * X^0"
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    cli = []
+    for _ in range(30):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, os.path.join(here, "main.py"), equation],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+        cli.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "solver.sock")
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(here, "server.py"), "--unix", path],
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            while not os.path.exists(path):
+                time.sleep(0.01)
+            with SolverClient(unix_path=path) as client:
+                service = []
+                for _ in range(5000):
+                    start = time.perf_counter()
+                    client.solve(equation)
+                    service.append(time.perf_counter() - start)
+
+                count = 20_000
+                start = time.perf_counter()
+                client.solve_many([equation] * count)
+                pipelined = count / (time.perf_counter() - start)
+        finally:
+            server.terminate()
+            server.wait()
+
+    for label, samples in (("one-shot CLI", cli), ("socket service", service)):
+        p50, p99 = _percentiles(samples)
+        print(f"{label:>15}: p50 {p50 * 1e3:>8.3f} ms   p99 {p99 * 1e3:>8.3f} ms")
+    print(f"{'pipelined':>15}: {pipelined:>8.0f} requests/s")
+
+def bench_session(args):
+    """One-coefficient edits: SolveSession against re-solving from text"""
+    rng = random.Random(args.seed)
+    edits = [rng.uniform(-1, 1) for _ in range(2000)]
+    parser = ExpressionParser(strict_mode=True, cache_size=0)
+
+    print(f"{'degree':>7} {'text us':>10} {'session us':>11} {'iterations':>11}")
+    for degree in (2, 10, 30):
+        base = [rng.uniform(0.5, 2) for _ in range(degree + 1)]
+        count = len(edits) if degree == 2 else 50
+
+        start = time.perf_counter()
+        for delta in edits[:count]:
+            terms = " + ".join(
+                f"{coef + (delta if exp == 0 else 0)!r} * X^{exp}"
+                for exp, coef in enumerate(base)
+            )
+            Solver(parser.parse_reduced(terms + " = 0 * X^0")).solve()
+        text = (time.perf_counter() - start) / count
+
+        session = SolveSession(dict(enumerate(base)))
+        session.solve()
+        start = time.perf_counter()
+        for delta in edits[:count]:
+            session.set_coefficient(0, base[0] + delta)
+            session.solve()
+        edit = (time.perf_counter() - start) / count
+        print(f"{degree:>7} {text * 1e6:>10.1f} {edit * 1e6:>11.1f} {session.iterations:>11}")
+
+
+def bench_mmap(args):
+    """Text-mode line iteration against the mmap reader, alone and solved"""
+    rng = random.Random(args.seed)
+    lines = _quadratic_lines(rng, 500_000)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "equations.txt")
+        with open(path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        size = os.path.getsize(path) / 1e6
+
+        def text_lines():
+            with open(path) as f:
+                for _ in iter_equations(f):
+                    pass
+
+        def mapped_lines():
+            with mapped_file(path) as buffer:
+                for _ in iter_mapped_lines(buffer):
+                    pass
+
+        def text_records():
+            with open(path) as f:
+                for _ in iter_records(f):
+                    pass
+
+        def mapped_records():
+            with mapped_file(path) as buffer:
+                for _ in iter_mapped_records(buffer):
+                    pass
+
+        print(f"{len(lines)} lines, {size:.1f} MB")
+        for label, func in (
+            ("text lines", text_lines), ("mmap lines", mapped_lines),
+            ("text solve", text_records), ("mmap solve", mapped_records),
+        ):
+            elapsed = _time_call(func, repeat=3 if "lines" in label else 1)
+            print(f"{label:>12}: {elapsed:>7.3f} s  {size / elapsed:>8.1f} MB/s")
+
+
+def bench_structured(args):
+    """Text equations against JSON, NumPy and packed coefficient input"""
+    import numpy as np
+
+    rng = np.random.default_rng(args.seed)
+    count = 100_000
+    rows = rng.uniform(-100, 100, (count, 3))
+    lines = [
+        f"{c!r} * X^0 + {b!r} * X^1 + {a!r} * X^2 = 0 * X^0".replace("+ -", "- ")
+        for c, b, a in rows.tolist()
+    ]
+    json_lines = [json.dumps(row) for row in rows.tolist()]
+    packed = INPUT_MAGIC + b"".join(pack_terms(enumerate(row)) for row in rows.tolist())
+    parser = ExpressionParser(strict_mode=True, cache_size=0)
+
+    inputs = (
+        ("text", lambda: iter_equations(lines)),
+        ("json", lambda: iter_json_equations(json_lines)),
+        ("npy", lambda: iter_array_equations(rows)),
+        ("packed", lambda: iter_packed_equations(packed)),
+    )
+
+    def reduce_only(label, equations):
+        if label == "text":
+            for _, line in equations():
+                parser.parse_reduced(line)
+        else:
+            for _, terms in equations():
+                reduce_terms(terms)
+
+    def solve_all(label, equations):
+        if label == "text":
+            for _ in iter_records(lines, parser):
+                pass
+        else:
+            for _ in iter_terms_records(equations()):
+                pass
+
+    print(f"{count} quadratics")
+    print(f"{'input':>8} {'reduce us':>10} {'speedup':>8} {'solve us':>10} {'speedup':>8}")
+    text_reduce = text_solve = None
+    for label, equations in inputs:
+        reduce_time = _time_call(reduce_only, label, equations, repeat=3) / count
+        solve_time = _time_call(solve_all, label, equations, repeat=3) / count
+        if text_reduce is None:
+            text_reduce, text_solve = reduce_time, solve_time
+        print(
+            f"{label:>8} {reduce_time * 1e6:>10.2f} {text_reduce / reduce_time:>7.2f}x "
+            f"{solve_time * 1e6:>10.2f} {text_solve / solve_time:>7.2f}x"
+        )
+
+
+# Kinds of reduced equation the workload generator can produce
+WORKLOAD_KINDS = ("constant", "linear", "real", "complex")
+DEFAULT_MIX = "constant=1,linear=1,real=1,complex=1"
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+
+def _parse_mix(mix):
+    """'real=3,complex=1' -> {kind: weight} over WORKLOAD_KINDS"""
+    weights = {}
+    for item in mix.split(","):
+        kind, _, weight = item.partition("=")
+        kind = kind.strip()
+        if kind not in WORKLOAD_KINDS:
+            raise ValueError(f"unknown workload kind '{kind}'")
+        weights[kind] = float(weight) if weight else 1.0
+    if sum(weights.values()) <= 0:
+        raise ValueError("workload mix needs a positive weight")
+    return weights
+
+
+def _reduced_terms(rng, kind, magnitude):
+    """Reduced {exponent: coefficient} with the requested solution kind"""
+    def value(low=0.1):
+        return rng.choice((-1, 1)) * rng.uniform(low, 1) * magnitude
+
+    if kind == "constant":
+        return {0: value()}
+    if kind == "linear":
+        return {0: value(), 1: value()}
+    a = value()
+    if kind == "real":
+        # Well separated roots keep the discriminant clear of zero
+        r1 = rng.uniform(-1, 1)
+        r2 = r1 + rng.choice((-1, 1)) * rng.uniform(0.5, 1)
+        return {0: a * r1 * r2, 1: -a * (r1 + r2), 2: a}
+    real, imag = rng.uniform(-1, 1), rng.uniform(0.5, 1)
+    return {0: a * (real * real + imag * imag), 1: -2 * a * real, 2: a}
+
+
+def generate_workload(seed, count, term_count=4, max_degree=2,
+                      magnitude=100.0, mix=DEFAULT_MIX):
+    """
+    Seeded synthetic equations. Each one reduces to a constant, linear,
+    real-root or complex-root equation picked by the mix weights, and
+    is spread over term_count terms per side: every reduced coefficient
+    is split across both sides, and the remaining slots are filled with
+    identical terms up to X^max_degree that cancel in the reduction.
+    """
+    rng = random.Random(seed)
+    weights = _parse_mix(mix)
+    kinds = list(weights)
+    equations = []
+    for _ in range(count):
+        reduced = _reduced_terms(
+            rng, rng.choices(kinds, [weights[k] for k in kinds])[0], magnitude
+        )
+        pairs = []
+        for exp, coef in reduced.items():
+            shift = rng.uniform(-magnitude, magnitude)
+            pairs.append(((exp, coef + shift), (exp, shift)))
+        while len(pairs) < term_count:
+            term = (rng.randint(0, max_degree), rng.uniform(-magnitude, magnitude))
+            pairs.append((term, term))
+        # Same order on both sides, so padding sums round identically
+        rng.shuffle(pairs)
+        left, right = zip(*pairs)
+        equations.append(f"{_format_side(left)} = {_format_side(right)}")
+    return equations
+
+
+def _format_side(terms):
+    text = []
+    for exp, coef in terms:
+        sign = "-" if coef < 0 else "+"
+        if not text:
+            sign = "-" if sign == "-" else ""
+        text.append(f"{sign} {abs(coef)!r} * X^{exp}".lstrip())
+    return " ".join(text)
+
+
+def _format_text(reduced, solution):
+    OutputFormatter.format_reduced_form(reduced)
+    OutputFormatter.format_solution(*solution)
+
+
+def time_stages(equations, repeat=5):
+    """Best-of-repeat ns/equation for each stage and the full pipeline"""
+    parser = ExpressionParser(strict_mode=True, cache_size=0)
+    parsed = [parser.parse(equation) for equation in equations]
+    reduced = [ExpressionParser.reduce_equation(*sides) for sides in parsed]
+    solutions = [Solver(poly).solve() for poly in reduced]
+    outputs = list(zip(reduced, solutions))
+
+    stages = {
+        "parse": lambda: [parser.parse(equation) for equation in equations],
+        "reduce": lambda: [ExpressionParser.reduce_equation(*sides) for sides in parsed],
+        "solve": lambda: [Solver(poly).solve() for poly in reduced],
+        "format": lambda: [_format_text(*output) for output in outputs],
+        "pipeline": lambda: [
+            OutputFormatter.format_json(solve_record(parser, equation))
+            for equation in equations
+        ],
+    }
+    return {
+        name: _time_call(stage, repeat=repeat) / len(equations) * 1e9
+        for name, stage in stages.items()
+    }
+
+
+def compare_to_baseline(results, baseline, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """Stages whose ns/equation grew by more than threshold over baseline"""
+    regressions = {}
+    for name, value in results.items():
+        previous = baseline.get(name)
+        if previous and value > previous * (1 + threshold):
+            regressions[name] = value / previous - 1
+    return regressions
+
+
+def bench_allocations(args):
+    """Memory and GC-tracked objects held per solve result, and solve + format time"""
+    import gc
+    import tracemalloc
+    rng = random.Random(args.seed)
+    mix = _parse_mix(args.mix)
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=args.count)
+    equations = [Polynomial(_reduced_terms(rng, kind, args.magnitude)) for kind in kinds]
+    # A share of cubics so closed-form complex roots are counted too
+    equations += [
+        Polynomial({k: rng.uniform(-1, 1) * args.magnitude for k in range(4)})
+        for _ in range(args.count // 4)
+    ]
+    count = len(equations)
+
+    gc.collect()
+    tracked = len(gc.get_objects())
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [Solver(equation).solve() for equation in equations]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    tracked = len(gc.get_objects()) - tracked
+    held = after.compare_to(before, "filename")
+    held_bytes = sum(stat.size_diff for stat in held)
+    held_blocks = sum(stat.count_diff for stat in held)
+    del results
+
+    def solve_and_format():
+        for equation in equations:
+            OutputFormatter.format_solution(*Solver(equation).solve())
+
+    elapsed = _time_call(solve_and_format, repeat=3)
+    print(f"{count} equations ({args.mix}, plus {args.count // 4} cubics)")
+    print(
+        f"held per result: {held_bytes / count:.1f} bytes in {held_blocks / count:.2f} "
+        f"blocks, {tracked / count:.2f} GC-tracked objects"
+    )
+    print(f"solve + format: {elapsed / count * 1e6:.2f} us/equation")
+
+
+def bench_stages(args):
+    """Per-stage ns/equation on a seeded workload, with baseline comparison"""
+    workload = {
+        "seed": args.seed,
+        "count": args.count,
+        "terms": args.terms,
+        "degree": args.degree,
+        "magnitude": args.magnitude,
+        "mix": args.mix,
+    }
+    equations = generate_workload(
+        args.seed, args.count, args.terms, args.degree, args.magnitude, args.mix
+    )
+    results = time_stages(equations)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        if stored.get("workload") != workload:
+            print("warning: baseline was recorded on a different workload", file=sys.stderr)
+        baseline = stored["stages"]
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+
+    print(f"{'stage':>10} {'ns/eq':>10} {'baseline':>10} {'change':>8}")
+    for name, value in results.items():
+        line = f"{name:>10} {value:>10.0f}"
+        if name in baseline:
+            change = value / baseline[name] - 1
+            flag = "  REGRESSION" if name in regressions else ""
+            line += f" {baseline[name]:>10.0f} {change:>+7.1%}{flag}"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "workload": workload,
+                "python": platform.python_version(),
+                "stages": results,
+            }, f, indent=2)
+            f.write("\n")
+    return 1 if regressions else 0
+
+
+BENCHMARKS = {
+    "stages": bench_stages,
+    "session": bench_session,
+    "mmap": bench_mmap,
+    "structured": bench_structured,
+    "server": bench_server,
+    "parallel": bench_parallel,
+    "sqrt": bench_sqrt,
+    "solve-many": bench_solve_many,
+    "lexer": bench_lexer,
+    "roots": bench_roots,
+    "sturm": bench_sturm,
+    "closed-form": bench_closed_form,
+    "evaluate": bench_evaluate,
+    "allocations": bench_allocations,
+    "threads": bench_threads,
+    "escalation": bench_escalation,
+}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Solver benchmarks")
+    arg_parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    arg_parser.add_argument("--seed", type=int, default=42)
+
+    workload = arg_parser.add_argument_group("stages workload")
+    workload.add_argument("--count", type=int, default=2000, help="equations")
+    workload.add_argument("--terms", type=int, default=4, help="terms per side")
+    workload.add_argument("--degree", type=int, default=2, help="highest exponent written")
+    workload.add_argument("--magnitude", type=float, default=100.0, help="coefficient scale")
+    workload.add_argument(
+        "--mix", default=DEFAULT_MIX,
+        help="weights over " + ", ".join(WORKLOAD_KINDS),
+    )
+    workload.add_argument("--output", metavar="JSON", help="save results")
+    workload.add_argument("--baseline", metavar="JSON", help="compare to saved results")
+    workload.add_argument(
+        "--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+        help="slowdown fraction that counts as a regression",
+    )
+
+    args = arg_parser.parse_args(sys.argv[1:])
+    sys.exit(BENCHMARKS[args.benchmark](args) or 0)
+
+
+if __name__ == "__main__":
+    main()
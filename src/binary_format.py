@@ -0,0 +1,232 @@
+import struct
+from solver import ComplexNumber, SOLUTION_CODES, SOLUTION_TYPES
+from root_finder import ApproximateRoot
+from formatter import OutputFormatter
+
+# Binary batch output, little-endian throughout:
+#
+#   file    MAGIC, then one record per input equation
+#   record  24-byte header, then a payload of 8-byte words:
+#     uint32   line          input line number
+#     uint8    code          SOLUTION_CODES value, ERROR_CODE for errors
+#     uint8    flags         FLAG_* bits below (FLAG_ESCALATED: exact arithmetic)
+#     2 bytes  padding
+#     uint32   degree
+#     uint32   count         roots (error records: message length in bytes)
+#     float64  discriminant  NaN when FLAG_DISCRIMINANT is clear
+#   payload
+#     count float64 roots, or count complex128 (real, imag) pairs with FLAG_COMPLEX
+#     count float64 error bounds with FLAG_ERRORS, NaN for exact roots
+#     error records: the UTF-8 message, zero-padded to 8 bytes
+#
+# Every array starts 8-byte aligned, so numpy.frombuffer or a
+# memoryview cast reads it in place.
+MAGIC = b"CMPV1\0\0\0"
+RECORD_HEADER = struct.Struct("<IBB2xIId")
+ERROR_CODE = 255
+
+FLAG_DISCRIMINANT = 1
+FLAG_COMPLEX = 2
+FLAG_ERRORS = 4
+FLAG_ESCALATED = 8
+
+NAN = float("nan")
+
+
+def pack_solution(line_number, degree, solution_type, discriminant, solutions, escalated=False):
+    """One record for a Solver.solve result"""
+    flags = FLAG_ESCALATED if escalated else 0
+    if discriminant is None:
+        discriminant = NAN
+    else:
+        flags |= FLAG_DISCRIMINANT
+
+    values = solutions
+    if any(hasattr(root, "imaginary") for root in solutions):
+        flags |= FLAG_COMPLEX
+        values = []
+        for root in solutions:
+            if hasattr(root, "imaginary"):
+                values += (root.real, root.imaginary)
+            else:
+                values += (root, 0.0)
+    if any(hasattr(root, "error") for root in solutions):
+        flags |= FLAG_ERRORS
+        values = list(values)
+        values += [getattr(root, "error", NAN) for root in solutions]
+
+    header = RECORD_HEADER.pack(
+        line_number, SOLUTION_CODES[solution_type], flags,
+        degree, len(solutions), discriminant,
+    )
+    return header + struct.pack(f"<{len(values)}d", *values)
+
+
+def pack_error(line_number, message):
+    """One record for an equation that failed to parse or solve"""
+    text = message.encode("utf-8")
+    header = RECORD_HEADER.pack(line_number, ERROR_CODE, 0, 0, len(text), NAN)
+    return header + text + b"\0" * (-len(text) % 8)
+
+
+def renumber(packed, first_line):
+    """packed with its line number moved up by first_line"""
+    line_number = int.from_bytes(packed[:4], "little") + first_line
+    return line_number.to_bytes(4, "little") + packed[4:]
+
+
+def is_error(packed):
+    return packed[4] == ERROR_CODE
+
+
+def is_escalated(packed):
+    return bool(packed[5] & FLAG_ESCALATED)
+
+
+class BinaryRecord:
+    """
+    View of one record inside a binary buffer. Roots are not copied:
+    values is a memoryview of the float64 payload (interleaved real and
+    imaginary parts when is_complex), and root_array() wraps the same
+    bytes in a NumPy array.
+    """
+
+    def __init__(self, buffer, offset):
+        (self.line, self.code, self.flags, self.degree, self.count,
+         discriminant) = RECORD_HEADER.unpack_from(buffer, offset)
+        self.discriminant = discriminant if self.flags & FLAG_DISCRIMINANT else None
+        self.offset = offset + RECORD_HEADER.size
+        self._buffer = buffer
+
+        self.values = self.errors = None
+        if self.code == ERROR_CODE:
+            self.end = self.offset + self.count + (-self.count % 8)
+        else:
+            width = 2 if self.is_complex else 1
+            errors_start = self.offset + self.count * width * 8
+            self.end = errors_start
+            if self.flags & FLAG_ERRORS:
+                self.end += self.count * 8
+        if self.end > len(buffer):
+            raise ValueError(f"Truncated record at byte {offset}")
+
+        if self.code != ERROR_CODE:
+            view = memoryview(buffer)
+            self.values = view[self.offset:errors_start].cast("d")
+            if self.flags & FLAG_ERRORS:
+                self.errors = view[errors_start:self.end].cast("d")
+
+    @property
+    def is_complex(self):
+        return bool(self.flags & FLAG_COMPLEX)
+
+    @property
+    def solution_type(self):
+        return SOLUTION_TYPES.get(self.code)
+
+    @property
+    def error(self):
+        """The error message of an error record, None otherwise"""
+        if self.code != ERROR_CODE:
+            return None
+        data = bytes(self._buffer[self.offset:self.offset + self.count])
+        return data.decode("utf-8")
+
+    def root_array(self):
+        """Roots as a float64 or complex128 array over the buffer itself"""
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("root_array requires numpy") from None
+        dtype = np.complex128 if self.is_complex else np.float64
+        return np.frombuffer(self._buffer, dtype, self.count, self.offset)
+
+    def roots(self):
+        """
+        Roots as the solver returns them: floats, ComplexNumber, or
+        ApproximateRoot when an error bound is stored. A complex root
+        with no imaginary part and no bound comes back as a float.
+        """
+        values, errors = self.values, self.errors
+        if not self.is_complex:
+            if errors is None:
+                return values.tolist()
+            return [
+                value if error != error else ApproximateRoot(complex(value, 0.0), error)
+                for value, error in zip(values, errors)
+            ]
+
+        roots = []
+        for k in range(self.count):
+            real, imaginary = values[2 * k], values[2 * k + 1]
+            error = NAN if errors is None else errors[k]
+            if error == error:
+                roots.append(ApproximateRoot(complex(real, imaginary), error))
+            elif imaginary == 0:
+                roots.append(real)
+            else:
+                roots.append(ComplexNumber(real, imaginary))
+        return roots
+
+    def to_record(self):
+        """
+        The pipeline's JSON record for this result. The reduced form is
+        not stored in the binary format, so it is the one field missing.
+        """
+        record = {"line": self.line}
+        if self.code == ERROR_CODE:
+            record["error"] = self.error
+            return record
+        record["degree"] = self.degree
+        record["solution_type"] = self.solution_type
+        record["discriminant"] = self.discriminant
+        record["roots"] = [OutputFormatter.format_root(root) for root in self.roots()]
+        if self.flags & FLAG_ESCALATED:
+            record["escalated"] = True
+        return record
+
+    def to_text(self):
+        """
+        The text main.py prints for this result, from the degree on:
+        the reduced form line needs the coefficients, which are not stored
+        """
+        if self.code == ERROR_CODE:
+            return f"Error: {self.error}"
+        return "\n".join((
+            OutputFormatter.format_polynomial_degree(self.degree),
+            OutputFormatter.format_solution(self.code, self.discriminant, self.roots()),
+        ))
+
+
+def iter_binary(buffer):
+    """BinaryRecord for every record of a binary output buffer"""
+    if bytes(buffer[:len(MAGIC)]) != MAGIC:
+        raise ValueError("Not a binary solver output")
+    offset = len(MAGIC)
+    size = len(buffer)
+    while offset < size:
+        if offset + RECORD_HEADER.size > size:
+            raise ValueError(f"Truncated record at byte {offset}")
+        record = BinaryRecord(buffer, offset)
+        yield record
+        offset = record.end
+
+
+def convert_to_jsonl(buffer, output):
+    """Write a binary output buffer back out as JSON Lines"""
+    for record in iter_binary(buffer):
+        output.write(OutputFormatter.format_json(record.to_record()))
+        output.write("\n")
+
+
+def convert_to_text(buffer, output):
+    """
+    Write a binary output buffer back out as text, a blank line between
+    results. Each result starts at its degree line: there is no
+    "Reduced form:" line, see BinaryRecord.to_text.
+    """
+    for index, record in enumerate(iter_binary(buffer)):
+        if index:
+            output.write("\n")
+        output.write(record.to_text())
+        output.write("\n")
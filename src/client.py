@@ -0,0 +1,65 @@
+import json
+import socket
+from server import DEFAULT_PORT
+
+# Requests sent ahead of the responses read back in solve_many
+DEFAULT_WINDOW = 32
+
+
+class SolverClient:
+    """Thin blocking client for server.py, over TCP or a Unix socket"""
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, timeout=None):
+        if unix_path:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.connect(unix_path)
+        else:
+            self._socket = socket.create_connection((host, port))
+        self._socket.settimeout(timeout)
+        self._reader = self._socket.makefile("rb")
+        self._next_id = 0
+
+    def close(self):
+        self._reader.close()
+        self._socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _send(self, equations):
+        payload = []
+        for equation in equations:
+            self._next_id += 1
+            payload.append(json.dumps({"id": self._next_id, "equation": equation}))
+        self._socket.sendall(("\n".join(payload) + "\n").encode())
+
+    def _receive(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Server closed the connection")
+        return json.loads(line)
+
+    def solve(self, equation):
+        """Solve one equation, returning the server's record"""
+        self._send([equation])
+        return self._receive()
+
+    def solve_many(self, equations, window=DEFAULT_WINDOW):
+        """
+        Pipeline equations over the connection, keeping up to window
+        requests outstanding. Records come back in input order.
+        """
+        equations = list(equations)
+        records = []
+        for start in range(0, len(equations), window):
+            batch = equations[start:start + window]
+            self._send(batch)
+            # Read the previous window while this one is being solved
+            while len(records) < start:
+                records.append(self._receive())
+        while len(records) < len(equations):
+            records.append(self._receive())
+        return records
@@ -0,0 +1,144 @@
+import sys
+from numeric import abs, sqrt, INF
+
+
+def _numpy():
+    """
+    numpy, imported on first use rather than with this module, or None
+    when it is not installed: lists and scalars are evaluated point by
+    point instead
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def coefficient_form(polynomial):
+    """
+    Non-zero (exponent, coefficient) terms, highest exponent first, of a
+    Polynomial, a mapping such as reduce_equation returns, or a sequence
+    of the coefficients of X^0, X^1, ...
+    """
+    if hasattr(polynomial, "items"):
+        items = polynomial.items()
+    else:
+        items = enumerate(polynomial)
+    return sorted(((exp, coef) for exp, coef in items if coef), reverse=True)
+
+
+def _power(x, n):
+    # Repeated squaring with * only: scalars overflow to inf instead of
+    # raising like **, and NumPy arrays are multiplied elementwise
+    result = None
+    while n:
+        if n & 1:
+            result = x if result is None else result * x
+        n >>= 1
+        if n:
+            x = x * x
+    return 1.0 if result is None else result
+
+
+def _horner(terms, x, derivative):
+    """
+    p(x) and p'(x) (None unless derivative) by Horner's rule over the
+    gaps between exponents, so sparse terms cost one _power per gap
+    rather than one step per degree. x is a scalar or an array.
+    """
+    if not terms:
+        return 0.0 * x, (0.0 * x if derivative else None)
+
+    top, p = terms[0]
+    dp = 0.0 * x
+    previous = top
+    for exp, coef in terms[1:]:
+        gap = previous - exp
+        if gap == 1:
+            if derivative:
+                dp = dp * x + p
+            p = p * x + coef
+        else:
+            step = _power(x, gap - 1)
+            if derivative:
+                dp = dp * step * x + gap * p * step
+            p = p * step * x + coef
+        previous = exp
+    if previous:
+        step = _power(x, previous - 1)
+        if derivative:
+            dp = dp * step * x + previous * p * step
+        p = p * step * x
+    return p, (dp if derivative else None)
+
+
+def evaluate(polynomial, points, derivative=False):
+    """
+    The polynomial (see coefficient_form) at every point: a real or
+    complex scalar, a list or a NumPy array. Returns values shaped like
+    points (a scalar, a list or an array), or (values, derivatives)
+    with derivative=True. Arrays are evaluated with one vectorized
+    Horner pass over all points; lists go through NumPy when it is
+    installed and point by point otherwise.
+    """
+    terms = coefficient_form(polynomial)
+    if isinstance(points, (list, tuple)):
+        np = _numpy()
+        if np is None:
+            pairs = [_horner(terms, x, derivative) for x in points]
+            values = [value for value, _ in pairs]
+            slopes = [slope for _, slope in pairs]
+        else:
+            values, slopes = _horner_array(terms, np.asarray(points), derivative)
+            values = values.tolist()
+            slopes = slopes.tolist() if derivative else None
+    elif _is_array(points):
+        values, slopes = _horner_array(terms, points, derivative)
+    else:
+        values, slopes = _horner(terms, points, derivative)
+    return (values, slopes) if derivative else values
+
+
+def _is_array(points):
+    # An array exists only once numpy is imported: no import needed
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(points, np.ndarray)
+
+
+def _horner_array(terms, points, derivative):
+    import numpy as np
+    if points.dtype.kind not in "fc":
+        points = points.astype(np.float64)
+    with np.errstate(over="ignore", invalid="ignore"):
+        return _horner(terms, points, derivative)
+
+
+def _as_complex(root):
+    """float, ComplexNumber or ApproximateRoot as a complex"""
+    return complex(root.real, getattr(root, "imaginary", 0.0))
+
+
+def _modulus(z):
+    return sqrt(z.real * z.real + z.imag * z.imag)
+
+
+def verify_roots(polynomial, roots):
+    """
+    (residual, condition) for each root: residual is |p(root)|, and
+    condition is the first-order change of the root per unit relative
+    change of the coefficients, sum |c_k| |root|^k / |p'(root)|. A root
+    accurate to rounding has a residual of a few EPSILON * sum |c_k|
+    |root|^k, and an error of about condition * EPSILON. condition is
+    INF at a multiple root, where p'(root) vanishes.
+    """
+    terms = coefficient_form(polynomial)
+    magnitudes = [(exp, abs(coef)) for exp, coef in terms]
+    checks = []
+    for root in roots:
+        z = _as_complex(root)
+        value, slope = _horner(terms, z, True)
+        size, _ = _horner(magnitudes, _modulus(z), False)
+        slope = _modulus(slope)
+        checks.append((float(_modulus(value)), size / slope if slope else INF))
+    return checks
@@ -1,141 +1,277 @@
 import re
+from time import perf_counter
+from cache import LRUCache
+from polynomial import Polynomial
+from numeric import INF, EPSILON
 
 TERM_PATTERN = r'([+-]?)(\d+\.?\d*)\*X\^(\d+)'
-VALID_CHARS_PATTERN = r'^[0-9\+\-\*\.\^X=]+$'
+TERM_REGEX = re.compile(TERM_PATTERN)
+# Same pattern for equations read as raw bytes, e.g. from mapped_reader
+TERM_REGEX_BYTES = re.compile(TERM_PATTERN.encode())
+VALID_CHARS = frozenset('0123456789+-*.^X=')
+# Reduced coefficients at or below this fraction of the terms added
+# together at their exponent are rounding noise and dropped: what is
+# left when dozens of like terms cancel, not a written term
+REDUCE_TOLERANCE = 64 * EPSILON
+
+
+class ParseError(ValueError):
+    """
+    Invalid equation text. position is the offset of the first bad
+    token in the normalized (space-free) equation.
+    """
+    def __init__(self, message, position):
+        super().__init__(f"{message} at position {position}")
+        self.position = position
+
 
 class ExpressionParser:
     """
     Parser for polynomial equations.
     Handles parsing, validation, and term extraction.
+    Parsed equations are kept in an LRU cache keyed on the normalized
+    text; pass cache_size=0 to disable it. Equations may be str or any
+    bytes-like object (bytes, memoryview, mmap slice); bytes are parsed
+    as bytes, never decoded.
+    Thread-safe: the term patterns are compiled once at import, strict_mode
+    is fixed at construction, and the cache locks itself and only holds
+    Polynomials that are never mutated, so threads can share a parser.
     """
-    def __init__(self, strict_mode=False):
-        self.term_pattern = TERM_PATTERN
-        self.strict_mode = strict_mode
+    def __init__(self, strict_mode=False, cache_size=128):
+        self._strict_mode = strict_mode
+        self._cache = LRUCache(cache_size) if cache_size else None
+    
+    @property
+    def strict_mode(self):
+        return self._strict_mode
     
     def parse(self, equation_str):
+        left_terms, right_terms, _ = self._parse_cached(equation_str)
+        if self._cache is None:
+            return left_terms, right_terms
+        return left_terms.copy(), right_terms.copy()
+    
+    def parse_reduced(self, equation_str):
+        """Parse and reduce to a single Polynomial equal to zero"""
+        left_terms, right_terms, magnitudes = self._parse_cached(equation_str)
+        return self.reduce_equation(left_terms, right_terms, magnitudes)
+    
+    def _parse_cached(self, equation_str):
+        """
+        Parse into (left, right) Polynomials that are shared with the
+        cache and must not be mutated (parse() hands out copies when the
+        cache is enabled), plus the magnitudes written per exponent.
+        """
         equation = self._normalize(equation_str)
+        cache = self._cache
+        if cache is not None:
+            parsed = cache.get(equation)
+            if parsed is not None:
+                return parsed
+        
         self._validate_equation(equation)
-        left_side, right_side = self._split_equation(equation)
-        left_terms = self._extract_terms(left_side)
-        right_terms = self._extract_terms(right_side)
+        left_terms, right_terms, magnitudes = self._tokenize(equation)
         
-        if self.strict_mode:
+        if self._strict_mode:
             self._validate_terms(left_terms, right_terms)
         
-        return left_terms, right_terms
+        parsed = (left_terms, right_terms, magnitudes)
+        if cache is not None:
+            cache.put(equation, parsed)
+        return parsed
     
-    def _normalize(self, equation_str):
-        return equation_str.replace(" ", "")
+    def _parse_timed(self, equation_str, stats):
+        """_parse_cached with each stage timed into a StageStats"""
+        start = perf_counter()
+        equation = self._normalize(equation_str)
+        now = perf_counter()
+        stats.add("normalize", now - start)
+        # Histogram of parsed equations only: recorded once parsing succeeds
+        terms = equation.count('X' if isinstance(equation, str) else b'X')
+        
+        cache = self._cache
+        if cache is not None:
+            start = now
+            parsed = cache.get(equation)
+            now = perf_counter()
+            stats.add("cache", now - start)
+            if parsed is not None:
+                stats.count_terms(terms)
+                return parsed
+        
+        start = now
+        self._validate_equation(equation)
+        now = perf_counter()
+        stats.add("validate", now - start)
+        
+        start = now
+        left_terms, right_terms, magnitudes = self._tokenize(equation)
+        if self._strict_mode:
+            self._validate_terms(left_terms, right_terms)
+        stats.add("tokenize", perf_counter() - start)
+        stats.count_terms(terms)
+        
+        parsed = (left_terms, right_terms, magnitudes)
+        if cache is not None:
+            cache.put(equation, parsed)
+        return parsed
+    
+    def cache_info(self):
+        """Hit/miss/eviction counters, or None when caching is disabled"""
+        if self._cache is None:
+            return None
+        return self._cache.info()
     
-    def _split_equation(self, equation):
-        parts = equation.split("=")
-        return parts[0], parts[1]
+    def clear_cache(self):
+        if self._cache is not None:
+            self._cache.clear()
+    
+    def _normalize(self, equation_str):
+        if isinstance(equation_str, str):
+            return equation_str.replace(" ", "")
+        if not isinstance(equation_str, (bytes, bytearray, memoryview)):
+            # bytes(n) would allocate n zero bytes for an int
+            raise TypeError(
+                f"Equation must be str or bytes, not {type(equation_str).__name__}"
+            )
+        # bytes() is free for bytes and copies memoryviews once
+        return bytes(equation_str).replace(b" ", b"")
     
     def _validate_equation(self, equation):
-        if '=' not in equation:
+        """Cheap whole-string checks; term syntax is checked by _tokenize"""
+        equals_sign = '=' if isinstance(equation, str) else b'='
+        equals = equation.count(equals_sign)
+        if equals == 0:
             raise ValueError("Invalid equation: missing '=' sign")
         
-        if equation.count('=') != 1:
+        if equals != 1:
             raise ValueError("Invalid equation: multiple '=' signs found")
         
-        valid_chars_pattern = VALID_CHARS_PATTERN
-        if not re.match(valid_chars_pattern, equation):
-            raise ValueError("Invalid equation: contains invalid characters")
-        
-        left, right = equation.split('=')
-        if not left or not right:
+        if equation.startswith(equals_sign) or equation.endswith(equals_sign):
             raise ValueError("Invalid equation: empty side detected")
     
     def _validate_terms(self, left_terms, right_terms):
+        # Negative exponents are already rejected by Polynomial.add_term
         if not left_terms and not right_terms:
             raise ValueError("No valid terms found in equation")
-        
-        all_exponents = list(left_terms.keys()) + list(right_terms.keys())
-        if any(exp < 0 for exp in all_exponents):
-            raise ValueError("Negative exponents not supported")
     
-    def _extract_terms(self, expression):
+    def _tokenize(self, equation):
         """
-        Extract terms and validate that entire expression matches pattern.
-        Raises ValueError if expression contains invalid format.
+        Single left-to-right scan over a validated equation.
+        Each term must match exactly where the previous one ended, so
+        anything the term pattern cannot consume is reported with its
+        offset instead of being skipped. Coefficients are accumulated by
+        exponent as they are read, in a dict (C-speed for a handful of
+        updates) that becomes the side's Polynomial at the side's end.
+        float() and int() accept the bytes groups of a bytes equation
+        directly, so only the separators differ between str and bytes.
+        Returns the two sides and, per exponent, the sum of the
+        coefficient magnitudes written (see reduce_equation). Numbers
+        too large for a float are rejected rather than read as inf.
         """
-        if not expression:
-            raise ValueError("Invalid equation: empty expression")
-        
-        matches = list(re.finditer(self.term_pattern, expression))
-        
-        # Check if any valid terms were found
-        if not matches:
-            raise ValueError(f"Invalid equation: no valid terms found in '{expression}'")
-        
-        # Validate by reconstructing the expression from matches
-        reconstructed = ""
-        for i, match in enumerate(matches):
-            sign = match.group(1)
-            # First term shouldn't have explicit + sign in reconstruction
-            if i == 0 and sign == '+':
-                sign = ''
-            elif i > 0 and sign == '':
-                sign = '+'  # Add + between terms if not present
-            reconstructed += sign + match.group(2) + "*X^" + match.group(3)
-        
-        # Remove leading + for comparison
-        expr_clean = expression[1:] if expression.startswith('+') else expression
-        recon_clean = reconstructed[1:] if reconstructed.startswith('+') else reconstructed
-        
-        if expr_clean != recon_clean:
-            raise ValueError(f"Invalid equation format: expression contains invalid terms")
-        
-        # Extract coefficients and exponents
-        terms = {}
-        for match in matches:
-            sign = match.group(1)
-            coefficient = match.group(2)
-            exponent = match.group(3)
+        if isinstance(equation, str):
+            match, minus, plus, equals = TERM_REGEX.match, '-', '+', '='
+        else:
+            match, minus, plus, equals = TERM_REGEX_BYTES.match, b'-', b'+', b'='
+        end = len(equation)
+        left_terms = terms = {}
+        right_terms = None
+        magnitudes = {}
+        pos = 0
+        
+        while True:
+            term = match(equation, pos)
+            if term is None:
+                raise self._invalid_token(equation, pos)
             
-            coef = self._parse_coefficient(sign, coefficient)
+            sign, coefficient, exponent = term.groups()
+            coef = float(coefficient)
+            if coef == INF:
+                raise ParseError("Invalid equation: coefficient out of range", term.start(2))
             exp = int(exponent)
-            
+            magnitudes[exp] = magnitudes.get(exp, 0.0) + coef
+            if sign == minus:
+                coef = -coef
             terms[exp] = terms.get(exp, 0) + coef
+            
+            pos = term.end()
+            if pos == end:
+                break
+            
+            char = equation[pos:pos + 1]
+            if char == equals and right_terms is None:
+                right_terms = terms = {}
+                pos += 1
+            elif char != plus and char != minus:
+                raise self._invalid_token(equation, pos)
         
-        return terms
+        return Polynomial(left_terms), Polynomial(right_terms), magnitudes
     
-    def _parse_coefficient(self, sign, coefficient_str):
-        coef = float(coefficient_str)
-        return -coef if sign == '-' else coef
+    @staticmethod
+    def _invalid_token(equation, pos):
+        if not isinstance(equation, str):
+            # One character per byte keeps the positions unchanged
+            equation = equation.decode('latin-1')
+        if pos >= len(equation):
+            return ParseError("Invalid equation: unexpected end of expression", pos)
+        
+        # Show the offending token up to the next term boundary
+        token_end = pos + 1
+        while token_end < len(equation) and equation[token_end] not in '+-=':
+            token_end += 1
+        token = equation[pos:token_end]
+        
+        for offset, char in enumerate(token):
+            if char not in VALID_CHARS:
+                return ParseError(
+                    f"Invalid equation: invalid character '{char}'", pos + offset
+                )
+        return ParseError(f"Invalid equation: invalid term '{token}'", pos)
     
     def get_max_degree(self, equation_str):
-        left_terms, right_terms = self.parse(equation_str)
-        all_degrees = list(left_terms.keys()) + list(right_terms.keys())
-        return max(all_degrees) if all_degrees else 0
+        return max(self.get_all_degrees(equation_str), default=0)
     
     def get_all_degrees(self, equation_str):
-        left_terms, right_terms = self.parse(equation_str)
+        left_terms, right_terms, _ = self._parse_cached(equation_str)
         all_degrees = set(left_terms.keys()) | set(right_terms.keys())
         return sorted(all_degrees)
     
     def has_term(self, equation_str, degree):
-        left_terms, right_terms = self.parse(equation_str)
+        left_terms, right_terms, _ = self._parse_cached(equation_str)
         return degree in left_terms or degree in right_terms
     
     @staticmethod
-    def reduce_equation(left: dict, right: dict) -> dict:
-        # Begin with left side
-        coefficients = left.copy()
-        
-        for exp, coeff in right.items():
-            if exp in coefficients:
-                coefficients[exp] -= coeff
-            else:
-                coefficients[exp] = -coeff
-        
-        # Remove near-zero coefficients
-        coefficients = {
-            exp: coeff for exp, coeff in coefficients.items()
-            if abs(coeff) > 1e-10
-        }
-        
-        if not coefficients:
-            return {0: 0}
-        
-        return coefficients
\ No newline at end of file
+    def reduce_equation(left, right=None, magnitudes=None) -> Polynomial:
+        """
+        Move everything to the left and drop what is left of terms that
+        cancelled: a coefficient within REDUCE_TOLERANCE of the sum of
+        the magnitudes added together at its exponent (magnitudes, as
+        written when parsed; the two sides' coefficients otherwise). A
+        term no other term was added to is always kept, whatever the
+        other exponents hold. Non-finite results raise ValueError.
+        """
+        # Begin with a copy of the left side, then move the right side over
+        # (right=None: left is already equal to zero, e.g. structured input)
+        coefficients = left.copy() if isinstance(left, Polynomial) else Polynomial(left)
+        if right is not None and not isinstance(right, Polynomial):
+            right = Polynomial(right)
+        if magnitudes is None:
+            magnitudes = {}
+            for side in (coefficients,) if right is None else (coefficients, right):
+                for exp, coef in side.items():
+                    magnitudes[exp] = magnitudes.get(exp, 0.0) + (coef if coef >= 0 else -coef)
+        if right is not None:
+            coefficients.subtract(right)
+        
+        for exp, coef in coefficients.items():
+            if not -INF < coef < INF:
+                raise ValueError(f"Invalid coefficient {coef}: must be finite")
+            # Magnitudes that overflow say nothing about the noise left
+            tolerance = REDUCE_TOLERANCE * magnitudes.get(exp, 0.0)
+            if -tolerance <= coef <= tolerance < INF:
+                del coefficients[exp]
+        
+        if not len(coefficients):
+            return Polynomial({0: 0.0})
+        
+        return coefficients
@@ -1,68 +1,70 @@
+import json
+from polynomial import Polynomial
+from numeric import INF
+from solver import SolutionKind, SOLUTION_CODES
+
+# First line of format_solution per kind, {count} being the number of
+# roots; the roots follow one per line
+_SOLUTION_HEADERS = {
+    SolutionKind.POSITIVE: "Discriminant is strictly positive, the two solutions are:",
+    SolutionKind.ZERO: "The solution is:",
+    SolutionKind.NEGATIVE: "Discriminant is strictly negative, the two complex solutions are:",
+    SolutionKind.LINEAR: "The solution is:",
+    SolutionKind.INFINITE: "Any real number is a solution.",
+    SolutionKind.NONE: "No solution.",
+    SolutionKind.NUMERIC: (
+        "The polynomial degree is strictly greater than 2, "
+        "the {count} approximate solutions are:"
+    ),
+    SolutionKind.CUBIC: "The polynomial is cubic, the {count} solutions are:",
+    SolutionKind.QUARTIC: "The polynomial is quartic, the {count} solutions are:",
+    SolutionKind.SUBSTITUTION: (
+        "The polynomial degree is strictly greater than 2, solving in "
+        "a power of X, the {count} solutions are:"
+    ),
+}
+
 
 class OutputFormatter:
     """Format solver output according to project requirements"""
     
     @staticmethod
     def format_solution(solution_type, discriminant, solutions):
-
-        if solution_type == 'positive':
-            # Two distinct real solutions
-            return (
-                f"Discriminant is strictly positive, the two solutions are:\n"
-                f"{solutions[0]}\n"
-                f"{solutions[1]}"
-            )
-        
-        elif solution_type == 'zero':
-            # One real solution (double root)
-            return (
-                f"The solution is:\n"
-                f"{solutions[0]}"
-            )
-        
-        elif solution_type == 'negative':
-            # Two complex conjugate solutions
-            return (
-                f"Discriminant is strictly negative, the two complex solutions are:\n"
-                f"{solutions[0]}\n"
-                f"{solutions[1]}"
-            )
-        
-        elif solution_type == 'linear':
-            # One solution from linear equation
-            return (
-                f"The solution is:\n"
-                f"{solutions[0]}"
-            )
-        
-        elif solution_type == 'infinite':
-            # All real numbers are solutions (0 = 0)
-            return "Any real number is a solution."
-        
-        elif solution_type == 'none':
-            # No solution (contradiction like 5 = 0)
-            return "No solution."
-        
-        elif solution_type == 'unsolvable':
-            # Degree > 2
-            return "The polynomial degree is strictly greater than 2, I can't solve."
-        
-        else:
+        """
+        solution_type is a name ('positive', ...) or a SolutionKind.
+        Roots carrying an error bound (numeric ones) are printed with it.
+        """
+        header = _SOLUTION_HEADERS.get(SOLUTION_CODES.get(solution_type, solution_type))
+        if header is None:
             return "Unknown solution type."
-    
+        lines = [header.format(count=len(solutions))]
+        for root in solutions:
+            if hasattr(root, "error"):
+                lines.append(f"{root} (error <= {root.error:.1e})")
+            else:
+                lines.append(f"{root}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def format_result(result):
+        """format_solution for a Solver.solve result"""
+        return OutputFormatter.format_solution(result.kind, result.discriminant, result.roots)
+
     @staticmethod
     def format_reduced_form(coefficients):
     
         if not coefficients:
             return "0 = 0"
         
-        # Sort terms by degree
-        sorted_degrees = sorted(coefficients.keys())
+        # Polynomials already iterate by degree, plain dicts need sorting
+        if isinstance(coefficients, Polynomial):
+            sorted_terms = coefficients.items()
+        else:
+            sorted_terms = sorted(coefficients.items())
         
         # Build the string
         terms = []
-        for degree in sorted_degrees:
-            coef = coefficients[degree]
+        for degree, coef in sorted_terms:
             
             # Format coefficient with sign
             if terms:  # Not the first term
@@ -75,6 +77,86 @@ class OutputFormatter:
         
         return " ".join(terms) + " = 0"
     
+    @staticmethod
+    def format_real_roots(low, high, roots):
+        """Real solutions only, e.g. from Solver.real_roots"""
+        interval = f"[{low}, {high}]"
+        if not roots:
+            return f"No real solution in {interval}."
+        if len(roots) == 1:
+            return f"The only real solution in {interval} is:\n{roots[0]}"
+        lines = [f"The {len(roots)} distinct real solutions in {interval} are:"]
+        lines.extend(f"{root}" for root in roots)
+        return "\n".join(lines)
+    
+    @staticmethod
+    def format_checks(solutions, checks):
+        """Residual and condition of every root, e.g. from evaluation.verify_roots"""
+        lines = ["Verification:"]
+        for root, (residual, condition) in zip(solutions, checks):
+            lines.append(f"{root}: |P(x)| = {residual:.1e}, condition {condition:.1e}")
+        return "\n".join(lines)
+
+    @staticmethod
+    def format_verification(checks):
+        """Record fields for format_checks; an unbounded condition is null"""
+        return {
+            "residuals": [residual for residual, _ in checks],
+            "conditions": [
+                condition if condition != float("inf") else None
+                for _, condition in checks
+            ],
+        }
+
     @staticmethod
     def format_polynomial_degree(degree):
-        return f"Polynomial degree: {degree}"
\ No newline at end of file
+        return f"Polynomial degree: {degree}"
+
+    @staticmethod
+    def format_root(root):
+        """Real roots stay plain numbers, complex ones become {real, imag}"""
+        if hasattr(root, "error"):
+            return {"real": root.real, "imag": root.imaginary, "error": root.error}
+        if hasattr(root, "imaginary"):
+            return {"real": root.real, "imag": root.imaginary}
+        return root
+
+    @staticmethod
+    def format_record(coefficients, degree, solution_type, discriminant, solutions,
+                      escalated=False):
+        """
+        Machine-readable counterpart of format_solution; "escalated" is
+        only present (and true) for results from exact arithmetic
+        """
+        record = {
+            "reduced_form": OutputFormatter.format_reduced_form(coefficients),
+            "degree": degree,
+            "solution_type": solution_type,
+            "discriminant": discriminant,
+            "roots": [OutputFormatter.format_root(root) for root in solutions],
+        }
+        if escalated:
+            record["escalated"] = True
+        return record
+
+    @staticmethod
+    def format_json(record):
+        """
+        One line of strict JSON: a discriminant or root that overflowed
+        to inf (or became NaN) is null, as in format_verification
+        """
+        try:
+            return json.dumps(record, separators=(",", ":"), allow_nan=False)
+        except ValueError:
+            return json.dumps(_finite_values(record), separators=(",", ":"))
+
+
+def _finite_values(value):
+    """value with every non-finite float inside it replaced by None"""
+    if isinstance(value, float):
+        return value if -INF < value < INF else None
+    if isinstance(value, dict):
+        return {key: _finite_values(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite_values(item) for item in value]
+    return value
\ No newline at end of file
@@ -0,0 +1,98 @@
+from collections import Counter
+from threading import Lock
+
+# Pipeline stages in the order an equation goes through them
+STAGES = (
+    "normalize", "cache", "validate", "tokenize",
+    "reduce", "solve", "format", "encode",
+)
+
+
+def _term_bucket(count):
+    """Power-of-two histogram bucket: 0, 1, 2-3, 4-7, ..."""
+    if count < 1:
+        return "0"
+    low = 1
+    while low * 2 <= count:
+        low *= 2
+    high = low * 2 - 1
+    return str(low) if low == high else f"{low}-{high}"
+
+
+class StageStats:
+    """
+    Cumulative per-stage time and call counts, plus histograms of term
+    count, degree and solution type. Disabled by default: callers check
+    enabled once per equation and only then take the timed code path,
+    so an unused instance costs one attribute read per equation.
+    Updates hold a lock, so worker threads can record into one instance.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.seconds = Counter()
+            self.calls = Counter()
+            self.term_counts = Counter()
+            self.degrees = Counter()
+            self.solution_types = Counter()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.seconds[stage] += seconds
+            self.calls[stage] += 1
+
+    def count_terms(self, count):
+        bucket = _term_bucket(count)
+        with self._lock:
+            self.term_counts[bucket] += 1
+
+    def count_solution(self, degree, solution_type):
+        with self._lock:
+            self.degrees[degree] += 1
+            self.solution_types[solution_type] += 1
+
+    def snapshot(self):
+        """Plain-dict copy, picklable so workers can ship it back"""
+        with self._lock:
+            return {
+                "seconds": dict(self.seconds),
+                "calls": dict(self.calls),
+                "term_counts": dict(self.term_counts),
+                "degrees": dict(self.degrees),
+                "solution_types": dict(self.solution_types),
+            }
+
+    def merge(self, snapshot):
+        """Add another instance's snapshot into this one"""
+        with self._lock:
+            for name, counts in snapshot.items():
+                getattr(self, name).update(counts)
+
+    def report(self):
+        lines = [f"{'stage':>10} {'calls':>10} {'total ms':>10} {'us/call':>9}"]
+        for stage in STAGES:
+            calls = self.calls[stage]
+            if calls:
+                seconds = self.seconds[stage]
+                lines.append(
+                    f"{stage:>10} {calls:>10} {seconds * 1e3:>10.3f} "
+                    f"{seconds / calls * 1e6:>9.2f}"
+                )
+
+        def histogram(title, counts, key=None):
+            items = sorted(counts.items(), key=key)
+            lines.append(title + ": " + ", ".join(f"{k}: {v}" for k, v in items))
+
+        histogram("terms", self.term_counts, key=lambda item: int(item[0].split("-")[0]))
+        histogram("degrees", self.degrees)
+        histogram("solution types", self.solution_types)
+        return "\n".join(lines)
+
+
+# Process-wide instance used by the pipeline and main.py --stats
+STAGE_STATS = StageStats()
@@ -1,15 +1,157 @@
 import sys
+import argparse
 from expression_parser import ExpressionParser
 from solver import Solver
 from formatter import OutputFormatter
+from pipeline import (
+    iter_records, iter_terms_records, write_records, write_packed,
+    dedup_cache, dedup_summary, solve_reduced,
+)
+from instrumentation import STAGE_STATS
 
+# Feature modules (SQLite cache, worker pools, memory mapping, binary
+# decoding, sweeps) are imported where they are used: a one-shot solve
+# should not pay for them at startup.
 
-def get_equation_input():
+
+def parse_arguments(argv):
+    """Parse command line flags; a bare argument is the equation to solve"""
+    arg_parser = argparse.ArgumentParser(description="Polynomial equation solver")
+    arg_parser.add_argument("equation", nargs="?", help="equation to solve")
+    arg_parser.add_argument(
+        "--batch", nargs="?", const="-", metavar="FILE",
+        help="solve one equation per line from FILE (default: STDIN), "
+             "writing one JSON record per equation",
+    )
+    arg_parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="solve the batch across N worker processes",
+    )
+    arg_parser.add_argument(
+        "--threads", action="store_true",
+        help="with --workers, use N threads instead of processes (faster "
+             "on free-threaded Python builds)",
+    )
+    arg_parser.add_argument(
+        "--chunk-size", type=int, metavar="LINES",
+        help="equations sent to a worker at a time (default: 1000)",
+    )
+    arg_parser.add_argument(
+        "--unordered", action="store_true",
+        help="with --workers, emit records as chunks finish instead of in input order",
+    )
+    arg_parser.add_argument(
+        "--mmap", action="store_true",
+        help="with --batch FILE, memory-map the file and parse raw bytes; "
+             "records stay in input order even with --workers",
+    )
+    arg_parser.add_argument(
+        "--dedup", action="store_true",
+        help="with --batch, solve each canonical form (the reduced equation "
+             "up to a constant factor) of degree 3 or more once and report "
+             "the dedup ratio; quadratics are cheaper to solve than to look up",
+    )
+    arg_parser.add_argument(
+        "--cache", metavar="PATH",
+        help="reuse results across runs from an SQLite file (implies --dedup)",
+    )
+    arg_parser.add_argument(
+        "--cache-size", type=int, metavar="N",
+        help="with --cache, keep at most N results (default: 1000000)",
+    )
+    arg_parser.add_argument(
+        "--cache-max-age", type=float, metavar="SECONDS",
+        help="with --cache, drop results unused for this long",
+    )
+    arg_parser.add_argument(
+        "--input", choices=("text", "json", "npy", "packed"), default="text",
+        help="equations as text, JSON coefficient arrays/objects (one per "
+             "line with --batch), a .npy coefficient array or a packed "
+             "structured_input stream (default: %(default)s)",
+    )
+    arg_parser.add_argument(
+        "--format", choices=("json", "binary", "text"), default="json",
+        help="with --batch, JSON Lines or the compact binary_format records; "
+             "with --decode, JSON Lines or text (default: %(default)s)",
+    )
+    arg_parser.add_argument(
+        "--decode", metavar="FILE",
+        help="convert a --format binary FILE back to JSON Lines (or text "
+             "with --format text) on STDOUT; binary records do not store "
+             "the coefficients, so decoded output has no reduced form",
+    )
+    arg_parser.add_argument(
+        "--stats", action="store_true",
+        help="with --batch, print per-stage timings and histograms on STDERR",
+    )
+    arg_parser.add_argument(
+        "--real-roots", action="store_true",
+        help="only find the distinct real solutions, at any degree",
+    )
+    arg_parser.add_argument(
+        "--interval", nargs=2, type=float, metavar=("LOW", "HIGH"),
+        help="with --real-roots, only solutions in [LOW, HIGH] (default: all)",
+    )
+    arg_parser.add_argument(
+        "--verify", action="store_true",
+        help="report |P(x)| and a condition estimate for every solution "
+             "(with --batch, as residuals/conditions record fields)",
+    )
+    arg_parser.add_argument(
+        "--sweep", type=int, metavar="EXP",
+        help="solve the equation for every value of its reduced X^EXP "
+             "coefficient given by --range or --values",
+    )
+    arg_parser.add_argument(
+        "--range", nargs=3, type=float, metavar=("START", "STOP", "COUNT"),
+        help="with --sweep, COUNT evenly spaced values from START to STOP",
+    )
+    arg_parser.add_argument(
+        "--values", metavar="FILE",
+        help="with --sweep, values from a .npy file or one per line",
+    )
+    arg_parser.add_argument(
+        "--output", metavar="FILE",
+        help="with --sweep, write a .npy table or CSV (default: CSV on STDOUT)",
+    )
+    args = arg_parser.parse_args(argv)
+    if args.sweep is not None and (args.range is None) == (args.values is None):
+        arg_parser.error("--sweep needs exactly one of --range or --values")
+    if args.mmap and args.batch in (None, "-"):
+        arg_parser.error("--mmap requires --batch FILE")
+    if args.dedup and args.batch is None:
+        arg_parser.error("--dedup requires --batch")
+    if args.input in ("npy", "packed") and args.batch is None:
+        arg_parser.error(f"--input {args.input} requires --batch")
+    if args.input == "npy" and args.batch == "-":
+        arg_parser.error("--input npy requires --batch FILE")
+    if args.input != "text" and (args.workers or args.mmap):
+        arg_parser.error("--workers and --mmap require --input text")
+    if args.workers is not None and args.workers < 1:
+        arg_parser.error("--workers must be at least 1")
+    if args.chunk_size is not None and args.chunk_size < 1:
+        arg_parser.error("--chunk-size must be at least 1")
+    if args.threads and not args.workers:
+        arg_parser.error("--threads requires --workers")
+    if args.interval is not None and not args.real_roots:
+        arg_parser.error("--interval requires --real-roots")
+    if args.format == "binary" and args.batch is None:
+        arg_parser.error("--format binary requires --batch")
+    if args.format == "text" and args.decode is None:
+        arg_parser.error("--format text requires --decode")
+    if args.stats and args.batch is None:
+        arg_parser.error("--stats requires --batch")
+    if args.verify and args.format == "binary":
+        arg_parser.error("--verify requires --format json")
+    return args
+
+
+def get_equation_input(args):
     """Get equation from command line or STDIN"""
     
     # Check if argument provided
-    if len(sys.argv) > 1:
-        return sys.argv[1]
+    if args.equation is not None:
+        return args.equation
     
     # Otherwise read from STDIN
     print("Enter equation: ", end='')
@@ -22,32 +164,243 @@ def get_equation_input():
     return equation
 
 
-def solve_equation(equation_str):
+def open_cache(args):
+    """The --cache ResultStore, or None"""
+    if not args.cache:
+        return None
+    import sqlite3
+    from result_store import ResultStore, DEFAULT_MAX_ENTRIES
+    max_entries = DEFAULT_MAX_ENTRIES if args.cache_size is None else args.cache_size
+    try:
+        return ResultStore(args.cache, max_entries, args.cache_max_age)
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Error: cannot open cache {args.cache}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def reduce_input(equation_str, args):
+    """The reduced equation, from text or with --input json from coefficients"""
+    if args.input == "json":
+        import json
+        from structured_input import reduce_terms, terms_from_json
+        return reduce_terms(terms_from_json(json.loads(equation_str)))
+    parser = ExpressionParser(strict_mode=True)
+    return parser.parse_reduced(equation_str)
+
+
+def solve_equation(equation_str, args, solution_cache=None):
     """Parse, solve, and display"""
     try:
-        parser = ExpressionParser(strict_mode=True)
-        left, right = parser.parse(equation_str)
-        
-        reduced_coefficient = ExpressionParser.reduce_equation(left, right)
+        reduced_coefficient = reduce_input(equation_str, args)
         
         print(f"Reduced form: {OutputFormatter.format_reduced_form(reduced_coefficient)}")
         print(f"Polynomial degree: {Solver._get_poly_degree(reduced_coefficient)}")
         
-        solver = Solver(reduced_coefficient)
-        solution_type, discriminant, solutions = solver.solve()
+        # Constant equations have no roots to look for: solve them as usual
+        if args.real_roots and Solver._get_poly_degree(reduced_coefficient) > 0:
+            low, high = args.interval or (float("-inf"), float("inf"))
+            roots = Solver(reduced_coefficient).real_roots(low, high)
+            print(OutputFormatter.format_real_roots(low, high, roots))
+            if args.verify and roots:
+                from evaluation import verify_roots
+                print(OutputFormatter.format_checks(roots, verify_roots(reduced_coefficient, roots)))
+            return
         
-        output = OutputFormatter.format_solution(solution_type, discriminant, solutions)
-        print(output)
+        result = solve_reduced(reduced_coefficient, solution_cache)
+        
+        print(OutputFormatter.format_result(result))
+        if args.verify and result.roots:
+            from evaluation import verify_roots
+            checks = verify_roots(reduced_coefficient, result.roots)
+            print(OutputFormatter.format_checks(result.roots, checks))
         
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
 
 
+def write_output(records, args):
+    """JSON Lines on STDOUT, or binary records with --format binary"""
+    if args.format == "binary":
+        return write_packed(records, sys.stdout.buffer)
+    return write_records(records)
+
+
+def solve_lines(lines, args, solution_cache=None):
+    """Solve in this process, or across a process (or thread) pool with --workers"""
+    packed = args.format == "binary"
+    if args.workers:
+        from parallel import solve_parallel, solve_threaded, DEFAULT_CHUNK_SIZE
+        solve = solve_threaded if args.threads else solve_parallel
+        chunk_size = DEFAULT_CHUNK_SIZE if args.chunk_size is None else args.chunk_size
+        records = solve(
+            lines, args.workers, chunk_size, ordered=not args.unordered,
+            solution_cache=solution_cache, packed=packed, verify=args.verify,
+        )
+    else:
+        records = iter_records(
+            lines, solution_cache=solution_cache, packed=packed, verify=args.verify
+        )
+    return write_output(records, args)
+
+
+def solve_mapped(path, args, solution_cache=None):
+    """--mmap: workers map their own byte ranges, or one mapping in-process"""
+    packed = args.format == "binary"
+    if args.workers:
+        from parallel import solve_mapped_parallel, solve_mapped_threaded
+        solve = solve_mapped_threaded if args.threads else solve_mapped_parallel
+        return write_output(
+            solve(
+                path, args.workers, solution_cache=solution_cache, packed=packed,
+                verify=args.verify,
+            ),
+            args,
+        )
+    from mapped_reader import mapped_file, iter_mapped_records
+    with mapped_file(path) as buffer:
+        records = iter_mapped_records(
+            buffer, solution_cache=solution_cache, packed=packed, verify=args.verify
+        )
+        return write_output(records, args)
+
+
+def solve_structured(path, args, solution_cache=None):
+    """--input json/npy/packed: coefficients skip the parser entirely"""
+    from structured_input import iter_json_equations, iter_array_equations, iter_packed_equations
+    from mapped_reader import mapped_file
+
+    def solve(equations):
+        records = iter_terms_records(
+            equations, solution_cache, args.format == "binary", args.verify
+        )
+        return write_output(records, args)
+
+    if args.input == "npy":
+        import numpy as np
+        try:
+            coefficients = np.load(path, mmap_mode="r")
+        except ValueError as e:
+            raise OSError(f"{path}: {e}") from None
+        return solve(iter_array_equations(coefficients))
+    if args.input == "json":
+        if path == "-":
+            return solve(iter_json_equations(sys.stdin))
+        with open(path) as lines:
+            return solve(iter_json_equations(lines))
+    if path == "-":
+        return solve(iter_packed_equations(sys.stdin.buffer.read()))
+    with mapped_file(path) as buffer:
+        return solve(iter_packed_equations(buffer))
+
+
+def solve_batch(path, args):
+    """Stream equations from a file or STDIN, report throughput on STDERR"""
+    STAGE_STATS.enabled = args.stats
+    solution_cache = open_cache(args)
+    if solution_cache is None and args.dedup:
+        solution_cache = dedup_cache()
+    # Closed on every exit, errors included, so the WAL is checkpointed
+    try:
+        if args.input != "text":
+            try:
+                stats = solve_structured(path, args, solution_cache)
+            except (OSError, ValueError) as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+        elif path == "-":
+            stats = solve_lines(sys.stdin, args, solution_cache)
+        else:
+            try:
+                if args.mmap:
+                    stats = solve_mapped(path, args, solution_cache)
+                else:
+                    with open(path) as lines:
+                        stats = solve_lines(lines, args, solution_cache)
+            except OSError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+    finally:
+        if args.cache:
+            solution_cache.close()
+
+    print(stats, file=sys.stderr)
+    if args.cache:
+        print(solution_cache.summary(), file=sys.stderr)
+    elif solution_cache is not None:
+        print(dedup_summary(solution_cache), file=sys.stderr)
+    if args.stats:
+        print(STAGE_STATS.report(), file=sys.stderr)
+
+
+def decode_binary(path, text=False):
+    """--decode: binary batch output back to JSON Lines, or text"""
+    from binary_format import convert_to_jsonl, convert_to_text
+    from mapped_reader import mapped_file
+    convert = convert_to_text if text else convert_to_jsonl
+    try:
+        with mapped_file(path) as buffer:
+            convert(buffer, sys.stdout)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def sweep_values(args):
+    import numpy as np
+    if args.range is not None:
+        start, stop, count = args.range
+        return np.linspace(start, stop, int(count))
+    if args.values.endswith(".npy"):
+        return np.load(args.values)
+    return np.loadtxt(args.values, ndmin=1)
+
+
+def solve_sweep(equation_str, args):
+    """Vectorized sweep of one coefficient, type changes reported on STDERR"""
+    from sweep import sweep
+    try:
+        result = sweep(reduce_input(equation_str, args), args.sweep, sweep_values(args))
+    except (ValueError, ImportError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.output and args.output.endswith(".npy"):
+        result.save_npy(args.output)
+    elif args.output and args.output != "-":
+        with open(args.output, "w") as output:
+            result.write_csv(output)
+    else:
+        result.write_csv(sys.stdout)
+    
+    for index, parameter, old_type, new_type in result.events():
+        print(
+            f"X^{args.sweep} = {parameter}: {old_type} -> {new_type} (row {index})",
+            file=sys.stderr,
+        )
+
+
 def main():
-    equation = get_equation_input()
-    solve_equation(equation)
+    args = parse_arguments(sys.argv[1:])
+
+    if args.batch is not None:
+        solve_batch(args.batch, args)
+        return
+    if args.decode is not None:
+        decode_binary(args.decode, args.format == "text")
+        return
+
+    equation = get_equation_input(args)
+    if args.sweep is not None:
+        solve_sweep(equation, args)
+        return
+    solution_cache = open_cache(args)
+    try:
+        solve_equation(equation, args, solution_cache)
+    finally:
+        if solution_cache is not None:
+            solution_cache.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,79 @@
+import mmap
+from contextlib import contextmanager
+from expression_parser import ExpressionParser
+from pipeline import line_solver
+
+# Bytes split into lines at a time: one copy per block, not per line
+BLOCK_SIZE = 1 << 20
+# Bytes per parallel work item
+DEFAULT_RANGE_SIZE = 4 << 20
+
+
+@contextmanager
+def mapped_file(path):
+    """Read-only mmap of path; empty files (which mmap rejects) give b''"""
+    with open(path, "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b""
+            return
+        try:
+            yield buffer
+        finally:
+            buffer.close()
+
+
+def _line_end(buffer, position, limit):
+    """Offset just past the first newline at or after position, capped at limit"""
+    if position >= limit:
+        return limit
+    newline = buffer.find(b"\n", position, limit)
+    return limit if newline < 0 else newline + 1
+
+
+def split_ranges(buffer, range_size=DEFAULT_RANGE_SIZE, start=0, end=None):
+    """
+    (start, end) byte ranges of about range_size covering buffer[start:end],
+    each ending just past a newline so no line is split between ranges.
+    """
+    if range_size < 1:
+        raise ValueError("Range size must be positive")
+    if end is None:
+        end = len(buffer)
+    while start < end:
+        stop = _line_end(buffer, min(start + range_size, end) - 1, end)
+        yield start, stop
+        start = stop
+
+
+def split_lines(data):
+    """Lines of a bytes block that ends on a line boundary"""
+    lines = data.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+    return lines
+
+
+def iter_mapped_lines(buffer, start=0, end=None, block_size=BLOCK_SIZE):
+    """
+    (line_number, line) for every non-blank line of buffer[start:end],
+    counting from 1 at start. Lines are bytes with surrounding
+    whitespace (including '\\r') stripped; they are never decoded.
+    """
+    line_number = 0
+    for block_start, block_end in split_ranges(buffer, block_size, start, end):
+        for line in split_lines(buffer[block_start:block_end]):
+            line_number += 1
+            line = line.strip()
+            if line:
+                yield line_number, line
+
+
+def iter_mapped_records(buffer, parser=None, solution_cache=None, packed=False, verify=False):
+    """pipeline.iter_records over a mapped buffer"""
+    if parser is None:
+        parser = ExpressionParser(strict_mode=True)
+    solve = line_solver(packed, verify)
+    for line_number, equation in iter_mapped_lines(buffer):
+        yield solve(parser, line_number, equation, solution_cache)
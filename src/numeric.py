@@ -0,0 +1,259 @@
+import struct
+
+EPSILON = 2.220446049250313e-16
+INF = float("inf")
+DEFAULT_REL_TOL = 4 * EPSILON
+LN2 = 0.6931471805599453
+LN2_HI = 6.93147180369123816490e-01
+LN2_LO = 1.90821492927058770002e-10
+SQRT2 = 1.4142135623730951
+PI = 3.141592653589793
+# pi/2 split so k * PIO2_HI is exact for the angles the solver produces
+PIO2_HI = 1.57079632673412561417e+00
+PIO2_LO = 6.07710050650619224932e-11
+# tan(pi/8): above it atan folds its argument through pi/4
+_TAN_PI_8 = 0.41421356237309503
+MAX_ITERATIONS = 64
+
+# Integer roots below this bound are exact as floats
+_EXACT_INT_LIMIT = 1 << 106
+
+_DOUBLE = struct.Struct('<d')
+_UINT64 = struct.Struct('<Q')
+_MANTISSA_MASK = (1 << 52) - 1
+_EXPONENT_ONE = 1023 << 52
+_SQRT_SEED_BIAS = 0x1FF7A3BEA91D9B1B
+_TINY = 2.0 ** -1000
+_TINY_SCALE = 2.0 ** 200
+
+
+def abs(x):
+    if x > 0:
+        return x
+    return -x
+
+
+def _split_float(x):
+    """x = mantissa * 2^exponent with mantissa in [1, 2), x positive normal"""
+    bits = _UINT64.unpack(_DOUBLE.pack(x))[0]
+    mantissa = _DOUBLE.unpack(_UINT64.pack((bits & _MANTISSA_MASK) | _EXPONENT_ONE))[0]
+    return mantissa, (bits >> 52) - 1023
+
+
+def isqrt(n):
+    """Largest integer r with r * r <= n"""
+    if n < 0:
+        raise ValueError("Cannot calculate sqrt of negative number")
+    if n == 0:
+        return 0
+    r = 1 << ((n.bit_length() + 1) // 2)
+    while True:
+        y = (r + n // r) // 2
+        if y >= r:
+            return r
+        r = y
+
+
+def _sqrt_newton(x, rel_tol=DEFAULT_REL_TOL, max_iterations=MAX_ITERATIONS):
+    """
+    Newton's method for sqrt of a positive finite float.
+    Returns (root, iterations) so benchmarks can see the work done.
+    """
+    scale = 1.0
+    if x < _TINY:
+        # Subnormals have no implicit leading bit: lift them first
+        x *= _TINY_SCALE * _TINY_SCALE
+        scale = 1 / _TINY_SCALE
+
+    # Halving the biased exponent bits approximates sqrt within 3.5%
+    bits = _UINT64.unpack(_DOUBLE.pack(x))[0]
+    y = _DOUBLE.unpack(_UINT64.pack((bits >> 1) + _SQRT_SEED_BIAS))[0]
+
+    for iteration in range(1, max_iterations + 1):
+        y_new = (y + x / y) * 0.5
+        delta = y_new - y
+        tolerance = rel_tol * y_new
+        if -tolerance <= delta <= tolerance:
+            return y_new * scale, iteration
+        y = y_new
+    return y * scale, max_iterations
+
+
+def sqrt(x, rel_tol=DEFAULT_REL_TOL, max_iterations=MAX_ITERATIONS):
+    """
+    Square root that always terminates. Perfect-square integers (and
+    integral floats below 2^106) are answered exactly; everything else
+    runs Newton from an exponent-based seed until the relative change
+    drops below rel_tol, capped at max_iterations.
+    """
+    if x < 0:
+        raise ValueError("Cannot calculate sqrt of negative number")
+    if x == 0:
+        return 0
+    if x != x or x == INF:
+        return x
+
+    if isinstance(x, int) or (x < _EXACT_INT_LIMIT and x == int(x)):
+        n = int(x)
+        root = isqrt(n)
+        if root * root == n:
+            return float(root)
+        if isinstance(x, int):
+            x = float(x)
+
+    return _sqrt_newton(x, rel_tol, max_iterations)[0]
+
+
+def log(x):
+    """Natural logarithm of a positive float, atanh series on [0.7, 1.4]"""
+    if x <= 0:
+        raise ValueError("Cannot calculate log of non-positive number")
+    if x != x or x == INF:
+        return x
+
+    offset = 0.0
+    if x < _TINY:
+        x *= _TINY_SCALE
+        offset = -200 * LN2
+    mantissa, exponent = _split_float(x)
+    if mantissa > SQRT2:
+        mantissa /= 2
+        exponent += 1
+
+    # ln(m) = 2 * atanh(s) with s = (m - 1) / (m + 1), |s| < 0.18
+    s = (mantissa - 1) / (mantissa + 1)
+    s2 = s * s
+    term = s
+    total = s
+    k = 1
+    while abs(term) > EPSILON * abs(total):
+        term *= s2
+        k += 2
+        total += term / k
+    return 2 * total + exponent * LN2 + offset
+
+
+def exp(x):
+    """e^x by reduction to r = x - k ln 2, |r| <= ln(2) / 2, and Taylor"""
+    if x != x:
+        return x
+    if x > 709.782712893384:
+        return INF
+    if x < -745.1332191019412:
+        return 0.0
+
+    k = int(x / LN2 + (0.5 if x >= 0 else -0.5))
+    r = (x - k * LN2_HI) - k * LN2_LO
+    term = 1.0
+    total = 1.0
+    n = 0
+    while abs(term) > EPSILON * total:
+        n += 1
+        term *= r / n
+        total += term
+    # Two steps so 2^k never overflows or underflows on its own
+    half = k // 2
+    return total * 2.0 ** half * 2.0 ** (k - half)
+
+
+def _nth_root_newton(x, n, rel_tol=DEFAULT_REL_TOL, max_iterations=MAX_ITERATIONS):
+    """
+    Newton for x^(1/n), x positive finite, from an exp/log seed that is
+    already within a few ulps. Returns (root, iterations).
+    """
+    y = exp(log(x) / n)
+    for iteration in range(1, max_iterations + 1):
+        y_new = ((n - 1) * y + x / y ** (n - 1)) / n
+        if abs(y_new - y) <= rel_tol * y_new:
+            return y_new, iteration
+        y = y_new
+    return y, max_iterations
+
+
+def nth_root(x, n, rel_tol=DEFAULT_REL_TOL, max_iterations=MAX_ITERATIONS):
+    """Real n-th root; odd roots of negative numbers are negative"""
+    if n < 1 or n != int(n):
+        raise ValueError("Root order must be a positive integer")
+    if n == 1:
+        return x
+    if n == 2:
+        return sqrt(x, rel_tol, max_iterations)
+    if x < 0:
+        if n % 2 == 0:
+            raise ValueError("Cannot calculate even root of negative number")
+        return -nth_root(-x, n, rel_tol, max_iterations)
+    if x == 0:
+        return 0
+    if x != x or x == INF:
+        return x
+    return _nth_root_newton(x, n, rel_tol, max_iterations)[0]
+
+
+def gcd(a, b):
+    """Greatest common divisor of two non-negative integers"""
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def cos_sin(theta):
+    """(cos(theta), sin(theta)) by reduction to |r| <= pi/4 and Taylor"""
+    k = int(theta / PIO2_HI + (0.5 if theta >= 0 else -0.5))
+    r = (theta - k * PIO2_HI) - k * PIO2_LO
+    r2 = r * r
+
+    # cos r = 1 - r^2/2! + ..., sin r = r - r^3/3! + ..., both in one loop
+    cos_term = 1.0
+    sin_term = r
+    cos_total = 1.0
+    sin_total = r
+    n = 1
+    while abs(cos_term) > EPSILON * 0.5 or abs(sin_term) > EPSILON * abs(sin_total):
+        cos_term *= -r2 / (n * (n + 1))
+        sin_term *= -r2 / ((n + 1) * (n + 2))
+        cos_total += cos_term
+        sin_total += sin_term
+        n += 2
+
+    quadrant = k % 4
+    if quadrant == 0:
+        return cos_total, sin_total
+    if quadrant == 1:
+        return -sin_total, cos_total
+    if quadrant == 2:
+        return -cos_total, -sin_total
+    return sin_total, -cos_total
+
+
+def _atan_unit(t):
+    """atan(t) for 0 <= t <= 1"""
+    offset = 0.0
+    if t > _TAN_PI_8:
+        # atan(t) = pi/4 + atan((t - 1) / (t + 1)), |argument| <= tan(pi/8)
+        offset = PI / 4
+        t = (t - 1) / (t + 1)
+    t2 = t * t
+    term = t
+    total = t
+    k = 1
+    while abs(term) > EPSILON * abs(total) * k:
+        term *= -t2
+        k += 2
+        total += term / k
+    return offset + total
+
+
+def atan2(y, x):
+    """Angle of the point (x, y) in (-pi, pi], 0 at the origin"""
+    ax, ay = abs(x), abs(y)
+    if ax == 0 and ay == 0:
+        return 0.0
+    if ay > ax:
+        angle = PI / 2 - _atan_unit(ax / ay)
+    else:
+        angle = _atan_unit(ay / ax)
+    if x < 0:
+        angle = PI - angle
+    if y < 0:
+        angle = -angle
+    return angle
@@ -0,0 +1,315 @@
+import os
+import threading
+from collections import deque
+from expression_parser import ExpressionParser
+from cache import LRUCache
+from result_store import ResultStore
+from pipeline import iter_equations, line_solver
+from binary_format import renumber
+from instrumentation import STAGE_STATS
+from mapped_reader import mapped_file, split_ranges, split_lines, DEFAULT_RANGE_SIZE
+
+DEFAULT_CHUNK_SIZE = 1000
+# Chunks queued per worker: enough to keep workers busy without
+# reading the whole input into memory up front
+CHUNKS_IN_FLIGHT_PER_WORKER = 4
+
+# Each worker process builds its own parser (and, when deduplicating,
+# its own solution cache) once, in _init_worker
+_worker_parser = None
+_worker_solution_cache = None
+# Each worker thread builds its own parser in _init_thread; threads share
+# only the solution cache and STAGE_STATS, which lock themselves
+_thread_state = threading.local()
+# Thread workers count straight into the shared cache and STAGE_STATS
+_NO_COUNTERS = (None, None)
+
+
+def _init_worker(stats_enabled=False, cache_spec=None):
+    global _worker_parser, _worker_solution_cache
+    _worker_parser = ExpressionParser(strict_mode=True)
+    _worker_solution_cache = None
+    if cache_spec is not None:
+        kind, *arguments = cache_spec
+        _worker_solution_cache = (ResultStore if kind == "store" else LRUCache)(*arguments)
+    STAGE_STATS.enabled = stats_enabled
+
+
+def _init_thread():
+    _thread_state.parser = ExpressionParser(strict_mode=True)
+
+
+# concurrent.futures (with multiprocessing and logging) is imported by
+# the functions below, only once a pool is used: a single equation
+# solved from the command line never pays for it
+
+def _thread_pool(workers):
+    from concurrent.futures import ThreadPoolExecutor
+    return ThreadPoolExecutor(max_workers=workers, initializer=_init_thread)
+
+
+def _pool(workers, solution_cache):
+    """
+    Worker pool mirroring the parent's solution cache: an LRUCache of
+    the same size per worker, or the same ResultStore file, opened by
+    every worker on its own connection.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    cache_spec = None
+    if isinstance(solution_cache, ResultStore):
+        cache_spec = ("store", solution_cache.path, solution_cache.maxsize, solution_cache.max_age)
+    elif solution_cache is not None:
+        cache_spec = ("memory", solution_cache.maxsize)
+    return ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker,
+        initargs=(STAGE_STATS.enabled, cache_spec),
+    )
+
+
+def _solve_chunk(chunk, packed=False, verify=False):
+    """
+    Worker side: solve a list of (line_number, equation). Returns the
+    records (binary_format records when packed) and the worker counters
+    gathered since the last chunk.
+    """
+    parser = _worker_parser
+    cache = _worker_solution_cache
+    solve = line_solver(packed, verify)
+    records = [
+        solve(parser, line_number, equation, cache) for line_number, equation in chunk
+    ]
+    return records, _take_counters()
+
+
+def _solve_range(path, start, end, packed=False, verify=False):
+    """
+    Worker side: map path and solve the lines in bytes [start, end).
+    Line numbers are local to the range; also returns its line count
+    so the parent can offset them.
+    """
+    with mapped_file(path) as buffer:
+        data = buffer[start:end]
+    records, line_count = _solve_lines(
+        data, _worker_parser, _worker_solution_cache, line_solver(packed, verify)
+    )
+    return records, _take_counters(), line_count
+
+
+def _solve_lines(data, parser, solution_cache, solve):
+    """(records, line count) of a bytes block ending on a line boundary"""
+    lines = split_lines(data)
+    records = []
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line:
+            records.append(solve(parser, line_number, line, solution_cache))
+    return records, len(lines)
+
+
+def _solve_thread_chunk(chunk, solution_cache, packed=False, verify=False):
+    """_solve_chunk for a worker thread, sharing the caller's solution_cache"""
+    parser = _thread_state.parser
+    solve = line_solver(packed, verify)
+    records = [
+        solve(parser, line_number, equation, solution_cache) for line_number, equation in chunk
+    ]
+    return records, _NO_COUNTERS
+
+
+def _solve_thread_range(buffer, start, end, solution_cache, packed=False, verify=False):
+    """_solve_range for a worker thread, reading the caller's mapping"""
+    records, line_count = _solve_lines(
+        buffer[start:end], _thread_state.parser, solution_cache, line_solver(packed, verify)
+    )
+    return records, _NO_COUNTERS, line_count
+
+
+def _take_counters():
+    """
+    (stage stats snapshot, (dedup hits, misses)) since the last call,
+    each None when disabled in this worker.
+    """
+    snapshot = None
+    if STAGE_STATS.enabled:
+        snapshot = STAGE_STATS.snapshot()
+        STAGE_STATS.reset()
+    dedup = None
+    cache = _worker_solution_cache
+    if cache is not None:
+        if isinstance(cache, ResultStore):
+            # Workers are never closed explicitly: commit every chunk
+            cache.flush()
+        dedup = (cache.hits, cache.misses)
+        cache.hits = cache.misses = 0
+    return snapshot, dedup
+
+
+def _merge_counters(counters, solution_cache):
+    snapshot, dedup = counters
+    if snapshot is not None:
+        STAGE_STATS.merge(snapshot)
+    if dedup is not None:
+        solution_cache.hits += dedup[0]
+        solution_cache.misses += dedup[1]
+
+
+def _iter_chunks(lines, chunk_size):
+    chunk = []
+    for item in iter_equations(lines):
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_parallel(lines, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, ordered=True,
+                   solution_cache=None, packed=False, verify=False):
+    """
+    Solve equations, one per line, across a pool of worker processes.
+    Lines are shipped in chunks of chunk_size, with a bounded number of
+    chunks in flight so input is streamed rather than read up front.
+    Records come back in input order, or as chunks finish when
+    ordered=False (each record still carries its line number). Errors
+    stay per equation, exactly as in pipeline.iter_records. Worker
+    stage stats are merged into this process's STAGE_STATS. With a
+    solution_cache every worker deduplicates through a cache of the
+    same size, and their hit/miss counts are added to solution_cache.
+    With packed=True workers return binary_format records instead, and
+    verify is as in pipeline.iter_records.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * CHUNKS_IN_FLIGHT_PER_WORKER
+    chunks = _iter_chunks(lines, chunk_size)
+
+    with _pool(workers, solution_cache) as executor:
+        yield from _run_chunks(
+            executor, chunks, max_in_flight, ordered, solution_cache,
+            _solve_chunk, packed, verify,
+        )
+
+
+def solve_threaded(lines, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, ordered=True,
+                   solution_cache=None, packed=False, verify=False):
+    """
+    solve_parallel across a pool of threads in this process: chunks are
+    handed over without pickling, and every thread deduplicates through
+    solution_cache itself rather than a copy. Threads only run Python
+    in parallel on a free-threaded interpreter; with the GIL this is a
+    way to overlap input and output, not to add cores.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * CHUNKS_IN_FLIGHT_PER_WORKER
+    chunks = _iter_chunks(lines, chunk_size)
+
+    with _thread_pool(workers) as executor:
+        yield from _run_chunks(
+            executor, chunks, max_in_flight, ordered, solution_cache,
+            _solve_thread_chunk, solution_cache, packed, verify,
+        )
+
+
+def _run_chunks(executor, chunks, max_in_flight, ordered, solution_cache, task, *args):
+    """Records of task(chunk, *args) for every chunk, at most max_in_flight queued"""
+    pending = deque()
+    for chunk in chunks:
+        pending.append(executor.submit(task, chunk, *args))
+        if len(pending) >= max_in_flight:
+            yield from _collect(pending, ordered, solution_cache)
+
+    while pending:
+        yield from _collect(pending, ordered, solution_cache)
+
+
+def solve_mapped_parallel(path, workers=None, range_size=DEFAULT_RANGE_SIZE,
+                          solution_cache=None, packed=False, verify=False):
+    """
+    solve_parallel for a file on disk, without the parent reading it:
+    the parent only finds line boundaries to cut the file into byte
+    ranges, and every worker maps the file and solves its own range.
+    Records always come back in input order, since a range's line
+    numbers are only known once every earlier range is counted.
+    packed and verify are as in solve_parallel.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * CHUNKS_IN_FLIGHT_PER_WORKER
+
+    with mapped_file(path) as buffer, _pool(workers, solution_cache) as executor:
+        ranges = split_ranges(buffer, range_size)
+        yield from _run_ranges(
+            executor, ranges, max_in_flight, solution_cache,
+            _solve_range, path, packed=packed, verify=verify,
+        )
+
+
+def solve_mapped_threaded(path, workers=None, range_size=DEFAULT_RANGE_SIZE,
+                          solution_cache=None, packed=False, verify=False):
+    """
+    solve_mapped_parallel across a pool of threads: one mapping of path
+    is shared, and every thread solves its own byte ranges of it. See
+    solve_threaded for when threads add throughput.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * CHUNKS_IN_FLIGHT_PER_WORKER
+
+    with mapped_file(path) as buffer, _thread_pool(workers) as executor:
+        ranges = split_ranges(buffer, range_size)
+        yield from _run_ranges(
+            executor, ranges, max_in_flight, solution_cache,
+            _solve_thread_range, buffer, solution_cache, packed=packed, verify=verify,
+        )
+
+
+def _run_ranges(executor, ranges, max_in_flight, solution_cache, task, source, *args, **kwargs):
+    """
+    Records of task(source, start, end, *args, **kwargs) for every
+    (start, end) range, in input order, at most max_in_flight queued
+    """
+    pending = deque()
+    first_line = 0
+    for start, end in ranges:
+        pending.append(executor.submit(task, source, start, end, *args, **kwargs))
+        if len(pending) >= max_in_flight:
+            records, first_line = _range_records(pending.popleft(), first_line, solution_cache)
+            yield from records
+
+    while pending:
+        records, first_line = _range_records(pending.popleft(), first_line, solution_cache)
+        yield from records
+
+
+def _range_records(future, first_line, solution_cache):
+    """Records of a finished range renumbered from first_line, next first_line"""
+    records, counters, line_count = future.result()
+    _merge_counters(counters, solution_cache)
+    if records and isinstance(records[0], bytes):
+        records = [renumber(packed, first_line) for packed in records]
+    else:
+        for record in records:
+            record["line"] += first_line
+    return records, first_line + line_count
+
+
+def _collect(pending, ordered, solution_cache):
+    """Remove the next finished chunk(s) from pending, return their records"""
+    if ordered:
+        return _chunk_records(pending.popleft(), solution_cache)
+
+    from concurrent.futures import FIRST_COMPLETED, wait
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    records = []
+    for future in done:
+        pending.remove(future)
+        records.extend(_chunk_records(future, solution_cache))
+    return records
+
+
+def _chunk_records(future, solution_cache):
+    records, counters = future.result()
+    _merge_counters(counters, solution_cache)
+    return records
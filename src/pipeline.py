@@ -0,0 +1,325 @@
+import sys
+import time
+from functools import partial
+from expression_parser import ExpressionParser
+from solver import Solver, SolveResult
+from structured_input import reduce_terms
+from formatter import OutputFormatter
+from evaluation import verify_roots
+from instrumentation import STAGE_STATS
+from cache import LRUCache
+from binary_format import MAGIC, pack_solution, pack_error, is_error, is_escalated
+
+# Distinct canonical forms remembered by a batch --dedup run
+DEFAULT_DEDUP_SIZE = 1 << 16
+# Lowest degree looked up by canonical form: a quadratic solves in about
+# 6 us, less than building its key, a cubic in about 60 us
+DEDUP_MIN_DEGREE = 3
+
+
+def solve_reduced(reduced_coefficient, solution_cache=None):
+    """
+    Solver.solve, or with solution_cache (an LRUCache) a lookup by canonical
+    form: a polynomial that is an exact multiple of one already solved
+    (see Polynomial.canonical_form) reuses its roots, with the discriminant
+    rescaled by the ratio of leading coefficients to the power 2n - 2.
+    Roots match solving each equation on its own up to rounding.
+    Below DEDUP_MIN_DEGREE the equation is always solved directly: the
+    exact key costs more than the closed-form solve it would skip, so
+    those equations never reach the cache or its counters.
+    """
+    degree = reduced_coefficient.degree
+    if solution_cache is None or degree < DEDUP_MIN_DEGREE:
+        return Solver(reduced_coefficient).solve()
+
+    key, lead = reduced_coefficient.canonical_form()
+    # Root order follows the sign of the leading coefficient (the
+    # quadratic formula divides by 2a), so keep the sign in the key
+    key = (key, lead > 0)
+    cached = solution_cache.get(key)
+    if cached is None:
+        solution = Solver(reduced_coefficient).solve()
+        solution_cache.put(key, (lead, solution))
+        return solution
+
+    cached_lead, solution = cached
+    if solution.discriminant is None or lead == cached_lead:
+        return solution
+    # The discriminant is homogeneous of degree 2n - 2 in the coefficients
+    scale = (lead / cached_lead) ** (2 * degree - 2)
+    return SolveResult(
+        solution.kind, solution.discriminant * scale, solution.roots, solution.escalated
+    )
+
+
+def dedup_cache(maxsize=DEFAULT_DEDUP_SIZE):
+    """Solutions cache for solve_reduced; its hits are solves skipped"""
+    return LRUCache(maxsize)
+
+
+def dedup_summary(solution_cache):
+    lookups = solution_cache.hits + solution_cache.misses
+    ratio = solution_cache.hits / lookups if lookups else 0.0
+    return (
+        f"Deduplicated {solution_cache.hits} of {lookups} equations "
+        f"({ratio:.1%} of solves skipped)"
+    )
+
+
+def solve_record(parser, equation_str, solution_cache=None, verify=False):
+    """
+    Parse, reduce and solve one equation into a JSON-ready record.
+    verify adds every root's residual and condition estimate (see
+    evaluation.verify_roots).
+    """
+    if STAGE_STATS.enabled:
+        return _solve_record_timed(parser, equation_str, STAGE_STATS, solution_cache, verify)
+    reduced_coefficient = parser.parse_reduced(equation_str)
+    degree = Solver._get_poly_degree(reduced_coefficient)
+
+    solution = solve_reduced(reduced_coefficient, solution_cache)
+
+    record = OutputFormatter.format_record(
+        reduced_coefficient, degree, *solution, escalated=solution.escalated
+    )
+    if verify:
+        record.update(OutputFormatter.format_verification(
+            verify_roots(reduced_coefficient, solution.roots)
+        ))
+    return record
+
+
+def _solve_timed(parser, equation_str, stats, solution_cache=None):
+    """Parse, reduce and solve with every stage timed into stats"""
+    left_terms, right_terms, magnitudes = parser._parse_timed(equation_str, stats)
+    return _reduce_timed(left_terms, right_terms, stats, solution_cache, magnitudes)
+
+
+def _reduce_timed(left_terms, right_terms, stats, solution_cache=None, magnitudes=None):
+    """
+    Reduce and solve already parsed sides, timing both stages into stats.
+    right_terms=None means left_terms is structured input equal to zero;
+    magnitudes is as in ExpressionParser.reduce_equation.
+    """
+    start = time.perf_counter()
+    if right_terms is None:
+        reduced_coefficient = reduce_terms(left_terms)
+    else:
+        reduced_coefficient = ExpressionParser.reduce_equation(left_terms, right_terms, magnitudes)
+    degree = Solver._get_poly_degree(reduced_coefficient)
+    now = time.perf_counter()
+    stats.add("reduce", now - start)
+    
+    start = now
+    solution = solve_reduced(reduced_coefficient, solution_cache)
+    stats.add("solve", time.perf_counter() - start)
+    stats.count_solution(degree, solution[0])
+    return reduced_coefficient, degree, solution
+
+
+def _solve_record_timed(parser, equation_str, stats, solution_cache=None, verify=False):
+    """solve_record with every stage timed into stats"""
+    reduced_coefficient, degree, solution = _solve_timed(
+        parser, equation_str, stats, solution_cache
+    )
+    start = time.perf_counter()
+    record = OutputFormatter.format_record(
+        reduced_coefficient, degree, *solution, escalated=solution.escalated
+    )
+    if verify:
+        record.update(OutputFormatter.format_verification(
+            verify_roots(reduced_coefficient, solution[2])
+        ))
+    stats.add("format", time.perf_counter() - start)
+    return record
+
+
+def solve_line(parser, line_number, equation, solution_cache=None, verify=False):
+    """solve_record for one input line, with errors kept in the record"""
+    record = {"line": line_number}
+    try:
+        record.update(solve_record(parser, equation, solution_cache, verify))
+    except Exception as e:
+        record["error"] = str(e)
+    return record
+
+
+def line_solver(packed=False, verify=False):
+    """The per-line solve of iter_records: solve_packed or solve_line"""
+    if packed:
+        return solve_packed
+    if verify:
+        return partial(solve_line, verify=True)
+    return solve_line
+
+
+def solve_packed(parser, line_number, equation, solution_cache=None):
+    """
+    solve_line as a binary_format record: the roots are packed as
+    doubles and never formatted as text.
+    """
+    try:
+        if STAGE_STATS.enabled:
+            _, degree, solution = _solve_timed(parser, equation, STAGE_STATS, solution_cache)
+        else:
+            reduced_coefficient = parser.parse_reduced(equation)
+            degree = Solver._get_poly_degree(reduced_coefficient)
+            solution = solve_reduced(reduced_coefficient, solution_cache)
+    except Exception as e:
+        return pack_error(line_number, str(e))
+    if STAGE_STATS.enabled:
+        start = time.perf_counter()
+        packed = pack_solution(line_number, degree, *solution, escalated=solution.escalated)
+        STAGE_STATS.add("encode", time.perf_counter() - start)
+        return packed
+    return pack_solution(line_number, degree, *solution, escalated=solution.escalated)
+
+
+def solve_terms(line_number, terms, solution_cache=None, packed=False, verify=False):
+    """
+    solve_line (or solve_packed) for coefficients that are already
+    numbers: terms (an exponent -> coefficient mapping or (exponent,
+    coefficient) pairs, equal to zero) go straight to
+    structured_input.reduce_terms with no text to normalize, validate
+    or tokenize. verify is as in solve_record.
+    """
+    try:
+        if STAGE_STATS.enabled:
+            reduced_coefficient, degree, solution = _reduce_timed(
+                terms, None, STAGE_STATS, solution_cache
+            )
+        else:
+            reduced_coefficient = reduce_terms(terms)
+            degree = Solver._get_poly_degree(reduced_coefficient)
+            solution = solve_reduced(reduced_coefficient, solution_cache)
+    except Exception as e:
+        if packed:
+            return pack_error(line_number, str(e))
+        return {"line": line_number, "error": str(e)}
+    
+    if packed:
+        return pack_solution(line_number, degree, *solution, escalated=solution.escalated)
+    record = {"line": line_number}
+    record.update(OutputFormatter.format_record(
+        reduced_coefficient, degree, *solution, escalated=solution.escalated
+    ))
+    if verify:
+        record.update(OutputFormatter.format_verification(
+            verify_roots(reduced_coefficient, solution[2])
+        ))
+    return record
+
+
+def iter_terms_records(equations, solution_cache=None, packed=False, verify=False):
+    """
+    iter_records for (line_number, terms) pairs, such as the
+    structured_input iter_*_equations produce.
+    """
+    for line_number, terms in equations:
+        yield solve_terms(line_number, terms, solution_cache, packed, verify)
+
+
+def iter_equations(lines):
+    """(line_number, equation) for every non-blank line"""
+    for line_number, line in enumerate(lines, 1):
+        equation = line.strip()
+        if equation:
+            yield line_number, equation
+
+
+def iter_records(lines, parser=None, solution_cache=None, packed=False, verify=False):
+    """
+    Solve a stream of equations, one per line, through a single parser.
+    Errors are recorded per line instead of aborting the whole stream.
+    Blank lines are skipped but still counted for line numbers. With a
+    solution_cache (see dedup_cache) each canonical form is solved once.
+    With packed=True the records are binary_format bytes (see solve_packed),
+    with verify JSON records carry root residuals (see solve_record).
+    """
+    if parser is None:
+        parser = ExpressionParser(strict_mode=True)
+
+    solve = line_solver(packed, verify)
+    for line_number, equation in iter_equations(lines):
+        yield solve(parser, line_number, equation, solution_cache)
+
+
+class BatchStats:
+    """
+    Throughput counters for a batch run; escalated counts the equations
+    floats could not settle, solved again in exact arithmetic
+    """
+
+    def __init__(self):
+        self.equations = 0
+        self.errors = 0
+        self.escalated = 0
+        self.elapsed = 0.0
+
+    @property
+    def rate(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return self.equations / self.elapsed
+
+    def __str__(self):
+        return (
+            f"Solved {self.equations} equations ({self.errors} errors, "
+            f"{self.escalated} escalated) in {self.elapsed:.3f}s: {self.rate:.0f} equations/s"
+        )
+
+
+def run_batch(lines, output=None, parser=None, solution_cache=None):
+    """Stream records for every line as JSON Lines into output (default: STDOUT)"""
+    return write_records(iter_records(lines, parser, solution_cache), output)
+
+
+def _format_json_timed(record):
+    start = time.perf_counter()
+    line = OutputFormatter.format_json(record)
+    STAGE_STATS.add("encode", time.perf_counter() - start)
+    return line
+
+
+def write_records(records, output=None):
+    """Write records as JSON Lines, timing the whole stream"""
+    if output is None:
+        # Looked up per call, so a redirected sys.stdout is honoured
+        output = sys.stdout
+    stats = BatchStats()
+    write = output.write
+    format_json = OutputFormatter.format_json
+    if STAGE_STATS.enabled:
+        format_json = _format_json_timed
+    start = time.perf_counter()
+
+    for record in records:
+        stats.equations += 1
+        if "error" in record:
+            stats.errors += 1
+        elif "escalated" in record:
+            stats.escalated += 1
+        write(format_json(record))
+        write("\n")
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def write_packed(records, output):
+    """write_records for binary_format records, output a binary stream"""
+    stats = BatchStats()
+    write = output.write
+    start = time.perf_counter()
+
+    write(MAGIC)
+    for packed in records:
+        stats.equations += 1
+        if is_error(packed):
+            stats.errors += 1
+        elif is_escalated(packed):
+            stats.escalated += 1
+        write(packed)
+
+    stats.elapsed = time.perf_counter() - start
+    return stats
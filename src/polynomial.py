@@ -0,0 +1,290 @@
+from array import array
+from bisect import bisect_left
+from math import gcd
+
+# Exponents above this switch storage from dense to sparse
+DENSE_LIMIT = 256
+# Dense slots allocated up front: enough for every quadratic
+INITIAL_CAPACITY = 4
+_INITIAL_COEFFICIENTS = array('d', [0.0] * INITIAL_CAPACITY)
+
+
+class Polynomial:
+    """
+    Exponent -> coefficient mapping for polynomial terms.
+    Low degrees live in a dense array('d') indexed by exponent, with a
+    bytearray marking which exponents were actually written (an explicit
+    0 * X^2 term is kept, like a dict would). Once an exponent above
+    DENSE_LIMIT appears the storage switches to parallel sorted
+    exponent / coefficient arrays. Iteration is always by ascending
+    exponent. Degree and leading coefficient are cached until the next
+    mutation.
+    """
+    __slots__ = ('_coefficients', '_present', '_exponents', '_degree')
+
+    def __init__(self, terms=None):
+        self._coefficients = array('d', _INITIAL_COEFFICIENTS)
+        self._present = bytearray(INITIAL_CAPACITY)
+        self._exponents = None
+        self._degree = None
+        if terms:
+            self.update(terms)
+
+    def update(self, terms):
+        """Accumulate every (exponent, coefficient) of a mapping or iterable"""
+        items = iter(terms.items() if hasattr(terms, 'items') else terms)
+        if self._exponents is None:
+            # Dense fast path, falling back to add_term for huge exponents
+            coefficients = self._coefficients
+            present = self._present
+            self._degree = None
+            for exp, coef in items:
+                if 0 <= exp < len(present):
+                    coefficients[exp] += coef
+                    present[exp] = 1
+                else:
+                    self.add_term(exp, coef)
+                    if self._exponents is not None:
+                        break
+                    coefficients = self._coefficients
+                    present = self._present
+            else:
+                return self
+        for exp, coef in items:
+            self.add_term(exp, coef)
+        return self
+
+    @property
+    def is_sparse(self):
+        return self._exponents is not None
+
+    def _to_sparse(self):
+        coefficients = self._coefficients
+        exponents = [exp for exp, present in enumerate(self._present) if present]
+        self._coefficients = array('d', [coefficients[exp] for exp in exponents])
+        self._exponents = exponents
+        self._present = None
+
+    def _grow(self, size):
+        # Grow geometrically so accumulating X^0, X^1, ... is amortized
+        size = max(size, 2 * len(self._present))
+        missing = size - len(self._present)
+        self._coefficients.frombytes(bytes(8 * missing))
+        self._present.extend(bytes(missing))
+
+    def add_term(self, exp, coef):
+        """Accumulate coef into the X^exp term"""
+        if exp < 0:
+            raise ValueError("Negative exponents not supported")
+        self._degree = None
+        if self._exponents is None:
+            if exp <= DENSE_LIMIT:
+                if exp >= len(self._present):
+                    self._grow(exp + 1)
+                self._coefficients[exp] += coef
+                self._present[exp] = 1
+                return
+            self._to_sparse()
+
+        exponents = self._exponents
+        index = bisect_left(exponents, exp)
+        if index < len(exponents) and exponents[index] == exp:
+            self._coefficients[index] += coef
+        else:
+            exponents.insert(index, exp)
+            self._coefficients.insert(index, coef)
+
+    def __setitem__(self, exp, coef):
+        if exp in self:
+            # Assign rather than add the difference, which could round
+            self._degree = None
+            if self._exponents is None:
+                self._coefficients[exp] = coef
+            else:
+                self._coefficients[bisect_left(self._exponents, exp)] = coef
+        else:
+            self.add_term(exp, coef)
+
+    def __delitem__(self, exp):
+        if exp not in self:
+            raise KeyError(exp)
+        self._degree = None
+        if self._exponents is None:
+            self._present[exp] = 0
+            self._coefficients[exp] = 0.0
+            return
+        index = bisect_left(self._exponents, exp)
+        del self._exponents[index]
+        del self._coefficients[index]
+
+    def __getitem__(self, exp):
+        if self._exponents is None:
+            if 0 <= exp < len(self._present) and self._present[exp]:
+                return self._coefficients[exp]
+        else:
+            index = bisect_left(self._exponents, exp)
+            if index < len(self._exponents) and self._exponents[index] == exp:
+                return self._coefficients[index]
+        raise KeyError(exp)
+
+    def get(self, exp, default=None):
+        if self._exponents is None:
+            if 0 <= exp < len(self._present) and self._present[exp]:
+                return self._coefficients[exp]
+            return default
+        index = bisect_left(self._exponents, exp)
+        if index < len(self._exponents) and self._exponents[index] == exp:
+            return self._coefficients[index]
+        return default
+
+    def __contains__(self, exp):
+        if self._exponents is None:
+            return 0 <= exp < len(self._present) and self._present[exp] == 1
+        index = bisect_left(self._exponents, exp)
+        return index < len(self._exponents) and self._exponents[index] == exp
+
+    def keys(self):
+        if self._exponents is None:
+            return [exp for exp, present in enumerate(self._present) if present]
+        return list(self._exponents)
+
+    def values(self):
+        if self._exponents is None:
+            coefficients = self._coefficients
+            return [coefficients[exp] for exp, present in enumerate(self._present) if present]
+        return list(self._coefficients)
+
+    def items(self):
+        if self._exponents is None:
+            coefficients = self._coefficients
+            return [
+                (exp, coefficients[exp])
+                for exp, present in enumerate(self._present) if present
+            ]
+        return list(zip(self._exponents, self._coefficients))
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        if self._exponents is None:
+            return self._present.count(1)
+        return len(self._exponents)
+
+    def __eq__(self, other):
+        if isinstance(other, Polynomial):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return dict(self.items()) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Polynomial({dict(self.items())})"
+
+    def copy(self):
+        clone = Polynomial.__new__(Polynomial)
+        clone._coefficients = array('d', self._coefficients)
+        if self._exponents is None:
+            clone._present = bytearray(self._present)
+            clone._exponents = None
+        else:
+            clone._present = None
+            clone._exponents = list(self._exponents)
+        clone._degree = self._degree
+        return clone
+
+    def subtract(self, other):
+        """In place: self -= other, term by term"""
+        if (isinstance(other, Polynomial) and other._exponents is None
+                and self._exponents is None):
+            size = len(other._present)
+            if size > len(self._present):
+                self._grow(size)
+            coefficients = self._coefficients
+            present = self._present
+            other_coefficients = other._coefficients
+            for exp, flag in enumerate(other._present):
+                if flag:
+                    coefficients[exp] -= other_coefficients[exp]
+                    present[exp] = 1
+            self._degree = None
+            return self
+        return self.update([(exp, -coef) for exp, coef in other.items()])
+
+    def reduce(self, tolerance=1e-10):
+        """In place: drop every term whose |coefficient| <= tolerance"""
+        self._degree = None
+        coefficients = self._coefficients
+        if self._exponents is None:
+            present = self._present
+            for exp, coef in enumerate(coefficients):
+                if -tolerance <= coef <= tolerance and present[exp]:
+                    present[exp] = 0
+                    coefficients[exp] = 0.0
+            return self
+
+        kept = [
+            (exp, coef) for exp, coef in zip(self._exponents, coefficients)
+            if not -tolerance <= coef <= tolerance
+        ]
+        self._exponents = [exp for exp, _ in kept]
+        self._coefficients = array('d', [coef for _, coef in kept])
+        return self
+
+    @property
+    def degree(self):
+        """Highest exponent with a non-zero coefficient, 0 if there is none"""
+        if self._degree is None:
+            self._degree = 0
+            coefficients = self._coefficients
+            if self._exponents is None:
+                for exp in range(len(coefficients) - 1, -1, -1):
+                    if coefficients[exp]:
+                        self._degree = exp
+                        break
+            else:
+                for index in range(len(coefficients) - 1, -1, -1):
+                    if coefficients[index]:
+                        self._degree = self._exponents[index]
+                        break
+        return self._degree
+
+    @property
+    def leading_coefficient(self):
+        return self.get(self.degree, 0.0)
+
+    def dense_coefficients(self):
+        """Coefficients of X^0 .. X^degree as a list, zeros filled in"""
+        degree = self.degree
+        if self._exponents is None:
+            return self._coefficients[:degree + 1].tolist()
+        dense = [0.0] * (degree + 1)
+        for exp, coef in zip(self._exponents, self._coefficients):
+            if exp <= degree:
+                dense[exp] = coef
+        return dense
+
+    def canonical_form(self):
+        """
+        (key, leading coefficient): key is a hashable normal form shared
+        by every non-zero multiple of this polynomial with exactly the
+        same coefficient ratios, namely its ascending (exponent, integer)
+        pairs, coprime with the leading one positive. Floats are dyadic
+        rationals, so the key is exact: roots depend only on it.
+        """
+        lead = self.leading_coefficient
+        items = self.items()
+        if not lead:
+            return tuple(items), lead
+        ratios = [coef.as_integer_ratio() for _, coef in items]
+        # Denominators are powers of two: the largest is a common multiple
+        denominator = max(d for _, d in ratios)
+        numerators = [n * (denominator // d) for n, d in ratios]
+        content = gcd(*numerators)
+        if lead < 0:
+            content = -content
+        return tuple(
+            (exp, n // content) for (exp, _), n in zip(items, numerators)
+        ), lead
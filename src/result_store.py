@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from threading import RLock
+from cache import LRUCache
+from solver import ComplexNumber, SolveResult, SOLUTION_CODES
+from root_finder import ApproximateRoot
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+# Decoded results kept in memory in front of the database
+MEMORY_ENTRIES = 4096
+# Writes (new results and last-used stamps) buffered between commits
+COMMIT_INTERVAL = 1000
+# Modules whose source decides what the solver returns
+SOLVER_SOURCES = ("solver.py", "root_finder.py", "numeric.py", "polynomial.py", "result_store.py")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+"""
+
+_solver_version = None
+
+
+def solver_version():
+    """Hash of the solver sources: results from other code are discarded"""
+    global _solver_version
+    if _solver_version is None:
+        digest = hashlib.sha256()
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in SOLVER_SOURCES:
+            with open(os.path.join(here, name), "rb") as f:
+                digest.update(f.read())
+        _solver_version = digest.hexdigest()[:16]
+    return _solver_version
+
+
+def _encode_root(root):
+    if hasattr(root, "error"):
+        return ["a", root.real, root.imaginary, root.error]
+    if hasattr(root, "imaginary"):
+        return ["c", root.real, root.imaginary]
+    return root
+
+
+def _decode_root(root):
+    if not isinstance(root, list):
+        return root
+    if root[0] == "a":
+        return ApproximateRoot(complex(root[1], root[2]), root[3])
+    return ComplexNumber(root[1], root[2])
+
+
+class ResultStore:
+    """
+    SQLite-backed, cross-run counterpart of the LRUCache used for batch
+    deduplication: same get/put/hits/misses surface, so it plugs into
+    pipeline.solve_reduced. Keys are canonical forms, values are
+    (leading coefficient, Solver.solve result).
+    The database runs in WAL mode so several processes can read while
+    one writes. Writes and last-used stamps are buffered and committed
+    every COMMIT_INTERVAL operations and on flush()/close(); eviction
+    then drops entries older than max_age seconds and the least
+    recently used ones beyond max_entries. Entries written by a
+    different solver_version() are dropped when the store is opened.
+    Recently used results are also kept decoded in an in-memory LRUCache
+    so repeated keys within a run skip the database. One store can be
+    shared by worker threads: its connection is used under a lock.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_MAX_ENTRIES, max_age=None):
+        if max_entries <= 0:
+            raise ValueError("Cache size must be positive")
+        self.path = path
+        self.maxsize = max_entries
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pending = 0
+        self._used = set()
+        self._memory = LRUCache(MEMORY_ENTRIES)
+        # Reentrant: get/put may flush while holding it
+        self._lock = RLock()
+
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        with self._db:
+            row = self._db.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != solver_version():
+                self._db.execute("DELETE FROM results")
+                self._db.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (solver_version(),)
+                )
+        self._count_entries()
+        self._evict()
+
+    def _count_entries(self):
+        # Kept up to date by put/evict rather than counted on every flush
+        self._size = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __len__(self):
+        return self._size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def get(self, key, default=None):
+        text = repr(key)
+        with self._lock:
+            value = self._memory.get(text)
+            if value is None:
+                row = self._db.execute(
+                    "SELECT payload FROM results WHERE key = ?", (text,)
+                ).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return default
+                lead, solution_type, discriminant, roots, escalated = json.loads(row[0])
+                value = lead, SolveResult(
+                    SOLUTION_CODES[solution_type], discriminant,
+                    [_decode_root(r) for r in roots], escalated,
+                )
+                self._memory.put(text, value)
+            self.hits += 1
+            if text not in self._used:
+                self._used.add(text)
+                self._wrote()
+            return value
+
+    def put(self, key, value):
+        text = repr(key)
+        lead, solution = value
+        solution_type, discriminant, roots = solution
+        payload = json.dumps([
+            lead, solution_type, discriminant, [_encode_root(r) for r in roots], solution.escalated
+        ])
+        now = time.time()
+        with self._lock:
+            self._memory.put(text, value)
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO results VALUES (?, ?, ?, ?)", (text, payload, now, now)
+            )
+            self._size += cursor.rowcount
+            self._wrote()
+
+    def _wrote(self):
+        self._pending += 1
+        if self._pending >= COMMIT_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Commit buffered writes and last-used stamps, then evict"""
+        with self._lock:
+            if self._used:
+                self._db.executemany(
+                    "UPDATE results SET last_used = ? WHERE key = ?",
+                    [(time.time(), key) for key in self._used],
+                )
+                self._used.clear()
+            self._db.commit()
+            self._pending = 0
+            self._evict()
+
+    def _evict(self):
+        with self._db:
+            if self.max_age is not None:
+                cursor = self._db.execute(
+                    "DELETE FROM results WHERE last_used < ?", (time.time() - self.max_age,)
+                )
+                self.evictions += cursor.rowcount
+                self._size -= cursor.rowcount
+            excess = self._size - self.maxsize
+            if excess > 0:
+                cursor = self._db.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY last_used LIMIT ?)", (excess,)
+                )
+                self.evictions += cursor.rowcount
+                # Other processes write to the same file: recount after trimming
+                self._count_entries()
+
+    def clear(self):
+        with self._lock:
+            with self._db:
+                self._db.execute("DELETE FROM results")
+            self._memory.clear()
+            self._used.clear()
+            self._size = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._count_entries()
+            self._db.close()
+
+    def info(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "size": len(self),
+            "maxsize": self.maxsize,
+        }
+
+    def summary(self):
+        info = self.info()
+        return (
+            f"Result cache: {info['hits']} hits, {info['misses']} misses "
+            f"({info['hit_rate']:.1%} hit rate), {info['size']} entries, "
+            f"{info['evictions']} evicted"
+        )
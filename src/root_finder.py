@@ -0,0 +1,190 @@
+from numeric import nth_root
+
+DEFAULT_TOLERANCE = 1e-14
+DEFAULT_MAX_ITERATIONS = 500
+EPSILON = 2.220446049250313e-16
+
+# Starting points are r * u^k: an irrational rotation spreads them around
+# the circle without needing cos/sin (classic Durand-Kerner seed).
+_SEED = complex(0.4, 0.9)
+_ROTATION = _SEED / abs(_SEED)
+
+
+class ApproximateRoot:
+    """A numerically found root with an upper bound on its error"""
+
+    __slots__ = ('value', 'error')
+
+    def __init__(self, value, error):
+        self.value = value
+        self.error = error
+
+    @property
+    def real(self):
+        return self.value.real
+
+    @property
+    def imaginary(self):
+        return self.value.imag
+
+    def __str__(self):
+        if self.imaginary == 0:
+            return f"{self.real}"
+        if self.imaginary >= 0:
+            return f"{self.real} + {self.imaginary}i"
+        return f"{self.real} - {-self.imaginary}i"
+
+
+class RootFinderResult:
+    """Roots, per-root error bounds and convergence info of one run"""
+
+    def __init__(self, roots, errors, iterations, converged):
+        self.roots = roots
+        self.errors = errors
+        self.iterations = iterations
+        self.converged = converged
+
+
+def _evaluate(coefficients, z):
+    """Horner's rule for p(z) and p'(z), coefficients from highest degree"""
+    p = coefficients[0]
+    dp = 0
+    for coef in coefficients[1:]:
+        dp = dp * z + p
+        p = p * z + coef
+    return p, dp
+
+
+def _rounding_bound(coefficients, modulus):
+    """Bound on the rounding error of Horner's rule at |z| = modulus"""
+    bound = abs(coefficients[0])
+    for coef in coefficients[1:]:
+        bound = bound * modulus + abs(coef)
+    return 2 * len(coefficients) * EPSILON * bound
+
+
+def _newton_ratio(coefficients, reversed_coefficients, z):
+    """
+    (p(z) / p'(z), in_noise) where in_noise says |p(z)| is below the
+    rounding error of evaluating it. The ratio is None at stationary
+    points. Outside the unit circle p is evaluated as z^n * q(1/z), with
+    q the reversed polynomial, so z^n never overflows on high degrees.
+    """
+    modulus = abs(z)
+    if modulus <= 1:
+        p, dp = _evaluate(coefficients, z)
+        in_noise = abs(p) <= _rounding_bound(coefficients, modulus)
+        return (p / dp if dp != 0 else None), in_noise
+
+    w = 1 / z
+    q, dq = _evaluate(reversed_coefficients, w)
+    in_noise = abs(q) <= _rounding_bound(reversed_coefficients, 1 / modulus)
+    if q == 0:
+        return 0j, in_noise
+    # p'(z) / p(z) = n / z - w^2 q'(w) / q(w)
+    log_derivative = (len(coefficients) - 1) * w - w * w * dq / q
+    return (1 / log_derivative if log_derivative != 0 else None), in_noise
+
+
+def _initial_roots(coefficients, degree):
+    # Roots of a monic polynomial have geometric mean |a0|^(1/n)
+    radius = nth_root(abs(coefficients[-1]), degree)
+    if radius == 0:
+        radius = 1.0
+    roots = []
+    point = complex(radius, 0)
+    for _ in range(degree):
+        point *= _ROTATION
+        roots.append(point)
+    return roots
+
+
+def find_roots(coefficients, tolerance=DEFAULT_TOLERANCE,
+               max_iterations=DEFAULT_MAX_ITERATIONS, initial_roots=None):
+    """
+    All complex roots of a polynomial by Aberth-Ehrlich iteration.
+    coefficients are ordered from degree 0 upwards and the last one must
+    be non-zero. A root stops moving once its Newton-Aberth correction is
+    below tolerance relative to its modulus, or once |p(z)| is within the
+    rounding error of evaluating it; the iteration cap bounds the total
+    work. Each error is the radius n * |p(z) / p'(z)|, a disk around
+    the estimate that is guaranteed to contain a true root.
+    """
+    degree = len(coefficients) - 1
+    if degree < 1:
+        raise ValueError("Polynomial must have degree at least 1")
+    leading = coefficients[-1]
+    if leading == 0:
+        raise ValueError("Leading coefficient must be non-zero")
+
+    # Zero roots are exact: factor them out before iterating
+    zeros = 0
+    while coefficients[zeros] == 0:
+        zeros += 1
+    monic = [coef / leading for coef in reversed(coefficients[zeros:])]
+    reversed_monic = monic[::-1]
+    n = degree - zeros
+
+    if n == 0:
+        return RootFinderResult([0j] * zeros, [0.0] * zeros, 0, True)
+
+    if initial_roots is not None and len(initial_roots) == n:
+        roots = [complex(z) for z in initial_roots]
+    else:
+        roots = _initial_roots(monic, n)
+    done = [False] * n
+    iterations = 0
+
+    while iterations < max_iterations and not all(done):
+        iterations += 1
+        for i in range(n):
+            if done[i]:
+                continue
+            z = roots[i]
+            ratio, in_noise = _newton_ratio(monic, reversed_monic, z)
+            if in_noise:
+                # p(z) is already lost in rounding noise
+                done[i] = True
+                continue
+            if ratio is None:
+                # Stationary point: nudge off it and try again next sweep
+                roots[i] = z * (1 + 1e-8) + 1e-8
+                continue
+
+            repulsion = 0
+            for j in range(n):
+                if j != i:
+                    diff = z - roots[j]
+                    if diff != 0:
+                        repulsion += 1 / diff
+            step = ratio / (1 - ratio * repulsion)
+            z -= step
+            roots[i] = z
+            if abs(step) <= tolerance * abs(z):
+                done[i] = True
+
+    errors = []
+    for z in roots:
+        ratio, _ = _newton_ratio(monic, reversed_monic, z)
+        errors.append(n * abs(ratio) if ratio is not None else float("inf"))
+
+    return RootFinderResult(
+        [0j] * zeros + roots, [0.0] * zeros + errors, iterations, all(done)
+    )
+
+
+def approximate_roots(coefficients, tolerance=DEFAULT_TOLERANCE,
+                      max_iterations=DEFAULT_MAX_ITERATIONS, initial_roots=None):
+    """
+    find_roots for real polynomials, wrapped as ApproximateRoot objects.
+    Roots whose error disk reaches the real axis are reported as real;
+    the list is sorted by real then imaginary part.
+    """
+    result = find_roots(coefficients, tolerance, max_iterations, initial_roots)
+    roots = []
+    for value, error in zip(result.roots, result.errors):
+        if abs(value.imag) <= error:
+            value = complex(value.real, 0)
+        roots.append(ApproximateRoot(value, error))
+    roots.sort(key=lambda root: (root.real, root.imaginary))
+    return roots, result
@@ -49,8 +49,8 @@ run_test 1 \
 "Reduced form: 4.0 * X^0 + 4.0 * X^1 - 9.3 * X^2 = 0
 Polynomial degree: 2
 Discriminant is strictly positive, the two solutions are:
-0.905239
--0.475131"
+-0.47513146390886934
+0.9052389907905898"
 
 # Test 2: Linear equation
 run_test 2 \
@@ -60,12 +60,15 @@ Polynomial degree: 1
 The solution is:
 -0.25"
 
-# Test 3: Cubic equation (unsolvable)
+# Test 3: Cubic equation (closed form)
 run_test 3 \
     "8 * X^0 - 6 * X^1 + 0 * X^2 - 5.6 * X^3 = 3 * X^0" \
-"Reduced form: 5.0 * X^0 - 6.0 * X^1 + 0.0 * X^2 - 5.6 * X^3 = 0
+"Reduced form: 5.0 * X^0 - 6.0 * X^1 - 5.6 * X^3 = 0
 Polynomial degree: 3
-The polynomial degree is strictly greater than 2, I can't solve."
+The polynomial is cubic, the 3 solutions are:
+-0.30779906486848196 - 1.1643235651786437i
+-0.30779906486848196 + 1.1643235651786437i
+0.6155981297369639"
 
 # Test 4: Infinite solutions
 run_test 4 \
@@ -110,7 +113,7 @@ Discriminant is strictly positive, the two solutions are:
 # Test 9: Invalid format (should fail)
 run_test 9 \
     "5 * X = 0" \
-"Error: Invalid equation: no valid terms found"
+"Error: Invalid equation: invalid term '5*X' at position 0"
 
 # Test 10: Missing equals sign (should fail)
 run_test 10 \
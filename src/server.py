@@ -0,0 +1,128 @@
+import sys
+import json
+import asyncio
+import argparse
+from expression_parser import ExpressionParser
+from pipeline import solve_record
+from formatter import OutputFormatter
+
+DEFAULT_PORT = 4242
+DEFAULT_MAX_IN_FLIGHT = 64
+# Longest request line accepted, in bytes
+MAX_LINE_LENGTH = 1 << 20
+
+
+class SolverServer:
+    """
+    Newline-delimited JSON solver service over TCP or a Unix socket.
+    Each request line is {"id": ..., "equation": "..."}; each response
+    line is the pipeline record (or {"error": ...}) with the same id.
+    Requests on one connection may be pipelined and are answered in
+    order. A bounded queue sits between reading and answering, so a
+    client that stops reading responses stops being read from.
+    """
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT):
+        self.max_in_flight = max_in_flight
+        self.parser = ExpressionParser(strict_mode=True)
+        self.requests = 0
+
+    def answer(self, line):
+        """One request line to one response line (bytes in, bytes out)"""
+        self.requests += 1
+        try:
+            request = json.loads(line)
+            equation = request["equation"]
+            request_id = request.get("id")
+            if not isinstance(equation, str):
+                raise TypeError("equation must be a string")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return self._encode({"id": None, "error": "Invalid request"})
+
+        response = {"id": request_id}
+        try:
+            response.update(solve_record(self.parser, equation))
+        except Exception as e:
+            response["error"] = str(e)
+        return self._encode(response)
+
+    @staticmethod
+    def _encode(response):
+        return (OutputFormatter.format_json(response) + "\n").encode()
+
+    async def handle_connection(self, reader, writer):
+        queue = asyncio.Queue(maxsize=self.max_in_flight)
+        responder = asyncio.create_task(self._respond(queue, writer))
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Over-long line: answer it with an error and hang up
+                    await queue.put(b"")
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    await queue.put(line)
+            await queue.put(None)
+            await responder
+        except ConnectionError:
+            pass
+        finally:
+            responder.cancel()
+            writer.close()
+
+    async def _respond(self, queue, writer):
+        while True:
+            line = await queue.get()
+            if line is None:
+                return
+            writer.write(self.answer(line))
+            try:
+                await writer.drain()
+            except ConnectionError:
+                return
+
+    async def start_tcp(self, host, port):
+        return await asyncio.start_server(
+            self.handle_connection, host, port, limit=MAX_LINE_LENGTH
+        )
+
+    async def start_unix(self, path):
+        return await asyncio.start_unix_server(
+            self.handle_connection, path, limit=MAX_LINE_LENGTH
+        )
+
+
+async def serve(args):
+    solver_server = SolverServer(args.max_in_flight)
+    if args.unix:
+        server = await solver_server.start_unix(args.unix)
+    else:
+        server = await solver_server.start_tcp(args.host, args.port)
+
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving on {addresses}", file=sys.stderr, flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Polynomial solver service")
+    arg_parser.add_argument("--host", default="127.0.0.1")
+    arg_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    arg_parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead")
+    arg_parser.add_argument(
+        "--max-in-flight", type=int, default=DEFAULT_MAX_IN_FLIGHT,
+        help="requests buffered per connection before reading pauses",
+    )
+    args = arg_parser.parse_args(sys.argv[1:])
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,67 +1,427 @@
+from enum import IntEnum
+from numeric import abs, sqrt, nth_root, gcd, atan2, cos_sin, PI, EPSILON, INF
+from polynomial import Polynomial
+from root_finder import approximate_roots, ApproximateRoot
+from sturm import SturmSequence, DEFAULT_TOLERANCE as REAL_ROOT_TOLERANCE
 
-def abs(x):
-    if x > 0:
-        return x
-    return -x
 
+class SolutionKind(IntEnum):
+    """Solution types; the values are the codes of vectorized and binary outputs"""
+    NONE = 0
+    INFINITE = 1
+    LINEAR = 2
+    ZERO = 3
+    POSITIVE = 4
+    NEGATIVE = 5
+    NUMERIC = 6
+    SUBSTITUTION = 7
+    CUBIC = 8
+    QUARTIC = 9
 
-def sqrt(x, precision=1e-18):
-    if x < 0:
-        raise ValueError("Cannot calculate sqrt of negative number")
-    if x == 0:
-        return 0
-    
-    #initial guess of sqrt(x)
-    x_sqrt = x / 2
 
-    while True:
-        x_new = (x_sqrt + x / x_sqrt) / 2
-        if abs(x_new - x_sqrt) < precision:
-            return x_new
+# Solution type names ('none', 'positive', ...) to kinds and back
+SOLUTION_CODES = {kind.name.lower(): kind for kind in SolutionKind}
+SOLUTION_TYPES = {code: name for name, code in SOLUTION_CODES.items()}
 
-        x_sqrt = x_new
+# Equations per solve_many block, sized so temporaries stay in cache
+SOLVE_MANY_BLOCK = 8192
+# Roots are listed one by one, with multiplicity: a polynomial of higher
+# degree has too many to list (X^99999999999 = 1 would need 1e11).
+# Only sparse polynomials solved by substitution get anywhere near it
+MAX_DEGREE = 1 << 16
+# Numeric iteration costs O(degree^2) per sweep (degree 2000 takes
+# seconds): above this degree it is refused rather than left running
+MAX_NUMERIC_DEGREE = 500
 
+# Newton steps at most per closed-form root, only spent when its residual
+# shows the formula lost digits to cancellation
+POLISH_STEPS = 3
+SQRT3 = 1.7320508075688772
+NAN = float('nan')
+
+# Relative error of a float quadratic solution, estimated from the
+# rounding of the discriminant, above which the equation is solved again
+# in exact arithmetic: every root keeps at least ten significant digits
+ESCALATION_TOLERANCE = 1e-10
+# |discriminant| / (b^2 + |4ac|) at or below which its rounding error
+# (three roundings, 3 EPSILON) exceeds 2 ESCALATION_TOLERANCE
+_DISCRIMINANT_SLACK = 3 * EPSILON / (2 * ESCALATION_TOLERANCE)
+# Decimal digits of the first exact attempt, doubled until the roots
+# round to the same floats twice (or the cap is reached)
+ESCALATION_PRECISION = 40
+ESCALATION_MAX_PRECISION = 2560
+# Digits that hold b^2 - 4ac exactly for any finite float coefficients:
+# 17-digit values, products spanning 1e-682 to 1e617
+EXACT_DIGITS = 1400
+
+
+class ComplexNumber(complex):
+    """
+    A complex root: a built-in complex, so arithmetic and comparisons mix
+    freely with complex and float, printed as a + bi
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, real, imaginary):
+        return complex.__new__(cls, real, imaginary)
+
+    @property
+    def imaginary(self):
+        return self.imag
 
-class ComplexNumber:
-    """Simple complex number"""
-    
-    def __init__(self, real, imaginary):
-        self.real = real
-        self.imaginary = imaginary
-    
     def __str__(self):
         """Format as: a + bi or a - bi"""
-        if self.imaginary >= 0:
-            return f"{self.real} + {self.imaginary}i"
+        if self.imag >= 0:
+            return f"{self.real} + {self.imag}i"
         else:
-            return f"{self.real} - {-self.imaginary}i"
-        
+            return f"{self.real} - {-self.imag}i"
+
+
+class SolveResult:
+    """
+    What Solver.solve returns: a SolutionKind, the discriminant (or None)
+    and the roots. Unpacks, indexes and compares like the tuple
+    (solution_type, discriminant, roots), solution_type being the name
+    of the kind. escalated is True when floats could not be trusted and
+    the answer comes from exact arithmetic (see _exact_quadratic).
+    """
+
+    __slots__ = ('kind', 'discriminant', 'roots', 'escalated')
+
+    def __init__(self, kind, discriminant, roots, escalated=False):
+        self.kind = kind
+        self.discriminant = discriminant
+        self.roots = roots
+        self.escalated = escalated
+
+    @property
+    def solution_type(self):
+        return SOLUTION_TYPES[self.kind]
+
+    def __iter__(self):
+        return iter((SOLUTION_TYPES[self.kind], self.discriminant, self.roots))
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        return tuple(self)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (SolveResult, tuple)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"SolveResult({self.solution_type!r}, {self.discriminant!r}, {self.roots!r})"
+
+
+def _ambiguous_quadratic(a, b, c, discriminant):
+    """
+    Whether the float solution of a x^2 + b x + c may be off by more
+    than ESCALATION_TOLERANCE: the rounding error of the discriminant
+    (three roundings of terms up to b^2 + |4ac|) hides its sign or, near
+    a double root, most digits of its square root. -b +- sqrt never
+    cancels (see solve_degree_2), so the roots lose nothing else.
+    Non-finite coefficients have no exact value to fall back on.
+    """
+    four_ac = 4 * a * c
+    size = b * b + four_ac if four_ac > 0 else b * b - four_ac
+    if (discriminant if discriminant > 0 else -discriminant) > _DISCRIMINANT_SLACK * size:
+        return False
+    return _finite(a, b, c)
+
+
+def _finite(a, b, c):
+    return -INF < a < INF and -INF < b < INF and -INF < c < INF
+
+
+def _written_value(x):
+    """
+    x as the shortest decimal that rounds to it, exactly: the number as
+    written for coefficients parsed from text (0.1, not the binary value
+    just above it), and within half an ulp of x otherwise
+    """
+    from decimal import Decimal
+    return Decimal(repr(float(x)))
+
+
+def _decimal_roots(a, b, c, discriminant):
+    """
+    Roots of a x^2 + b x + c (Decimals, discriminant non-zero) in the
+    current decimal context, rounded to floats and ordered as in
+    Solver.solve_degree_2. The larger real root adds same-signed terms
+    and the smaller is c / (a * larger), so nothing cancels.
+    """
+    offset = discriminant.copy_abs().sqrt() / (2 * a)
+    vertex = -b / (2 * a)
+    if discriminant < 0:
+        real, imaginary = float(vertex), float(offset)
+        return [ComplexNumber(real, imaginary), ComplexNumber(real, -imaginary)]
+    if (vertex >= 0) == (offset >= 0):
+        larger = vertex + offset
+        return [float(larger), float(c / a / larger)]
+    larger = vertex - offset
+    return [float(c / a / larger), float(larger)]
+
+
+def _exact_quadratic(a, b, c):
+    """
+    Solve a x^2 + b x + c = 0 with the coefficients as written (see
+    _written_value), so (x + 0.1)^2 = x^2 + 0.2 x + 0.01 has its double
+    root: the discriminant, hence the solution type, is exact; the
+    roots are computed at increasing precision, see _decimal_roots.
+    """
+    # Only escalated equations need decimal: keep it off the startup path
+    from decimal import Inexact, localcontext
+    a, b, c = _written_value(a), _written_value(b), _written_value(c)
+    with localcontext() as context:
+        context.prec = EXACT_DIGITS
+        context.traps[Inexact] = True
+        exact = b * b - 4 * a * c
+    discriminant = float(exact)
+
+    precision = ESCALATION_PRECISION
+    if not exact:
+        with localcontext() as context:
+            context.prec = precision
+            return SolveResult(SolutionKind.ZERO, discriminant, [float(-b / (2 * a))], True)
+
+    kind = SolutionKind.POSITIVE if exact > 0 else SolutionKind.NEGATIVE
+    roots = None
+    while True:
+        with localcontext() as context:
+            context.prec = precision
+            candidate = _decimal_roots(a, b, c, exact)
+        if candidate == roots or precision >= ESCALATION_MAX_PRECISION:
+            return SolveResult(kind, discriminant, candidate, True)
+        roots = candidate
+        precision *= 2
+
+
+def _magnitude(z):
+    # |re| + |im|: within a factor sqrt(2) of the modulus, enough to
+    # compare residuals against rounding bounds
+    return abs(z.real) + abs(z.imag)
+
+
+def _residual(coefficients, magnitudes, z):
+    """
+    (p(z), p'(z), rounding bound of p(z)) by Horner's rule, coefficients
+    from degree 0 and magnitudes their absolute values
+    """
+    p = coefficients[-1]
+    dp = 0
+    bound = magnitudes[-1]
+    modulus = _magnitude(z)
+    for k in range(len(coefficients) - 2, -1, -1):
+        dp = dp * z + p
+        p = p * z + coefficients[k]
+        bound = bound * modulus + magnitudes[k]
+    return p, dp, 2 * len(coefficients) * EPSILON * bound
+
+
+def _polish(coefficients, magnitudes, z):
+    """
+    (root, accurate): Newton steps on a closed-form root while |p(z)| is
+    above the rounding error of evaluating it, i.e. while cancellation in
+    the formula cost accuracy. A step that does not shrink the residual
+    is discarded; accurate says whether the residual ended in the noise.
+    """
+    p, dp, bound = _residual(coefficients, magnitudes, z)
+    for _ in range(POLISH_STEPS):
+        if _magnitude(p) <= bound or dp == 0:
+            break
+        candidate = z - p / dp
+        candidate_p, candidate_dp, candidate_bound = _residual(coefficients, magnitudes, candidate)
+        if _magnitude(candidate_p) >= _magnitude(p):
+            break
+        z, p, dp, bound = candidate, candidate_p, candidate_dp, candidate_bound
+    return z, _magnitude(p) <= bound
+
+
+def _complex_sqrt(z):
+    """Principal square root, real and imaginary parts from sqrt alone"""
+    x, y = z.real, z.imag
+    if y == 0:
+        return complex(sqrt(x), 0.0) if x >= 0 else complex(0.0, sqrt(-x))
+    t = sqrt((sqrt(x * x + y * y) + abs(x)) / 2)
+    if x >= 0:
+        return complex(t, y / (2 * t))
+    return complex(abs(y) / (2 * t), t if y >= 0 else -t)
+
+
+def _monic_quadratic(b, c):
+    """Roots of x^2 + b x + c without cancelling -b against the square root"""
+    discriminant = b * b - 4 * c
+    if discriminant < 0:
+        half = sqrt(-discriminant) / 2
+        return [complex(-b / 2, half), complex(-b / 2, -half)]
+    root = sqrt(discriminant)
+    # The larger root from adding same-signed terms, the other from c = x1 * x2
+    large = -(b + root) / 2 if b >= 0 else (root - b) / 2
+    if large == 0:
+        return [0.0, 0.0]
+    return [large, c / large]
+
+
+def _cubic_formula(a, b, c):
+    """
+    Roots of x^3 + a x^2 + b x + c: the trigonometric form when all three
+    are real, otherwise Cardano with the cube root taken on the side that
+    adds magnitudes (Numerical Recipes 5.6).
+    """
+    shift = a / 3
+    q = (a * a - 3 * b) / 9
+    r = (2 * a * a * a - 9 * a * b + 27 * c) / 54
+    q3 = q * q * q
+    if r * r < q3:
+        cos_value, sin_value = cos_sin(atan2(sqrt(q3 - r * r), r) / 3)
+        scale = -2 * sqrt(q)
+        # cos(phi -+ 2 pi / 3) from cos(phi) and sin(phi), no further cos_sin calls
+        turn_cos = -cos_value / 2
+        turn_sin = SQRT3 / 2 * sin_value
+        return [
+            scale * cos_value - shift,
+            scale * (turn_cos + turn_sin) - shift,
+            scale * (turn_cos - turn_sin) - shift,
+        ]
+
+    big = nth_root(abs(r) + sqrt(r * r - q3), 3)
+    if r > 0:
+        big = -big
+    small = q / big if big else 0.0
+    half = -(big + small) / 2 - shift
+    imaginary = SQRT3 / 2 * (big - small)
+    return [big + small - shift, complex(half, imaginary), complex(half, -imaginary)]
+
+
+def _monic_cubic(a, b, c):
+    """
+    Roots of x^3 + a x^2 + b x + c. The formulas only resolve roots to
+    about EPSILON times the largest one, so they supply one real root;
+    when it is below the geometric mean |c|^(1/3) it is taken from the
+    reversed cubic instead, where it is the large one. The other two
+    come from the quadratic left after dividing it out, from the end
+    that keeps the division stable.
+    """
+    root = max((z.real for z in _cubic_formula(a, b, c) if z.imag == 0), key=abs)
+    large = abs(root * root * root) >= abs(c)
+    if not large:
+        # Roots of c y^3 + b y^2 + a y + 1 are 1 / x
+        inverse = max(
+            (z.real for z in _cubic_formula(b / c, a / c, 1 / c) if z.imag == 0), key=abs
+        )
+        if inverse != 0:
+            root = 1 / inverse
+    if root == 0:
+        return [0.0] + _monic_quadratic(a, b)
+
+    # x^3 + a x^2 + b x + c = (x - root)(x^2 + e x + f)
+    if large:
+        f = -c / root
+        e = (f - b) / root
+    else:
+        e = a + root
+        f = b + root * e
+    return [root] + _monic_quadratic(e, f)
+
+
+def _ferrari(a, b, c, d):
+    """
+    Roots of x^4 + a x^3 + b x^2 + c x + d by Ferrari: depress to
+    y^4 + p y^2 + q y + r, then split it into two quadratics with the
+    largest root of the resolvent cubic. None when rounding leaves no
+    usable resolvent root.
+    """
+    shift = a / 4
+    a2 = a * a
+    p = b - 3 * a2 / 8
+    q = c - a * b / 2 + a2 * a / 8
+    r = d - a * c / 4 + a2 * b / 16 - 3 * a2 * a2 / 256
+
+    if q == 0:
+        # Biquadratic in y: y^2 is a root of w^2 + p w + r
+        roots = []
+        for w in _monic_quadratic(p, r):
+            y = _complex_sqrt(complex(w))
+            roots += [y - shift, -y - shift]
+        return roots
+
+    # (y^2 + p/2 + m)^2 = 2m (y - q / 4m)^2 once m solves the resolvent
+    m = max(z.real for z in _monic_cubic(p, p * p / 4 - r, -q * q / 8) if z.imag == 0)
+    if not m > 0:
+        return None
+    s = sqrt(2 * m)
+    t = q / (2 * s)
+    roots = _monic_quadratic(-s, p / 2 + m + t) + _monic_quadratic(s, p / 2 + m - t)
+    return [y - shift for y in roots]
+
+
+def _monic_quartic(a, b, c, d):
+    """
+    Roots of x^4 + a x^3 + b x^2 + c x + d. Shifting back from the
+    depressed quartic costs the small roots their accuracy, so Ferrari
+    only supplies the largest one. Dividing it (with its conjugate when
+    complex) out from the constant end leaves a cubic or a quadratic
+    holding the others without that loss.
+    """
+    values = _ferrari(a, b, c, d)
+    if values is None:
+        return None
+    root = max(values, key=_magnitude)
+    if root == 0:
+        return values
+
+    if root.imag == 0:
+        # x^4 + a x^3 + b x^2 + c x + d = (x - root)(x^3 + A x^2 + B x + C)
+        root = root.real
+        C = -d / root
+        B = (C - c) / root
+        A = (B - b) / root
+        return [root] + _monic_cubic(A, B, C)
+
+    # ... = (x^2 + E x + F)(x^2 + e x + f), F and E from root and its conjugate
+    F = root.real * root.real + root.imag * root.imag
+    E = -2 * root.real
+    f = d / F
+    e = (c - E * f) / F
+    return [root, root.conjugate()] + _monic_quadratic(e, f)
 
 
 class Solver():
-    def __init__(self, reduced_equation: dict):
-        
+    def __init__(self, reduced_equation, initial_roots=None):
+        """
+        initial_roots optionally warm-starts the numeric path, e.g. with
+        the root_finder_result.roots of a nearby polynomial.
+        """
+        if not isinstance(reduced_equation, Polynomial):
+            reduced_equation = Polynomial(reduced_equation)
         self.reduced_equation = reduced_equation
+        self.initial_roots = initial_roots
+        self.root_finder_result = None
 
     @staticmethod
-    def _get_poly_degree(reduced_equation: dict):
+    def _get_poly_degree(reduced_equation):
         
         if not reduced_equation:
             return 0
         
-        non_zero_degrees = []
-        for degree, coeff in reduced_equation.items():
-            if coeff:
-                non_zero_degrees.append(degree)
-
-        if not non_zero_degrees:
-            return 0
-        return max(non_zero_degrees)
+        if not isinstance(reduced_equation, Polynomial):
+            reduced_equation = Polynomial(reduced_equation)
+        return reduced_equation.degree
 
     def solve(self) -> tuple:
         "General solver"
         
         poly_degree = self._get_poly_degree(self.reduced_equation)
+        if poly_degree > MAX_DEGREE:
+            raise ValueError(
+                f"Polynomial degree {poly_degree} is above {MAX_DEGREE}: too many roots to list"
+            )
 
         if poly_degree == 0:
             return self._solve_degree_0()
@@ -70,24 +430,177 @@ class Solver():
         if poly_degree == 2:
             return self.solve_degree_2()
 
+        substituted = self._solve_substituted()
+        if substituted is not None:
+            return substituted
+        if poly_degree == 3:
+            return self.solve_degree_3()
+        if poly_degree == 4:
+            return self.solve_degree_4()
         return self._solve_higher_degree()
 
+    def count_real_roots(self, low=None, high=None):
+        """
+        Distinct real roots in [low, high] (None: unbounded) from a Sturm
+        sequence, at any degree and without solving for complex roots.
+        """
+        return SturmSequence.from_polynomial(self.reduced_equation).count(low, high)
+
+    def real_roots(self, low=None, high=None, tolerance=REAL_ROOT_TOLERANCE):
+        """Distinct real roots in [low, high], ascending, each within tolerance"""
+        return SturmSequence.from_polynomial(self.reduced_equation).real_roots(
+            low, high, tolerance
+        )
+
+    @staticmethod
+    def solve_many(a, b, c, block_size=SOLVE_MANY_BLOCK):
+        """
+        Vectorized solve of a * X^2 + b * X + c = 0 over NumPy arrays.
+        Returns (codes, discriminants, roots): codes holds SOLUTION_CODES
+        per equation, discriminants is NaN where the equation is not
+        quadratic and roots has shape (n, 2), complex, NaN-padded.
+        Degenerate degree 0/1 lanes are selected with masks. Work is done
+        in cache-sized blocks so temporaries never leave the CPU cache.
+        Lanes whose float answer is ambiguous are solved exactly one by
+        one, as solve_degree_2 does.
+        """
+        # Imported here: numpy costs every one-shot run ~100 ms otherwise
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("Solver.solve_many requires numpy") from None
+        
+        a, b, c = np.broadcast_arrays(
+            np.asarray(a, dtype=np.float64),
+            np.asarray(b, dtype=np.float64),
+            np.asarray(c, dtype=np.float64),
+        )
+        a, b, c = a.ravel(), b.ravel(), c.ravel()
+        
+        codes = np.empty(a.size, dtype=np.int8)
+        discriminant = np.empty(a.size, dtype=np.float64)
+        roots = np.empty((a.size, 2), dtype=np.complex128)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for start in range(0, a.size, block_size):
+                block = slice(start, start + block_size)
+                Solver._solve_many_block(
+                    a[block], b[block], c[block],
+                    codes[block], discriminant[block], roots[block],
+                )
+        
+        return codes, discriminant, roots
+    
+    @staticmethod
+    def _solve_many_block(a, b, c, codes, discriminant, roots):
+        """Fill one block of solve_many outputs in place"""
+        import numpy as np
+        # Temporaries are updated in place, and the lanes that need a
+        # correction (cancelling, degenerate) are indexed, not masked
+        b_squared = b * b
+        four_ac = 4 * a
+        four_ac *= c
+        np.subtract(b_squared, four_ac, out=discriminant)
+        positive = discriminant > 0
+        negative = discriminant < 0
+        
+        # _ambiguous_quadratic over the block, degenerate lanes excluded
+        np.abs(four_ac, out=four_ac)
+        offset = np.abs(discriminant)
+        # b^2 > 4 |4ac|: where the root on b's side cancels, see below
+        cancels = b_squared > 4 * four_ac
+        cancels &= positive
+        bound = b_squared
+        bound += four_ac
+        bound *= _DISCRIMINANT_SLACK
+        ambiguous = offset > bound
+        np.logical_not(ambiguous, out=ambiguous)
+        ambiguous &= a != 0
+        
+        two_a = a + a
+        vertex = b / two_a
+        np.negative(vertex, out=vertex)
+        np.sqrt(offset, out=offset)
+        offset /= two_a
+        shift = np.where(negative, 0.0, offset)
+        
+        # vertex +/- offset on the real axis, or vertex +/- i * offset
+        real, imag = roots.real, roots.imag
+        np.add(vertex, shift, out=real[:, 0])
+        np.subtract(vertex, shift, out=real[:, 1])
+        np.subtract(offset, shift, out=imag[:, 0])
+        np.negative(imag[:, 0], out=imag[:, 1])
+        
+        # Where b^2 dominates 4ac the root on b's side is c / (a * far),
+        # far being the other one, as in solve_degree_2: b > 0 puts the
+        # near root first, b < 0 second
+        for near_side, lanes in enumerate((cancels & (b > 0), cancels & (b < 0))):
+            lanes = np.flatnonzero(lanes)
+            near = c[lanes] / (a[lanes] * real[lanes, 1 - near_side])
+            near += 0.0
+            real[lanes, near_side] = near
+        
+        # Sign of the discriminant picks the code: 3 zero, 4 positive, 5 negative
+        np.add(positive, 3, out=codes, dtype=np.int8)
+        codes += negative
+        codes += negative
+        
+        # A double root has no second value
+        double = ~positive & ~negative
+        if double.any():
+            np.copyto(real[:, 1], np.nan, where=double)
+        
+        # Degree 0/1 lanes are rare: index them rather than mask the block
+        degenerate = np.flatnonzero(a == 0)
+        if degenerate.size:
+            discriminant[degenerate] = NAN
+            roots[degenerate] = NAN
+            linear = degenerate[b[degenerate] != 0]
+            constant = degenerate[b[degenerate] == 0]
+            real[linear, 0] = -c[linear] / b[linear]
+            codes[linear] = SOLUTION_CODES['linear']
+            codes[constant] = np.where(
+                c[constant] == 0,
+                SOLUTION_CODES['infinite'], SOLUTION_CODES['none'],
+            )
+        
+        for lane in np.flatnonzero(ambiguous):
+            if not _finite(a[lane], b[lane], c[lane]):
+                continue
+            solution = _exact_quadratic(a[lane], b[lane], c[lane])
+            codes[lane] = solution.kind
+            discriminant[lane] = solution.discriminant
+            roots[lane] = (solution.roots + [NAN])[:2]
+    
     def solve_degree_2(self):
         "Solve quadratic equation"
         a = self.reduced_equation.get(2, 0)
         b = self.reduced_equation.get(1, 0)
         c = self.reduced_equation.get(0, 0)
-        discriminant = b ** 2 - 4 * a * c
+        discriminant = b * b - 4 * a * c
+        # Floats first; only an equation whose answer they cannot settle
+        # (near a double root, or heavy cancellation) is solved exactly
+        if _ambiguous_quadratic(a, b, c, discriminant):
+            return _exact_quadratic(a, b, c)
         if discriminant > 0:
             #two solutions in R
             sqrt_d = sqrt(discriminant)
             x1 = (-b + sqrt_d) / (2 * a)
             x2 = (-b - sqrt_d) / (2 * a)
-            return ("positive", discriminant, [x1, x2])
+            # Once b^2 dominates 4ac, -b +- sqrt_d cancels on b's side:
+            # that root is then c / (a * far), far being the other one,
+            # so it keeps every digit (and is exactly 0 when c is: + 0.0
+            # turns the -0.0 of 0 / negative into 0.0)
+            if b * b > 4 * abs(4 * a * c):
+                if b > 0:
+                    x1 = c / (a * x2) + 0.0
+                else:
+                    x2 = c / (a * x1) + 0.0
+            return SolveResult(SolutionKind.POSITIVE, discriminant, [x1, x2])
         elif discriminant == 0:
             #one solution in R
             x1 = -b / (2 * a)
-            return ("zero", discriminant, [x1])
+            return SolveResult(SolutionKind.ZERO, discriminant, [x1])
         else:
             #solution only in Complex Numbers
             real_part = -b / (2 * a)
@@ -95,24 +608,191 @@ class Solver():
             img_part = sqrt_abs_d / ( 2 * a)
             x1 = ComplexNumber(real_part, img_part)
             x2 = ComplexNumber(real_part, -img_part)
-            return ("negative", discriminant, [x1, x2])
+            return SolveResult(SolutionKind.NEGATIVE, discriminant, [x1, x2])
+
+
+    def solve_degree_3(self):
+        "Solve cubic equation in closed form"
+        a = self.reduced_equation.get(3, 0)
+        b = self.reduced_equation.get(2, 0)
+        c = self.reduced_equation.get(1, 0)
+        d = self.reduced_equation.get(0, 0)
+        # Products rather than **, which raises instead of overflowing to inf
+        discriminant = (
+            18 * a * b * c * d - 4 * b * b * b * d + b * b * c * c
+            - 4 * a * c * c * c - 27 * a * a * d * d
+        )
+        roots = self._closed_form_roots()
+        if roots is None:
+            return self._solve_higher_degree()
+        return SolveResult(SolutionKind.CUBIC, discriminant, roots)
 
+    def solve_degree_4(self):
+        "Solve quartic equation in closed form"
+        a = self.reduced_equation.get(4, 0)
+        b = self.reduced_equation.get(3, 0)
+        c = self.reduced_equation.get(2, 0)
+        d = self.reduced_equation.get(1, 0)
+        e = self.reduced_equation.get(0, 0)
+        discriminant = (
+            256 * a * a * a * e * e * e - 192 * a * a * b * d * e * e
+            - 128 * a * a * c * c * e * e + 144 * a * a * c * d * d * e
+            - 27 * a * a * d * d * d * d + 144 * a * b * b * c * e * e
+            - 6 * a * b * b * d * d * e - 80 * a * b * c * c * d * e
+            + 18 * a * b * c * d * d * d + 16 * a * c * c * c * c * e
+            - 4 * a * c * c * c * d * d - 27 * b * b * b * b * e * e
+            + 18 * b * b * b * c * d * e - 4 * b * b * b * d * d * d
+            - 4 * b * b * c * c * c * e + b * b * c * c * d * d
+        )
+        roots = self._closed_form_roots()
+        if roots is None:
+            return self._solve_higher_degree()
+        return SolveResult(SolutionKind.QUARTIC, discriminant, roots)
+
+    def _closed_form_roots(self):
+        """
+        All roots of a cubic or quartic, with multiplicity: real ones as
+        floats, the others as ComplexNumber, sorted by real then imaginary
+        part. Zero roots are factored out exactly, the rest come from the
+        formulas plus a Newton polish where they lost accuracy. None when
+        the coefficients overflow the formulas or a root stays above the
+        rounding noise after polishing; the caller then iterates.
+        """
+        coefficients = self.reduced_equation.dense_coefficients()
+        zeros = 0
+        while coefficients[zeros] == 0:
+            zeros += 1
+        leading = coefficients[-1]
+        # Monic, highest degree first, leading 1 dropped
+        monic = [coef / leading for coef in reversed(coefficients[zeros:-1])]
+        if len(monic) == 4:
+            values = _monic_quartic(*monic)
+        elif len(monic) == 3:
+            values = _monic_cubic(*monic)
+        elif len(monic) == 2:
+            values = _monic_quadratic(*monic)
+        else:
+            values = [-monic[0]] if monic else []
+        if values is None:
+            return None
+
+        magnitudes = [abs(coef) for coef in coefficients]
+        roots = [0.0] * zeros
+        upper = []
+        for z in values:
+            if not (-INF < z.real < INF and -INF < z.imag < INF):
+                return None
+            if z.imag < 0:
+                continue
+            z, accurate = _polish(coefficients, magnitudes, z.real if z.imag == 0 else z)
+            if not accurate:
+                return None
+            if z.imag == 0:
+                roots.append(z)
+            else:
+                upper.append(z)
+        # Conjugates are mirrored rather than polished, so pairs stay exact
+        for z in upper:
+            roots.append(ComplexNumber(z.real, z.imag))
+            roots.append(ComplexNumber(z.real, -z.imag))
+        roots.sort(key=lambda root: (root.real, getattr(root, 'imaginary', 0.0)))
+        return roots
 
     def _solve_degree_1(self):
         """Solve linear equation"""
         b = self.reduced_equation.get(1, 0)
         c = self.reduced_equation.get(0, 0)
         x = -c / b
-        return ('linear', None, [x])
+        return SolveResult(SolutionKind.LINEAR, None, [x])
     
     def _solve_degree_0(self):
         """Solve constant equation"""
         c = self.reduced_equation.get(0, 0)
-        if abs(c) < 1e-10:
-            return ('infinite', None, [])
+        # Cancelled terms are already gone (see reduce_equation): any
+        # other non-zero constant is a contradiction
+        if c == 0:
+            return SolveResult(SolutionKind.INFINITE, None, [])
         else:
-            return ('none', None, [])
+            return SolveResult(SolutionKind.NONE, None, [])
     
+    def _solve_substituted(self):
+        """
+        Degree > 2 polynomials in X^g: factor out X^m (m the lowest
+        exponent), substitute y = X^g (g the GCD of the remaining
+        exponents), solve the smaller polynomial in y and expand every
+        y-root into its g complex g-th roots. X = 0 is listed m times,
+        and roots are sorted like the other paths. Work before the
+        expansion depends on the term count, not the degree. Returns None
+        when g == 1 and nothing can be gained.
+        """
+        terms = [(exp, coef) for exp, coef in self.reduced_equation.items() if coef]
+        lowest = terms[0][0]
+        step = 0
+        for exp, _ in terms:
+            step = gcd(step, exp - lowest)
+        if step == 1:
+            return None
+
+        roots = [0.0] * lowest
+        if step == 0:
+            # A single term c * X^m: only X = 0, m times
+            return SolveResult(SolutionKind.SUBSTITUTION, None, roots)
+
+        y_equation = Polynomial([((exp - lowest) // step, coef) for exp, coef in terms])
+        y_solution = Solver(y_equation).solve()
+        for y_root in y_solution.roots:
+            roots.extend(self._expand_root(y_root, step))
+        roots.sort(key=lambda root: (root.real, getattr(root, 'imaginary', 0.0)))
+        return SolveResult(
+            SolutionKind.SUBSTITUTION, y_solution.discriminant, roots, y_solution.escalated
+        )
+
+    @staticmethod
+    def _expand_root(y_root, step):
+        """All X with X^step == y_root, real ones as plain floats"""
+        if isinstance(y_root, (int, float)):
+            y_real, y_imag = y_root, 0.0
+        else:
+            y_real, y_imag = y_root.real, y_root.imaginary
+        radius = nth_root(sqrt(y_real * y_real + y_imag * y_imag), step)
+        angle = atan2(y_imag, y_real)
+
+        # Propagated bound |dX| ~ |dy| / (step * |X|^(step - 1)), plus rounding
+        error = getattr(y_root, 'error', None)
+        if error is not None and radius:
+            error = error / (step * radius ** (step - 1)) + 4 * EPSILON * radius
+
+        roots = []
+        for k in range(step):
+            # For real y the angle is pi * turns / step: quarter turns are exact
+            turns = 2 * k if y_real >= 0 else 2 * k + 1
+            if y_imag == 0 and (2 * turns) % step == 0:
+                quarter = (2 * turns // step) % 4
+                root = (radius, None, -radius, None)[quarter]
+                if root is None:
+                    root = ComplexNumber(0.0, radius if quarter == 1 else -radius)
+            else:
+                cos_value, sin_value = cos_sin((angle + 2 * PI * k) / step)
+                root = ComplexNumber(radius * cos_value, radius * sin_value)
+            if error is not None:
+                root = ApproximateRoot(complex(root.real, getattr(root, 'imaginary', 0.0)), error)
+            roots.append(root)
+        return roots
+
     def _solve_higher_degree(self):
-        """Degree > 2"""
-        return ('unsolvable', None, [])
\ No newline at end of file
+        """Degree > 2: all complex roots by numeric iteration"""
+        degree = self.reduced_equation.degree
+        if degree > MAX_NUMERIC_DEGREE:
+            raise ValueError(
+                f"Polynomial degree {degree} is above {MAX_NUMERIC_DEGREE}: "
+                "too high to solve numerically"
+            )
+        coefficients = self.reduced_equation.dense_coefficients()
+        initial_roots = self.initial_roots
+        if initial_roots is not None:
+            # find_roots iterates on the non-zero roots only
+            initial_roots = [z for z in initial_roots if z != 0]
+        roots, self.root_finder_result = approximate_roots(
+            coefficients, initial_roots=initial_roots
+        )
+        return SolveResult(SolutionKind.NUMERIC, None, roots)
\ No newline at end of file
@@ -0,0 +1,131 @@
+import json
+import struct
+from expression_parser import ExpressionParser
+
+# Packed equation stream, little-endian, the input-side counterpart of
+# binary_format:
+#
+#   stream    INPUT_MAGIC, then one equation after another
+#   equation  uint32 term count n, 4 bytes padding,
+#             n uint32 exponents, zero-padded to 8 bytes,
+#             n float64 coefficients
+#
+# An equation is its terms = 0: the right-hand side is already moved over.
+INPUT_MAGIC = b"CMPI1\0\0\0"
+EQUATION_HEADER = struct.Struct("<I4x")
+
+
+def reduce_terms(terms):
+    """
+    ExpressionParser.reduce_equation for terms already equal to zero,
+    which also rejects non-finite numbers handed over directly
+    """
+    return ExpressionParser.reduce_equation(terms)
+
+
+def _coefficient(value):
+    # bool is an int subclass, but true = 0 is not an equation
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Invalid coefficient {json.dumps(value)}: must be a number")
+    try:
+        return float(value)
+    except OverflowError:
+        raise ValueError(f"Invalid coefficient {value}: must be finite") from None
+
+
+def _exponent(key):
+    try:
+        return int(key)
+    except ValueError:
+        raise ValueError(f"Invalid exponent {key!r}") from None
+
+
+def terms_from_json(value):
+    """
+    (exponent, coefficient) pairs of a decoded JSON equation: an array
+    of coefficients indexed by exponent ([c, b, a] is a*X^2 + b*X + c = 0)
+    or an object mapping exponents to coefficients ({"0": c, "2": a}).
+    """
+    if isinstance(value, list):
+        items = enumerate(value)
+    elif isinstance(value, dict):
+        items = ((_exponent(key), coef) for key, coef in value.items())
+    else:
+        raise ValueError("Structured equation must be a JSON array or object")
+    return [(exp, _coefficient(coef)) for exp, coef in items]
+
+
+def _json_terms(text):
+    # Decoded lazily, when the pipeline reduces it, so a malformed line
+    # becomes that line's error record instead of ending the stream
+    yield from terms_from_json(json.loads(text))
+
+
+def iter_json_equations(lines):
+    """(line_number, terms) for every non-blank line of JSON Lines input"""
+    for line_number, line in enumerate(lines, 1):
+        line = line.strip()
+        if line:
+            yield line_number, _json_terms(line)
+
+
+def iter_array_equations(coefficients):
+    """
+    (line_number, terms) for every row of a 2-D NumPy array whose
+    column k holds the X^k coefficient; a 1-D array is one equation.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("coefficient arrays require numpy") from None
+    coefficients = np.asarray(coefficients, dtype=np.float64)
+    if coefficients.ndim == 1:
+        coefficients = coefficients[np.newaxis]
+    elif coefficients.ndim != 2:
+        raise ValueError("Coefficient arrays must have one or two dimensions")
+    for line_number, row in enumerate(coefficients.tolist(), 1):
+        yield line_number, enumerate(row)
+
+
+def pack_terms(terms):
+    """One packed equation from a mapping or (exponent, coefficient) pairs"""
+    items = list(terms.items() if hasattr(terms, "items") else terms)
+    count = len(items)
+    exponents = [exp for exp, _ in items]
+    coefficients = [coef for _, coef in items]
+    return b"".join((
+        EQUATION_HEADER.pack(count),
+        struct.pack(f"<{count}I", *exponents),
+        bytes(4 * (count % 2)),
+        struct.pack(f"<{count}d", *coefficients),
+    ))
+
+
+def write_packed_equations(equations, output):
+    """Write a packed stream of equations (each one terms = 0) to output"""
+    output.write(INPUT_MAGIC)
+    for terms in equations:
+        output.write(pack_terms(terms))
+
+
+def iter_packed_equations(buffer):
+    """(line_number, terms) for every equation of a packed stream"""
+    if bytes(buffer[:len(INPUT_MAGIC)]) != INPUT_MAGIC:
+        raise ValueError("Not a packed equation stream")
+    offset = len(INPUT_MAGIC)
+    size = len(buffer)
+    line_number = 0
+    while offset < size:
+        line_number += 1
+        if offset + EQUATION_HEADER.size > size:
+            raise ValueError(f"Truncated equation at byte {offset}")
+        (count,) = EQUATION_HEADER.unpack_from(buffer, offset)
+        exponents_at = offset + EQUATION_HEADER.size
+        coefficients_at = exponents_at + 4 * (count + count % 2)
+        end = coefficients_at + 8 * count
+        if end > size:
+            raise ValueError(f"Truncated equation at byte {offset}")
+        exponents = struct.unpack_from(f"<{count}I", buffer, exponents_at)
+        coefficients = struct.unpack_from(f"<{count}d", buffer, coefficients_at)
+        yield line_number, zip(exponents, coefficients)
+        offset = end
@@ -0,0 +1,448 @@
+from numeric import EPSILON, INF
+
+# Width below which refine() stops, absolute
+DEFAULT_TOLERANCE = 1e-12
+DEFAULT_MAX_ITERATIONS = 2000
+# Chains up to this degree are rebuilt exactly when irregular or when p
+# has a multiple root; the exact chain's integers grow with the degree,
+# so above it the floating-point chain is used as is
+EXACT_DEGREE_LIMIT = 64
+# Mersenne prime modulus of the square-free test
+SQUARE_FREE_PRIME = (1 << 61) - 1
+
+
+def _sign(x):
+    return (x > 0) - (x < 0)
+
+
+def _variations(signs):
+    """Sign changes along a sequence of signs, zeros skipped"""
+    count = 0
+    previous = 0
+    for sign in signs:
+        if sign:
+            if previous and sign != previous:
+                count += 1
+            previous = sign
+    return count
+
+
+def _evaluate(coefficients, x):
+    """
+    Sign-faithful value of the polynomial at x: p(x) by Horner's rule,
+    or where that overflows sign(x)^n * q(1/x) with q the reversed
+    polynomial, a positive multiple of p(x) that cannot overflow.
+    """
+    value = 0.0
+    for coef in reversed(coefficients):
+        value = value * x + coef
+    if -INF < value < INF:
+        return value
+    w = 1 / x
+    value = 0.0
+    for coef in coefficients:
+        value = value * w + coef
+    if x < 0 and len(coefficients) % 2 == 0:
+        return -value
+    return value
+
+
+def _rounding_bound(coefficients, x):
+    """Bound on the rounding error of Horner's rule for the polynomial at x"""
+    modulus = x if x >= 0 else -x
+    bound = 0.0
+    for coef in reversed(coefficients):
+        bound = bound * modulus + (coef if coef >= 0 else -coef)
+    return 2 * len(coefficients) * EPSILON * bound
+
+
+def _normalized(coefficients):
+    scale = max(abs(coef) for coef in coefficients)
+    return [coef / scale for coef in coefficients]
+
+
+def _derivative(coefficients):
+    return [k * coef for k, coef in enumerate(coefficients)][1:]
+
+
+def _float_chain(p):
+    """
+    Sturm chain p, p', -rem(p, p'), ... in floating point, each member
+    scaled to unit max norm. Also returns whether the chain is regular:
+    every remainder has exactly one degree less than its divisor, which
+    is what happens for square-free inputs unless cancellation wiped
+    out a leading coefficient.
+    """
+    chain = [_normalized(p)]
+    if len(p) == 1:
+        return chain, True
+    chain.append(_normalized(_derivative(chain[0])))
+    regular = True
+    while len(chain[-1]) > 1:
+        dividend, divisor = chain[-2], chain[-1]
+        remainder = list(dividend)
+        n = len(divisor) - 1
+        lead = divisor[-1]
+        quotient_norm = 0.0
+        for k in range(len(remainder) - 1, n - 1, -1):
+            q = remainder[k] / lead
+            quotient_norm += abs(q)
+            if q:
+                for j in range(n):
+                    remainder[k - n + j] -= q * divisor[j]
+        remainder = remainder[:n]
+
+        # Rounding error of the division: anything below it is noise
+        noise = 4 * EPSILON * len(dividend) * (1 + quotient_norm)
+        while remainder and abs(remainder[-1]) <= noise:
+            remainder.pop()
+        if len(remainder) != n:
+            regular = False
+        if not remainder:
+            # p and p' share a factor: multiple roots (or lost precision)
+            break
+        chain.append([-coef for coef in _normalized(remainder)])
+    return chain, regular and len(chain[-1]) == 1
+
+
+def _exact_integers(p):
+    """Integer coefficients with the same roots: floats are dyadic rationals"""
+    ratios = [coef.as_integer_ratio() for coef in p]
+    denominator = max(d for _, d in ratios)
+    return [n * (denominator // d) for n, d in ratios]
+
+
+def _is_square_free(p):
+    """
+    Whether the integer polynomial p has no multiple root, from
+    gcd(p, p') modulo SQUARE_FREE_PRIME: a constant gcd there means a
+    constant gcd over the integers as long as the prime divides neither
+    leading coefficient. Otherwise the answer is False, possibly
+    spuriously, which only costs an exact chain.
+    """
+    prime = SQUARE_FREE_PRIME
+    a = [coef % prime for coef in p]
+    b = [k * coef % prime for k, coef in enumerate(a)][1:]
+    if len(p) == 1:
+        return True
+    if not a[-1] or not b[-1]:
+        return False
+    while len(b) > 1:
+        # a mod b over the integers modulo prime
+        inverse = pow(b[-1], -1, prime)
+        n = len(b) - 1
+        for k in range(len(a) - 1, n - 1, -1):
+            q = a[k] * inverse % prime
+            if q:
+                for j in range(n + 1):
+                    a[k - n + j] = (a[k - n + j] - q * b[j]) % prime
+        a = a[:n]
+        while a and not a[-1]:
+            a.pop()
+        if not a:
+            return False
+        a, b = b, a
+    return True
+
+
+def _primitive(p):
+    content = 0
+    for coef in p:
+        content = _gcd(content, coef)
+        if content == 1:
+            return p
+    return [coef // content for coef in p]
+
+
+def _gcd(a, b):
+    a, b = (a if a >= 0 else -a), (b if b >= 0 else -b)
+    while b:
+        a, b = b, a % b
+    return a
+
+
+def _exact_chain(p):
+    """
+    Sturm chain over the integers: sign-preserving pseudo-remainders
+    with their content divided out. Exact, so multiple roots and
+    clustered roots are handled, but the integers grow with the degree.
+    """
+    chain = [_primitive(_exact_integers(p))]
+    if len(p) == 1:
+        return chain
+    chain.append(_primitive(_derivative(chain[0])))
+    while len(chain[-1]) > 1:
+        dividend, divisor = chain[-2], chain[-1]
+        remainder = list(dividend)
+        n = len(divisor) - 1
+        lead = divisor[-1]
+        # Scale by |lead| (never by a negative number) before each step
+        scale = lead if lead > 0 else -lead
+        direction = 1 if lead > 0 else -1
+        for k in range(len(remainder) - 1, n - 1, -1):
+            q = remainder[k] * direction
+            if q:
+                remainder = [scale * coef for coef in remainder]
+                for j in range(n + 1):
+                    remainder[k - n + j] -= q * divisor[j]
+        remainder = remainder[:n]
+        while remainder and remainder[-1] == 0:
+            remainder.pop()
+        if not remainder:
+            break
+        chain.append(_primitive([-coef for coef in remainder]))
+    return chain
+
+
+def _exact_sign(p, x):
+    """Sign of integer polynomial p at the float x, computed exactly"""
+    m, d = x.as_integer_ratio()
+    # sum p_i m^i d^(n - i) has the sign of p(m / d) since d > 0
+    value = p[-1]
+    power = 1
+    for coef in reversed(p[:-1]):
+        power *= d
+        value = value * m + coef * power
+    return _sign(value)
+
+
+def _exact_quotient(p, g):
+    """Positive multiple of p / g for integer polynomials, g dividing p"""
+    remainder = list(p)
+    quotient = [0] * (len(p) - len(g) + 1)
+    n = len(g) - 1
+    lead = g[-1]
+    scale = lead if lead > 0 else -lead
+    direction = 1 if lead > 0 else -1
+    for k in range(len(remainder) - 1, n - 1, -1):
+        q = remainder[k] * direction
+        if q:
+            if scale != 1:
+                remainder = [scale * coef for coef in remainder]
+                quotient = [scale * coef for coef in quotient]
+            for j in range(n + 1):
+                remainder[k - n + j] -= q * g[j]
+            quotient[k - n] = q
+    return _primitive(quotient)
+
+
+def _divide(p, g):
+    """Quotient of float polynomials p / g, remainder dropped"""
+    quotient = [0.0] * (len(p) - len(g) + 1)
+    remainder = list(p)
+    lead = g[-1]
+    n = len(g) - 1
+    for k in range(len(remainder) - 1, n - 1, -1):
+        q = remainder[k] / lead
+        quotient[k - n] = q
+        for j in range(n + 1):
+            remainder[k - n + j] -= q * g[j]
+    return quotient
+
+
+class SturmSequence:
+    """
+    Real root counting, isolation and refinement for a real polynomial
+    of any degree, without computing its complex roots.
+    coefficients are ordered from degree 0 upwards, like find_roots.
+    The Sturm chain is built in floating point; when cancellation makes
+    it irregular, or p has a multiple root, it is rebuilt exactly over
+    the integers, up to EXACT_DEGREE_LIMIT. Counts are of distinct roots.
+    """
+
+    def __init__(self, coefficients):
+        coefficients = [float(coef) for coef in coefficients]
+        while len(coefficients) > 1 and coefficients[-1] == 0:
+            coefficients.pop()
+        if not any(coefficients):
+            raise ValueError("Every real number is a root of the zero polynomial")
+        self.coefficients = coefficients
+        self.degree = len(coefficients) - 1
+
+        chain, regular = _float_chain(coefficients)
+        # A chain can look regular while p has a multiple root, the
+        # remainder that should vanish being left as rounding noise
+        self.exact = self.degree <= EXACT_DEGREE_LIMIT and not (
+            regular and _is_square_free(_exact_integers(coefficients))
+        )
+        if self.exact:
+            chain = _exact_chain(coefficients)
+        gcd = chain[-1]
+        if len(gcd) > 1:
+            # Multiple roots: every member vanishes there. Dividing by
+            # gcd(p, p') leaves the chain of the square-free part
+            divide = _exact_quotient if self.exact else _divide
+            chain = [divide(p, gcd) for p in chain]
+        self.chain = chain
+        # Its roots are simple, so they change its sign
+        self._square_free = _normalized(chain[0])
+        # Roots are tested on the input coefficients where possible:
+        # normalizing can round a value that is exactly zero
+        self._first = coefficients if len(gcd) == 1 else self._square_free
+        # Refinement signs are exact whenever the integers stay small
+        self._exact_square_free = None
+        if self.exact:
+            self._exact_square_free = chain[0]
+        elif self.degree <= EXACT_DEGREE_LIMIT:
+            self._exact_square_free = _exact_integers(self._first)
+
+        # Cauchy bound: every root has |x| < bound
+        leading = abs(coefficients[-1])
+        self.bound = 1 + max((abs(coef) / leading for coef in coefficients[:-1]), default=0.0)
+        self.evaluations = 0
+
+    @classmethod
+    def from_polynomial(cls, polynomial):
+        """From a reduced Polynomial (or mapping) of exponent -> coefficient"""
+        if hasattr(polynomial, "dense_coefficients"):
+            return cls(polynomial.dense_coefficients())
+        degree = max(polynomial, default=0)
+        return cls([polynomial.get(exp, 0.0) for exp in range(degree + 1)])
+
+    def _sign_variations(self, x):
+        self.evaluations += 1
+        if x == INF or x == -INF:
+            return _variations(
+                _sign(p[-1]) * (-1 if x < 0 and len(p) % 2 == 0 else 1)
+                for p in self.chain
+            )
+        if self.exact:
+            return _variations(_exact_sign(p, x) for p in self.chain)
+        signs = [_sign(_evaluate(self._first, x))]
+        signs.extend(_sign(_evaluate(p, x)) for p in self.chain[1:])
+        return _variations(signs)
+
+    def is_root(self, x):
+        if self.exact:
+            return _exact_sign(self.chain[0], x) == 0
+        return _evaluate(self._first, x) == 0
+
+    def _bounds(self, low, high):
+        low = -INF if low is None else float(low)
+        high = INF if high is None else float(high)
+        if low > high:
+            raise ValueError("Interval must have low <= high")
+        return low, high
+
+    def count(self, low=None, high=None):
+        """Distinct real roots in [low, high]; None leaves that side unbounded"""
+        low, high = self._bounds(low, high)
+        if low == high:
+            return int(self.is_root(low))
+        # Sturm's theorem counts (low, high]; add low itself
+        count = self._sign_variations(low) - self._sign_variations(high)
+        if low != -INF and self.is_root(low):
+            count += 1
+        return count
+
+    def isolate(self, low=None, high=None):
+        """
+        Disjoint (low, high) intervals in ascending order, each holding
+        exactly one distinct root of [low, high]; a root hit exactly is
+        (x, x). Roots closer than float resolution share an interval.
+        """
+        low, high = self._bounds(low, high)
+        intervals = []
+        if low != -INF and self.is_root(low):
+            intervals.append((low, low))
+        if low == high:
+            return intervals
+        # Roots lie in (-bound, bound): clip infinite ends to it
+        start, end = max(low, -self.bound), min(high, self.bound)
+        if start >= end:
+            return intervals
+
+        pending = [(start, end, self._sign_variations(start), self._sign_variations(end))]
+        found = []
+        while pending:
+            a, b, va, vb = pending.pop()
+            count = va - vb
+            if count == 0:
+                continue
+            if count == 1:
+                found.append(self._shrink(a, b))
+                continue
+            mid = a + (b - a) / 2
+            if not a < mid < b:
+                # Float resolution reached: a cluster of roots
+                found.append((a, b))
+                continue
+            vm = self._sign_variations(mid)
+            pending.append((a, mid, va, vm))
+            pending.append((mid, b, vm, vb))
+        found.sort()
+        intervals.extend(found)
+        return intervals
+
+    def _shrink(self, a, b):
+        # Sturm counts (a, b]: a root exactly at b is found right away
+        if self.is_root(b):
+            return (b, b)
+        return (a, b)
+
+    def _signed_value(self, x):
+        """
+        (sign, value) of the square-free part at x. The sign is exact up
+        to EXACT_DEGREE_LIMIT; value is None where rounding flipped it.
+        """
+        value = _evaluate(self._square_free, x)
+        if self._exact_square_free is None:
+            return _sign(value), value
+        # Only values lost in rounding need the exact sign
+        if abs(value) > _rounding_bound(self._square_free, x):
+            return _sign(value), value
+        sign = _exact_sign(self._exact_square_free, x)
+        return sign, (value if _sign(value) == sign else None)
+
+    def refine(self, low, high, tolerance=DEFAULT_TOLERANCE,
+               max_iterations=DEFAULT_MAX_ITERATIONS):
+        """
+        Shrink an isolating interval from isolate() to width <= tolerance
+        (or float resolution) by the Illinois variant of regula falsi,
+        bisecting where values are unreliable. Should rounding hide the
+        sign change altogether, steps fall back to Sturm counts.
+        Returns (low, high).
+        """
+        if low == high:
+            return low, high
+        s_low, v_low = self._signed_value(low)
+        s_high, v_high = self._signed_value(high)
+        side = 0
+        for _ in range(max_iterations):
+            if high - low <= tolerance:
+                break
+            x = None
+            if s_low != s_high and v_low is not None and v_high is not None:
+                x = (low * v_high - high * v_low) / (v_high - v_low)
+            if x is None or not low < x < high:
+                x = low + (high - low) / 2
+                if not low < x < high:
+                    break
+
+            s_x, v_x = self._signed_value(x)
+            if s_x == 0:
+                return x, x
+            if s_low == s_high:
+                if self.count(x, high):
+                    low, s_low, v_low = x, s_x, v_x
+                else:
+                    high, s_high, v_high = x, s_x, v_x
+            elif s_x == s_high:
+                high, s_high, v_high = x, s_x, v_x
+                if side == 1 and v_low is not None:
+                    v_low /= 2
+                side = 1
+            else:
+                low, s_low, v_low = x, s_x, v_x
+                if side == -1 and v_high is not None:
+                    v_high /= 2
+                side = -1
+        return low, high
+
+    def real_roots(self, low=None, high=None, tolerance=DEFAULT_TOLERANCE):
+        """Every distinct real root in [low, high], ascending, within tolerance"""
+        roots = []
+        for a, b in self.isolate(low, high):
+            a, b = self.refine(a, b, tolerance)
+            roots.append(a + (b - a) / 2)
+        return roots
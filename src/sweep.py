@@ -0,0 +1,93 @@
+from polynomial import Polynomial
+from solver import Solver, SOLUTION_TYPES
+
+
+CSV_COLUMNS = (
+    "parameter", "solution_type", "discriminant",
+    "root1_real", "root1_imag", "root2_real", "root2_imag",
+)
+
+
+class SweepResult:
+    """Columnar roots of a quadratic template as one coefficient varies"""
+
+    def __init__(self, exponent, parameters, codes, discriminants, roots):
+        self.exponent = exponent
+        self.parameters = parameters
+        self.codes = codes
+        self.discriminants = discriminants
+        self.roots = roots
+
+    def __len__(self):
+        return len(self.parameters)
+
+    def events(self):
+        """(index, parameter, old_type, new_type) wherever the solution type changes"""
+        import numpy as np
+        codes = self.codes
+        changes = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+        return [
+            (int(i), float(self.parameters[i]),
+             SOLUTION_TYPES[int(codes[i - 1])], SOLUTION_TYPES[int(codes[i])])
+            for i in changes
+        ]
+
+    def columns(self):
+        """Float64 columns in CSV_COLUMNS order, solution types as codes"""
+        import numpy as np
+        return np.column_stack((
+            self.parameters, self.codes, self.discriminants,
+            self.roots[:, 0].real, self.roots[:, 0].imag,
+            self.roots[:, 1].real, self.roots[:, 1].imag,
+        ))
+
+    def write_csv(self, output):
+        output.write(",".join(CSV_COLUMNS) + "\n")
+        first, second = self.roots[:, 0], self.roots[:, 1]
+        types = [SOLUTION_TYPES[code] for code in self.codes.tolist()]
+        row = ",".join(["{}"] * len(CSV_COLUMNS)) + "\n"
+        output.writelines(map(
+            row.format,
+            self.parameters.tolist(), types, self.discriminants.tolist(),
+            first.real.tolist(), first.imag.tolist(),
+            second.real.tolist(), second.imag.tolist(),
+        ))
+
+    def save_npy(self, path):
+        """Structured array with one named field per CSV column"""
+        import numpy as np
+        table = np.empty(len(self), dtype=[
+            (name, np.int8 if name == "solution_type" else np.float64)
+            for name in CSV_COLUMNS
+        ])
+        for name, column in zip(CSV_COLUMNS, self.columns().T):
+            table[name] = column
+        np.save(path, table)
+
+
+def sweep(template, exponent, values):
+    """
+    Solve the reduced quadratic template once per value, with the
+    X^exponent coefficient replaced by that value, in one Solver.solve_many
+    pass. The template's own X^exponent coefficient is ignored.
+    """
+    # Sweeps are vectorized, numpy is required to run them; imported
+    # here so that loading this module stays cheap
+    try:
+        import numpy as np
+    except ImportError:
+        raise ImportError("sweep requires numpy") from None
+    if exponent not in (0, 1, 2):
+        raise ValueError("Only the X^0, X^1 or X^2 coefficient can be swept")
+    if not isinstance(template, Polynomial):
+        template = Polynomial(template)
+    if max((exp for exp, coef in template.items() if coef and exp != exponent), default=0) > 2:
+        raise ValueError("Sweeps need a template of degree at most 2")
+
+    parameters = np.asarray(values, dtype=np.float64).ravel()
+    coefficients = [
+        parameters if exp == exponent else template.get(exp, 0.0)
+        for exp in (2, 1, 0)
+    ]
+    codes, discriminants, roots = Solver.solve_many(*coefficients)
+    return SweepResult(exponent, parameters, codes, discriminants, roots)
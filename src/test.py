@@ -1,5 +1,22 @@
-from expression_parser import ExpressionParser
-from solver import Solver, ComplexNumber
+from expression_parser import ExpressionParser, ParseError
+from solver import Solver, ComplexNumber, SolveResult, SolutionKind, SOLUTION_TYPES
+from formatter import OutputFormatter
+from root_finder import approximate_roots
+from pipeline import iter_records, run_batch, dedup_cache, dedup_summary
+from parallel import solve_parallel, solve_mapped_parallel, solve_threaded, solve_mapped_threaded
+from mapped_reader import mapped_file, iter_mapped_records, split_ranges
+from server import SolverServer
+from numeric import sqrt, isqrt, nth_root, cos_sin, atan2, PI
+from polynomial import Polynomial, DENSE_LIMIT
+from instrumentation import STAGE_STATS
+from session import SolveSession
+from sweep import sweep
+from result_store import ResultStore
+from binary_format import MAGIC, iter_binary, convert_to_jsonl, convert_to_text
+from structured_input import (
+    iter_json_equations, iter_array_equations, iter_packed_equations, pack_terms, INPUT_MAGIC,
+)
+from benchmark import generate_workload, compare_to_baseline
 
 
 def unit_test_parser():
@@ -120,6 +137,68 @@ def unit_test_parser():
         assert right == {2: 1.41}
         return "✓ Test 14: Decimal coefficients"
     
+    # Test 15: Invalid term reports its offset (should raise error)
+    def test_invalid_term_position():
+        equation = "5 * X^0 + 4 * X = 1 * X^0"
+        try:
+            parser.parse(equation)
+            return "✗ Test 15: Should have raised ParseError"
+        except ParseError as e:
+            assert e.position == 5, f"Expected position 5, got {e.position}"
+            assert "invalid term '+4*X'" in str(e)
+            return "✓ Test 15: Invalid term position"
+    
+    # Test 16: Invalid character reports its own offset
+    def test_invalid_character_position():
+        equation = "5 * X^0 = 3 * Y^1"
+        try:
+            parser.parse(equation)
+            return "✗ Test 16: Should have raised ParseError"
+        except ParseError as e:
+            assert e.position == 8, f"Expected position 8, got {e.position}"
+            assert "invalid character 'Y'" in str(e)
+            return "✓ Test 16: Invalid character position"
+    
+    # Test 17: Query methods share one cached parse
+    def test_parse_cache_counters():
+        cached = ExpressionParser(cache_size=2)
+        equation = "5 * X^0 + 4 * X^2 = 1 * X^1"
+        cached.get_max_degree(equation)
+        cached.get_all_degrees("5*X^0+4*X^2=1*X^1")
+        cached.has_term(equation, 1)
+        info = cached.cache_info()
+        assert info["misses"] == 1 and info["hits"] == 2, f"Unexpected counters: {info}"
+        
+        cached.parse("1 * X^0 = 1 * X^0")
+        cached.parse("2 * X^0 = 1 * X^0")
+        assert cached.cache_info()["evictions"] == 1
+        cached.clear_cache()
+        assert cached.cache_info()["size"] == 0
+        return "✓ Test 17: Parse cache counters"
+    
+    # Test 18: Cached results are not shared mutable state
+    def test_parse_cache_isolation():
+        cached = ExpressionParser()
+        left, right = cached.parse("2 * X^1 = 5 * X^0")
+        left[1] = 100.0
+        left_again, _ = cached.parse("2 * X^1 = 5 * X^0")
+        assert left_again == {1: 2.0}, f"Cache was mutated: {left_again}"
+        assert ExpressionParser(cache_size=0).cache_info() is None
+        return "✓ Test 18: Parse cache isolation"
+    
+    # Test 19: Bytes and memoryview equations parse without decoding
+    def test_bytes_input():
+        equation = "5 * X^0 + 4 * X^1 - 9.3 * X^2 = 1 * X^0"
+        expected = parser.parse_reduced(equation)
+        assert parser.parse_reduced(equation.encode()) == expected
+        assert parser.parse_reduced(memoryview(equation.encode())) == expected
+        try:
+            parser.parse(b"5 * X^0 + 4 * Y^1 = 0 * X^0")
+            assert False, "Should have raised ParseError"
+        except ParseError as e:
+            assert e.position == 8 and "'Y'" in str(e), f"Got {e}"
+        return "✓ Test 19: Bytes input"
+    
     # Run all tests
     tests = [
         test_basic_quadratic,
@@ -136,6 +215,11 @@ def unit_test_parser():
         test_get_all_degrees,
         test_has_term,
         test_decimal_coefficients,
+        test_invalid_term_position,
+        test_invalid_character_position,
+        test_parse_cache_counters,
+        test_parse_cache_isolation,
+        test_bytes_input,
     ]
     
     results = []
@@ -257,22 +341,42 @@ def test_solver():
         print("  No solution")
         print("  ✓ Passed")
     
-    # Test 7: Cubic equation (degree > 2, unsolvable)
-    def test_cubic_unsolvable():
-        print("\nTest 7: Cubic equation (unsolvable)")
-        print("Equation: 5 * X^0 - 6 * X^1 - 5.6 * X^3 = 0")
-        reduced = {0: 5.0, 1: -6.0, 3: -5.6}
+    # Test 7: Cubic equation (closed form)
+    def test_cubic_closed_form():
+        print("\nTest 7: Cubic equation (closed form)")
+        print("Equation: -6 * X^0 + 11 * X^1 - 6 * X^2 + 1 * X^3 = 0")
+        # (x - 1)(x - 2)(x - 3) = 0
+        reduced = {0: -6.0, 1: 11.0, 2: -6.0, 3: 1.0}
         solver = Solver(reduced)
         solution_type, discriminant, solutions = solver.solve()
         
-        assert solution_type == "unsolvable", f"Expected 'unsolvable', got {solution_type}"
-        assert len(solutions) == 0, f"Should have no solutions"
-        print("  Degree > 2, cannot solve")
+        assert solution_type == "cubic", f"Expected 'cubic', got {solution_type}"
+        assert discriminant == 4.0, f"Expected discriminant 4, got {discriminant}"
+        assert len(solutions) == 3, f"Should have 3 solutions, got {len(solutions)}"
+        for root, expected in zip(solutions, [1.0, 2.0, 3.0]):
+            assert isinstance(root, float), f"Root should be real: {root}"
+            assert abs(root - expected) < 1e-12, f"Expected {expected}, got {root}"
+        assert solver.root_finder_result is None, "Closed form must not iterate"
+        print(f"  Solutions: {', '.join(str(root) for root in solutions)}")
+        print("  ✓ Passed")
+    
+    # Test 8: High degree with complex roots (x^40 + x + 1 = 0)
+    def test_high_degree_numeric():
+        print("\nTest 8: High degree numeric roots")
+        print("Equation: 1 * X^0 + 1 * X^1 + 1 * X^40 = 0")
+        reduced = {0: 1.0, 1: 1.0, 40: 1.0}
+        solution_type, discriminant, solutions = Solver(reduced).solve()
+        
+        assert solution_type == "numeric", f"Expected 'numeric', got {solution_type}"
+        assert len(solutions) == 40, f"Should have 40 solutions, got {len(solutions)}"
+        for root in solutions:
+            x = root.value
+            assert abs(x ** 40 + x + 1) < 1e-9, f"Not a root: {root}"
         print("  ✓ Passed")
     
-    # Test 8: Simple quadratic (x^2 - 4 = 0, solutions: x = ±2)
+    # Test 9: Simple quadratic (x^2 - 4 = 0, solutions: x = ±2)
     def test_simple_quadratic():
-        print("\nTest 8: Simple quadratic")
+        print("\nTest 9: Simple quadratic")
         print("Equation: -4 * X^0 + 0 * X^1 + 1 * X^2 = 0")
         reduced = {0: -4.0, 1: 0.0, 2: 1.0}
         solver = Solver(reduced)
@@ -287,9 +391,9 @@ def test_solver():
         print(f"  Solutions: {solutions[0]}, {solutions[1]}")
         print("  ✓ Passed")
     
-    # Test 9: Quadratic with fractional coefficients
+    # Test 10: Quadratic with fractional coefficients
     def test_fractional_coefficients():
-        print("\nTest 9: Quadratic with fractional coefficients")
+        print("\nTest 10: Quadratic with fractional coefficients")
         print("Equation: 0.5 * X^0 + 1.5 * X^1 + 2.5 * X^2 = 0")
         reduced = {0: 0.5, 1: 1.5, 2: 2.5}
         solver = Solver(reduced)
@@ -303,9 +407,9 @@ def test_solver():
         print(f"  Complex solutions: {solutions[0]}, {solutions[1]}")
         print("  ✓ Passed")
     
-    # Test 10: Linear with negative solution
+    # Test 11: Linear with negative solution
     def test_linear_negative_solution():
-        print("\nTest 10: Linear with negative solution")
+        print("\nTest 11: Linear with negative solution")
         print("Equation: 10 * X^0 + 2 * X^1 = 0")
         reduced = {0: 10.0, 1: 2.0}
         solver = Solver(reduced)
@@ -317,6 +421,330 @@ def test_solver():
         print(f"  Solution: {solutions[0]}")
         print("  ✓ Passed")
     
+    # Test 12: Vectorized solve_many matches the scalar solver
+    def test_solve_many():
+        print("\nTest 12: Vectorized solve_many")
+        try:
+            import numpy as np
+        except ImportError:
+            print("  skipped: numpy not installed")
+            return
+        a = [1.0, 1.0, 5.0, 0.0, 0.0, 0.0]
+        b = [0.0, -2.0, 2.0, 4.0, 0.0, 0.0]
+        c = [-4.0, 1.0, 1.0, 1.0, 0.0, 3.0]
+        codes, discriminants, roots = Solver.solve_many(a, b, c)
+        
+        expected = ["positive", "zero", "negative", "linear", "infinite", "none"]
+        assert [SOLUTION_TYPES[code] for code in codes] == expected, f"Got codes {codes}"
+        assert discriminants[0] == 16 and np.isnan(discriminants[3])
+        for lane in (0, 1, 2, 3):
+            reduced = {2: a[lane], 1: b[lane], 0: c[lane]}
+            _, _, solutions = Solver(reduced).solve()
+            for i, solution in enumerate(solutions):
+                value = complex(solution.real, getattr(solution, "imaginary", 0))
+                assert abs(roots[lane, i] - value) < 1e-12, f"Lane {lane}: {roots[lane]}"
+        assert np.isnan(roots[1, 1]) and np.isnan(roots[4]).all()
+        print("  ✓ Passed")
+    
+    # Test 13: Polynomials in X^g are solved through y = X^g
+    def test_exponent_substitution():
+        print("\nTest 13: Exponent-GCD substitution")
+        solution_type, discriminant, solutions = Solver({4: 1.0, 2: -5.0, 0: 4.0}).solve()
+        assert solution_type == "substitution" and discriminant == 9.0
+        assert sorted(solutions) == [-2.0, -1.0, 1.0, 2.0], f"Got {solutions}"
+        
+        # X^5 (X^2 + 1): zero root factored out five times, then X = +/- i
+        # exactly, sorted by real then imaginary part like other paths
+        solution_type, _, solutions = Solver({7: 1.0, 5: 1.0}).solve()
+        assert solutions[1:6] == [0.0] * 5
+        assert [(s.real, s.imaginary) for s in solutions[::6]] == [(0.0, -1.0), (0.0, 1.0)]
+        assert Solver({4: 1.0, 2: 1.0}).solve().roots == [complex(0, -1), 0.0, 0.0, complex(0, 1)]
+        assert Solver({3: 1.0}).solve().roots == [0.0, 0.0, 0.0]
+        
+        # Degree 1000 but only three terms
+        solution_type, _, solutions = Solver(Polynomial({1000: 1.0, 500: 1.0, 0: -2.0})).solve()
+        assert solution_type == "substitution" and len(solutions) == 1000
+        for solution in solutions[::37]:
+            x = complex(solution.real, getattr(solution, "imaginary", 0.0))
+            assert abs(x ** 1000 + x ** 500 - 2) < 1e-10, f"Residual at {x}"
+        
+        # X^3 - 1 is linear in X^3; X^3 + X - 1 has no common step and is a plain cubic
+        assert Solver({3: 1.0, 0: -1.0}).solve()[0] == "substitution"
+        assert Solver({3: 1.0, 1: 1.0, 0: -1.0}).solve()[0] == "cubic"
+        
+        # Too many roots to list is an error, not an endless expansion
+        try:
+            Solver(Polynomial({99999999999: 1.0, 0: -1.0})).solve()
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            assert "too many roots" in str(e)
+        # Dense numeric iteration has a much lower cap than expansion
+        try:
+            Solver(Polynomial({501: 1.0, 1: 1.0, 0: 1.0})).solve()
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            assert "too high to solve numerically" in str(e)
+        print("  ✓ Passed")
+    
+    # Test 14: Incremental session edits without reparsing
+    def test_solve_session():
+        print("\nTest 14: SolveSession edits")
+        session = SolveSession.from_equation("5 * X^0 + 4 * X^1 - 9.3 * X^2 = 1 * X^0")
+        assert session.degree == 2 and abs(session.discriminant - 164.8) < 1e-9
+        first = session.solve()
+        assert session.solve() is first, "Unchanged session must not re-solve"
+        
+        session.set_coefficient(2, 0.0)
+        assert session.degree == 1 and session.discriminant is None
+        assert session.solve() == ("linear", None, [-1.0])
+        
+        session.add_term(2, 1.0)
+        assert session.degree == 2 and session.discriminant == 4 ** 2 - 4 * 1.0 * 4.0
+        assert session.solve()[0] == "zero"
+        
+        # Degree > 4 warm-starts from the previous roots
+        session.set_coefficient(5, 1.0)
+        session.set_coefficient(1, 3.0)
+        cold_type, _, cold_roots = session.solve()
+        cold_iterations = session.iterations
+        session.add_term(0, 1e-3)
+        solution_type, _, roots = session.solve()
+        assert cold_type == solution_type == "numeric"
+        assert session.iterations < cold_iterations
+        for root in roots:
+            x = root.value
+            assert abs(x ** 5 + x ** 2 + 3 * x + 4.001) < 1e-9, f"Not a root: {root}"
+        assert session.solves == 5
+        
+        # A huge b overflows the discriminant to inf instead of raising
+        session = SolveSession({0: 1.0, 1: 2.0, 2: 1.0})
+        session.set_coefficient(1, 1e200)
+        assert session.discriminant == float("inf")
+        print("  ✓ Passed")
+    
+    # Test 15: Sweeping one coefficient in a single vectorized pass
+    def test_sweep():
+        print("\nTest 15: Coefficient sweep")
+        try:
+            import numpy as np
+        except ImportError:
+            print("  skipped: numpy not installed")
+            return
+        import io
+        result = sweep({2: 1.0, 1: 5.0, 0: 1.0}, 1, np.linspace(-3, 3, 7))
+        assert [SOLUTION_TYPES[code] for code in result.codes[:3]] == ["positive", "zero", "negative"]
+        assert result.discriminants.tolist() == [5.0, 0.0, -3.0, -4.0, -3.0, 0.0, 5.0]
+        assert result.events() == [
+            (1, -2.0, "positive", "zero"), (2, -1.0, "zero", "negative"),
+            (5, 2.0, "negative", "zero"), (6, 3.0, "zero", "positive"),
+        ]
+        output = io.StringIO()
+        result.write_csv(output)
+        lines = output.getvalue().splitlines()
+        assert lines[0].startswith("parameter,solution_type,discriminant")
+        assert lines[4] == "0.0,negative,-4.0,0.0,1.0,-0.0,-1.0", f"Got {lines[4]}"
+        try:
+            sweep({3: 1.0}, 0, [1.0])
+            assert False, "Cubic templates should be rejected"
+        except ValueError:
+            pass
+        print("  ✓ Passed")
+    
+    # Test 16: Sturm sequences count and isolate real roots only
+    def test_real_roots():
+        print("\nTest 16: Sturm real root counting")
+        import random
+        from sturm import SturmSequence
+        # (x - 1)^2 (x + 2) (x^2 + 1): a double root and a complex pair
+        solver = Solver({0: 2.0, 1: -3.0, 2: 2.0, 3: -2.0, 5: 1.0})
+        assert solver.count_real_roots() == 2
+        assert solver.count_real_roots(1, 5) == 1
+        assert solver.count_real_roots(-2, 1) == 2
+        assert solver.count_real_roots(-1.5, 0.5) == 0
+        assert solver.real_roots() == [-2.0, 1.0]
+        
+        # x^4 - 5x^2 + 4 = (x^2 - 1)(x^2 - 4): roots on interval ends count
+        sequence = SturmSequence([4.0, 0.0, -5.0, 0.0, 1.0])
+        assert sequence.count(-1, 1) == 2 and sequence.count(1, 1) == 1
+        intervals = sequence.isolate()
+        assert len(intervals) == 4
+        for (_, high), (low, _) in zip(intervals, intervals[1:]):
+            assert high <= low, f"Overlapping intervals {intervals}"
+        low, high = sequence.refine(*sequence.isolate(1.5, 3)[0], tolerance=1e-9)
+        assert high - low <= 1e-9 and low <= 2.0 <= high
+        
+        # (x-2)(x+5)(x+6)(x+8)(x-9)^2: the float chain looks regular, the
+        # double root is only caught by the exact square-free test
+        sequence = SturmSequence([-38880, 8964, 5928, -59, -145, -1, 1])
+        assert sequence.exact and sequence.count() == 5
+        assert [round(x, 9) for x in sequence.real_roots()] == [-8, -6, -5, 2, 9]
+        
+        # Agrees with the complex solver on random high degrees
+        rng = random.Random(7)
+        coefficients = [rng.uniform(-1, 1) for _ in range(61)]
+        roots, _ = approximate_roots(coefficients)
+        real = [root.real for root in roots if root.imaginary == 0]
+        found = SturmSequence(coefficients).real_roots()
+        assert len(found) == len(real)
+        assert all(abs(x - y) < 1e-9 for x, y in zip(found, real))
+        
+        try:
+            Solver({0: 0.0}).count_real_roots()
+            assert False, "The zero polynomial has no root count"
+        except ValueError:
+            pass
+        print("  ✓ Passed")
+    
+    # Test 17: Quartic closed form, and agreement with the iterative path
+    def test_quartic_closed_form():
+        print("\nTest 17: Quartic equation (closed form)")
+        import random
+        # (x - 1)(x - 2)(x - 3)(x - 4) = 0
+        solver = Solver({0: 24.0, 1: -50.0, 2: 35.0, 3: -10.0, 4: 1.0})
+        solution_type, discriminant, solutions = solver.solve()
+        assert (solution_type, discriminant) == ("quartic", 144.0)
+        assert all(abs(x - k) < 1e-12 for x, k in zip(solutions, [1, 2, 3, 4])), solutions
+        
+        # Two conjugate pairs come back as exact mirrors
+        _, _, pairs = Solver({0: 5.0, 1: 1.0, 2: 2.0, 3: 0.5, 4: 3.0}).solve()
+        assert [root.imaginary for root in pairs][:2] == [-pairs[1].imaginary, pairs[1].imaginary]
+        output = OutputFormatter.format_solution("quartic", None, pairs)
+        assert output.startswith("The polynomial is quartic, the 4 solutions are:")
+        
+        # Zero roots are exact, roots 1e6 apart keep their relative accuracy
+        _, _, roots = Solver({1: -6.0, 2: 11.0, 3: -6.0, 4: 1.0}).solve()
+        assert roots[0] == 0.0
+        _, _, roots = Solver({0: 1.0, 1: -1000.001, 2: 2.0, 3: -1000.001, 4: 1.0}).solve()
+        # (x - 1e-3)(x - 1e3)(x^2 + 1)
+        small, large = [root for root in roots if isinstance(root, float)]
+        assert abs(small - 1e-3) < 1e-18 and abs(large - 1e3) < 1e-12, roots
+        
+        rng = random.Random(7)
+        for _ in range(200):
+            degree = rng.choice((3, 4))
+            reduced = {k: rng.uniform(-1, 1) * 10 ** rng.uniform(-3, 3) for k in range(degree + 1)}
+            solution_type, _, closed = Solver(reduced).solve()
+            assert solution_type in ("cubic", "quartic"), solution_type
+            _, _, numeric = Solver(reduced)._solve_higher_degree()
+            assert len(closed) == degree
+            for root in closed:
+                z = complex(root.real, getattr(root, "imaginary", 0.0))
+                nearest = min(numeric, key=lambda approximate: abs(z - approximate.value))
+                assert abs(z - nearest.value) <= 2 * nearest.error + 1e-12 * abs(z), (
+                    f"{reduced}: {root} against {nearest}"
+                )
+        print("  ✓ Passed")
+    
+    # Test 18: Solve results are slotted and unpack like tuples
+    def test_solve_result():
+        print("\nTest 18: Slotted solve results")
+        import pickle
+        result = Solver({0: 2.0, 1: 2.0, 2: 1.0}).solve()
+        assert isinstance(result, SolveResult)
+        assert result.kind is SolutionKind.NEGATIVE and result.solution_type == "negative"
+        assert result == ("negative", -4.0, [complex(-1, 1), complex(-1, -1)])
+        assert result[0] == "negative" and len(result) == 3
+        assert not hasattr(result, "__dict__")
+        
+        # Complex roots are built-in complex numbers with the project's format
+        root = result.roots[0]
+        assert isinstance(root, complex) and not hasattr(root, "__dict__")
+        assert (root.imaginary, f"{root}", root * 2) == (1.0, "-1.0 + 1.0i", complex(-2, 2))
+        copy = pickle.loads(pickle.dumps(root))
+        assert type(copy) is ComplexNumber and copy == root
+        
+        # format_result and format_solution agree for names and kinds
+        numeric = Solver({0: -1.0, 1: 1.0, 5: 1.0}).solve()
+        assert not hasattr(numeric.roots[0], "__dict__")
+        text = OutputFormatter.format_result(numeric)
+        assert text == OutputFormatter.format_solution(*numeric)
+        assert text.splitlines()[1].endswith(")") and "error <=" in text
+        assert OutputFormatter.format_solution(SolutionKind.NONE, None, []) == "No solution."
+        assert OutputFormatter.format_solution("bogus", None, []) == "Unknown solution type."
+        print("  ✓ Passed")
+    
+    # Test 19: Ambiguous quadratics are solved again exactly, others stay on floats
+    def test_adaptive_precision():
+        print("\nTest 19: Exact escalation of ambiguous quadratics")
+        import io
+        import numpy as np
+        from pipeline import run_batch
+        # Plain equations stay on floats
+        result = Solver({0: 2.0, 1: -3.0, 2: 1.0}).solve()
+        assert result == ("positive", 1.0, [2.0, 1.0]) and not result.escalated
+        
+        # (x + 0.1)^2: the float discriminant is 6.9e-18, the written one 0
+        result = Solver({0: 0.01, 1: 0.2, 2: 1.0}).solve()
+        assert result == ("zero", 0.0, [-0.1]) and result.escalated
+        # One ulp above a double root the roots are complex
+        result = Solver({0: 1.0 + 2 ** -52, 1: 2.0, 2: 1.0}).solve()
+        assert result.solution_type == "negative" and result.escalated
+        # -b + sqrt(d) would cancel: the small root is c / (a * x) instead,
+        # accurate without escalating, and exactly 0 when c is
+        result = Solver({0: 1.0, 1: 1e8, 2: 1.0}).solve()
+        assert abs(result.roots[0] + 1e-08) <= 1e-23 and not result.escalated
+        assert result.roots[1] == -99999999.99999999
+        result = Solver({1: -911684.5029570224, 2: -0.92}).solve()
+        assert result.roots[1] == 0.0 and not result.escalated
+        # A zero constant term gives +0.0, never -0.0, on both paths
+        for b in (2.0, -2.0):
+            assert str(Solver({1: b, 2: 1.0}).solve().roots) in ("[0.0, -2.0]", "[2.0, 0.0]")
+        _, _, roots = Solver.solve_many([1.0, 1.0], [2.0, -2.0], [0.0, 0.0])
+        assert str(roots.real.tolist()) == "[[0.0, -2.0], [2.0, 0.0]]"
+        # Non-finite coefficients never reach exact arithmetic
+        assert not Solver({0: 1.0, 2: float("inf")}).solve().escalated
+        
+        # Vectorized lanes escalate the same way
+        a, b, c = [1.0, 1.0, 2.0], [0.2, 2.0, 1.0], [0.01, 1.0 + 2 ** -52, -1.0]
+        codes, discriminants, roots = Solver.solve_many(a, b, c)
+        for lane in range(3):
+            expected = Solver({0: c[lane], 1: b[lane], 2: a[lane]}).solve()
+            assert SOLUTION_TYPES[codes[lane]] == expected.solution_type
+            assert discriminants[lane] == expected.discriminant
+            assert list(roots[lane][:len(expected.roots)]) == expected.roots
+        codes, _, roots = Solver.solve_many([1.0, 1.0], [1e8, -1e8], [1.0, 0.0])
+        assert abs(roots[0][0] + 1e-08) <= 1e-23 and roots[1][1] == 0.0
+        Solver.solve_many([np.nan, np.inf, 1.0], [1.0, 1.0, np.inf], [1.0, 1.0, 1.0])
+        
+        # Reduction drops what is left of terms that cancelled, relative to
+        # the terms added together at that exponent only
+        parser = ExpressionParser(strict_mode=True)
+        assert parser.parse_reduced("0.1 * X^0 + 0.2 * X^0 - 0.3 * X^0 = 0 * X^0") == {0: 0.0}
+        assert parser.parse_reduced("0.000000000001 * X^1 = 0.000000000002 * X^0") == {
+            0: -2e-12, 1: 1e-12
+        }
+        assert 2 in parser.parse_reduced("0.0000000000001 * X^2 + 1 * X^1 = 1 * X^0")
+        assert Solver({0: 1e-12}).solve()[0] == "none"
+        reduced = parser.parse_reduced("1 * X^1 = 100000000000000000 * X^0")
+        assert Solver(reduced).solve() == ("linear", None, [1e17])
+        reduced = parser.parse_reduced("1 * X^2 + 100000000000000000000 * X^1 + 1 * X^0 = 0 * X^0")
+        assert reduced == {0: 1.0, 1: 1e20, 2: 1.0}
+        assert Solver(reduced).solve().roots == [-1e-20, -1e20]
+        assert ExpressionParser.reduce_equation({0: 1.0, 1: 1e20}) == {0: 1.0, 1: 1e20}
+        
+        # Numbers beyond float range are rejected, not read as inf
+        for equation in ("9" * 400 + " * X^2 + 1 * X^0 = 0 * X^0",
+                         "1 * X^2 = " + "9" * 400 + " * X^0"):
+            try:
+                parser.parse_reduced(equation)
+                assert False, "Should have raised ParseError"
+            except ParseError as e:
+                assert "out of range" in str(e)
+        try:
+            ExpressionParser.reduce_equation({0: 1e308}, {0: -1e308})
+            assert False, "Should have raised ValueError"
+        except ValueError as e:
+            assert "must be finite" in str(e)
+        
+        output = io.StringIO()
+        stats = run_batch([
+            "1 * X^2 + 0.2 * X^1 + 0.01 * X^0 = 0 * X^0",
+            "1 * X^2 - 3 * X^1 + 2 * X^0 = 0 * X^0",
+        ], output)
+        assert stats.escalated == 1 and "1 escalated" in str(stats)
+        assert '"escalated":true' in output.getvalue().splitlines()[0]
+        print("  ✓ Passed")
+    
     # Run all tests
     tests = [
         test_quadratic_positive_discriminant,
@@ -325,10 +753,19 @@ def test_solver():
         test_linear_equation,
         test_infinite_solutions,
         test_no_solution,
-        test_cubic_unsolvable,
+        test_cubic_closed_form,
+        test_high_degree_numeric,
         test_simple_quadratic,
         test_fractional_coefficients,
         test_linear_negative_solution,
+        test_solve_many,
+        test_exponent_substitution,
+        test_solve_session,
+        test_sweep,
+        test_real_roots,
+        test_quartic_closed_form,
+        test_solve_result,
+        test_adaptive_precision,
     ]
     
     passed = 0
@@ -353,6 +790,638 @@ def test_solver():
     return passed == len(tests)
 
 
+def run_test_group(tests):
+    """Run print-style tests, counting assertion failures and errors"""
+    passed = 0
+    failed = 0
+    
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except AssertionError as e:
+            print(f"  ✗ FAILED: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"  ✗ ERROR: {e}")
+            failed += 1
+    
+    print("\n" + "="*60)
+    print(f"RESULTS: {passed} passed, {failed} failed out of {len(tests)} tests")
+    print("="*60)
+    
+    return passed == len(tests)
+
+
+def test_pipeline():
+    """Test batch solving through the shared pipeline"""
+    
+    print("="*60)
+    print("TESTING BATCH PIPELINE")
+    print("="*60)
+    
+    # Test 1: One record per non-empty line, errors recorded not raised
+    def test_batch_records():
+        print("\nTest 1: Batch records with per-line errors")
+        lines = [
+            "5 * X^0 + 4 * X^1 = 4 * X^0",
+            "",
+            "5 * X = 0",
+            "1 * X^0 + 2 * X^1 + 5 * X^2 = 0 * X^0",
+        ]
+        records = list(iter_records(lines))
+        
+        assert [r["line"] for r in records] == [1, 3, 4], f"Unexpected lines: {records}"
+        assert records[0]["solution_type"] == "linear"
+        assert records[0]["roots"] == [-0.25]
+        assert "error" in records[1], "Invalid line should carry an error"
+        assert records[2]["roots"][0] == {"real": -0.2, "imag": 0.4}
+        print("  ✓ Passed")
+    
+    # Test 2: JSON Lines output and throughput counters
+    def test_run_batch_output():
+        print("\nTest 2: JSON Lines output")
+        import io
+        import json
+        output = io.StringIO()
+        stats = run_batch(["6 * X^0 = 6 * X^0", "5 * X^0"], output)
+        
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert len(records) == 2, f"Expected 2 records, got {len(records)}"
+        assert records[0]["solution_type"] == "infinite"
+        assert "missing '=' sign" in records[1]["error"]
+        assert stats.equations == 2 and stats.errors == 1
+        print(f"  {stats}")
+        
+        # Without an output, records go to whatever sys.stdout is now
+        from contextlib import redirect_stdout
+        redirected = io.StringIO()
+        with redirect_stdout(redirected):
+            run_batch(["6 * X^0 = 6 * X^0", "5 * X^0"])
+        assert redirected.getvalue() == output.getvalue()
+        
+        # Overflowed values are null, never the non-standard Infinity/NaN
+        line = OutputFormatter.format_json(
+            {"discriminant": float("inf"), "roots": [1.0, {"real": float("nan"), "imag": 0.0}]}
+        )
+        assert line == '{"discriminant":null,"roots":[1.0,{"real":null,"imag":0.0}]}'
+        print("  ✓ Passed")
+    
+    # Test 3: Process pool keeps input order and per-line errors
+    def test_parallel_ordered():
+        print("\nTest 3: Parallel solving matches serial output")
+        lines = [f"{i} * X^0 + 1 * X^1 = 0 * X^0" for i in range(50)]
+        lines[7] = "7 * X^0 +"
+        serial = list(iter_records(lines))
+        ordered = list(solve_parallel(lines, workers=2, chunk_size=8))
+        unordered = list(solve_parallel(lines, workers=2, chunk_size=8, ordered=False))
+        
+        assert ordered == serial, "Ordered parallel output differs from serial"
+        assert sorted(unordered, key=lambda r: r["line"]) == serial
+        assert "error" in ordered[7]
+        print("  ✓ Passed")
+    
+    # Test 4: Socket service answers pipelined requests in order
+    def test_server_pipelining():
+        print("\nTest 4: Pipelined requests over the socket service")
+        import json
+        import asyncio
+        
+        async def round_trip():
+            server = await SolverServer(max_in_flight=2).start_tcp("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            requests = [{"id": i, "equation": f"{i} * X^0 + 2 * X^1 = 0 * X^0"} for i in range(20)]
+            writer.write("".join(json.dumps(r) + "\n" for r in requests).encode())
+            writer.write(b"not json\n")
+            writer.write_eof()
+            responses = [json.loads(await reader.readline()) for _ in range(21)]
+            # The server hangs up once every queued request is answered
+            assert await reader.read() == b""
+            writer.close()
+            await writer.wait_closed()
+            server.close()
+            await server.wait_closed()
+            return responses
+        
+        responses = asyncio.run(round_trip())
+        assert [r["id"] for r in responses[:20]] == list(range(20))
+        assert responses[5]["roots"] == [-2.5]
+        assert responses[20] == {"id": None, "error": "Invalid request"}
+        
+        # Only string equations are parsed: an int is no byte count
+        server = SolverServer()
+        for equation in (300000000, None, ["1 * X^0 = 1 * X^0"]):
+            line = json.dumps({"id": 1, "equation": equation}).encode()
+            assert json.loads(server.answer(line)) == {"id": None, "error": "Invalid request"}
+        try:
+            server.parser.parse(300000000)
+            assert False, "Should have raised TypeError"
+        except TypeError as e:
+            assert "str or bytes" in str(e)
+        print("  ✓ Passed")
+    
+    # Test 5: Benchmark workloads are reproducible and follow the mix
+    def test_benchmark_workload():
+        print("\nTest 5: Seeded benchmark workload and baseline comparison")
+        workload = generate_workload(7, 200, term_count=6, max_degree=5, mix="real=1,complex=1")
+        assert workload == generate_workload(7, 200, term_count=6, max_degree=5, mix="real=1,complex=1")
+        types = {record["solution_type"] for record in iter_records(workload)}
+        assert types == {"positive", "negative"}
+        baseline = {"parse": 100.0, "solve": 100.0}
+        regressions = compare_to_baseline({"parse": 105.0, "solve": 130.0}, baseline, 0.10)
+        assert list(regressions) == ["solve"] and abs(regressions["solve"] - 0.3) < 1e-12
+        print("  ✓ Passed")
+    
+    # Test 6: Stage stats are collected only while enabled
+    def test_stage_stats():
+        print("\nTest 6: Per-stage instrumentation")
+        lines = ["1 * X^0 + 2 * X^1 = 0 * X^0", "1 * X^0 - 1 * X^2 = 0 * X^0", "2 * Y^0 = 0 * X^0"]
+        STAGE_STATS.reset()
+        list(iter_records(lines))
+        assert not STAGE_STATS.calls
+        
+        STAGE_STATS.enabled = True
+        try:
+            serial = list(iter_records(lines))
+            assert serial == list(iter_records(lines, ExpressionParser(strict_mode=True)))
+            assert STAGE_STATS.calls["normalize"] == 6 and STAGE_STATS.calls["solve"] == 4
+            assert STAGE_STATS.solution_types == {"linear": 2, "positive": 2}
+            assert STAGE_STATS.degrees == {1: 2, 2: 2}
+            # The unparsable third line is left out of the histogram
+            assert STAGE_STATS.term_counts == {"2-3": 4}
+            
+            STAGE_STATS.reset()
+            assert list(solve_parallel(lines, workers=2, chunk_size=1)) == serial
+            assert STAGE_STATS.calls["solve"] == 2 and STAGE_STATS.degrees == {1: 1, 2: 1}
+            assert "tokenize" in STAGE_STATS.report()
+        finally:
+            STAGE_STATS.enabled = False
+            STAGE_STATS.reset()
+        print("  ✓ Passed")
+    
+    # Test 7: Memory-mapped input parsed as bytes, serial and in byte ranges
+    def test_mapped_reader():
+        print("\nTest 7: Memory-mapped reader")
+        import os
+        import tempfile
+        lines = ["1 * X^0 + 2 * X^1 = 0 * X^0", "", "bad", "1 * X^0 - 1 * X^2 = 0 * X^0"] * 50
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "equations.txt")
+            with open(path, "wb") as f:
+                f.write("\r\n".join(lines).encode())
+            with open(path) as f:
+                expected = list(iter_records(f))
+            with mapped_file(path) as buffer:
+                assert list(iter_mapped_records(buffer)) == expected
+                ranges = list(split_ranges(buffer, 100))
+                assert ranges[0][0] == 0 and ranges[-1][1] == len(buffer)
+                for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                    assert end == start and buffer[end - 1:end] == b"\n"
+            assert list(solve_mapped_parallel(path, workers=2, range_size=100)) == expected
+            
+            empty = os.path.join(tmp, "empty.txt")
+            open(empty, "w").close()
+            with mapped_file(empty) as buffer:
+                assert list(iter_mapped_records(buffer)) == []
+        print("  ✓ Passed")
+    
+    # Test 8: Deduplicated batches solve each canonical form once
+    def test_dedup_batch():
+        print("\nTest 8: Canonical-form deduplication")
+        lines = [
+            "1 * X^0 - 3 * X^1 + 1 * X^2 + 1 * X^3 = 0 * X^0",
+            "-2 * X^3 - 2 * X^2 = 2 * X^0 - 6 * X^1",
+            "3 * X^0 + 3 * X^2 + 3 * X^3 = 9 * X^1",
+            "1 * X^0 + 1 * X^1 + 1 * X^2 + 1 * X^3 = 0 * X^0",
+        ]
+        solution_cache = dedup_cache()
+        records = list(iter_records(lines, solution_cache=solution_cache))
+        assert records == list(iter_records(lines))
+        # A cubic's discriminant scales with the fourth power of the factor
+        assert records[2]["discriminant"] == 81 * records[0]["discriminant"]
+        assert (solution_cache.hits, solution_cache.misses) == (1, 3)
+        assert "Deduplicated 1 of 4 equations" in dedup_summary(solution_cache)
+        
+        parallel_cache = dedup_cache()
+        assert list(solve_parallel(lines, workers=1, solution_cache=parallel_cache)) == records
+        assert (parallel_cache.hits, parallel_cache.misses) == (1, 3)
+        
+        # Quadratics are solved directly, without a lookup
+        quadratics = ["1 * X^0 - 3 * X^1 + 1 * X^2 = 0 * X^0", "3 * X^0 + 3 * X^2 = 9 * X^1"]
+        quadratic_cache = dedup_cache()
+        assert list(iter_records(quadratics, solution_cache=quadratic_cache)) == list(iter_records(quadratics))
+        assert (quadratic_cache.hits, quadratic_cache.misses, len(quadratic_cache)) == (0, 0, 0)
+        
+        # Near-multiples are different equations, whatever the input order
+        near = ["1 * X^3 - 2 * X^1 + 1 * X^0 = 0 * X^0",
+                "1 * X^3 - 2.0000000000001 * X^1 + 1 * X^0 = 0 * X^0"]
+        for order in (near, near[::-1]):
+            assert list(iter_records(order, solution_cache=dedup_cache())) == list(iter_records(order))
+        print("  ✓ Passed")
+    
+    # Test 9: Persistent result cache survives across stores and evicts
+    def test_result_store():
+        print("\nTest 9: Persistent result cache")
+        import os
+        import sqlite3
+        import tempfile
+        lines = [
+            "1 * X^0 - 3 * X^1 + 1 * X^2 + 1 * X^3 = 0 * X^0",
+            "1 * X^0 + 1 * X^1 + 1 * X^2 - 2 * X^4 = 0 * X^0",
+            "1 * X^0 + 1 * X^3 - 2 * X^5 = 0 * X^0",
+            "1 * X^0 + 1 * X^4 = 0 * X^0",
+        ]
+        expected = list(iter_records(lines))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.db")
+            with ResultStore(path) as store:
+                assert list(iter_records(lines, solution_cache=store)) == expected
+                assert (store.hits, store.misses, len(store)) == (0, 4, 4)
+            with ResultStore(path) as store:
+                assert list(iter_records(lines, solution_cache=store)) == expected
+                assert (store.hits, store.misses) == (4, 0)
+                assert "100.0% hit rate" in store.summary()
+            with ResultStore(path, max_entries=2) as store:
+                assert len(store) == 2 and store.evictions == 2
+            
+            # Results from another solver version are never served
+            with sqlite3.connect(path) as db:
+                db.execute("UPDATE meta SET value = 'stale' WHERE name = 'version'")
+            db.close()
+            with ResultStore(path) as store:
+                assert len(store) == 0
+                assert list(iter_records(lines, solution_cache=store)) == expected
+                assert store.misses == 4
+        print("  ✓ Passed")
+    
+    # Test 10: Binary records decode to the JSON records, minus the reduced form
+    def test_binary_output():
+        print("\nTest 10: Binary output format")
+        import io
+        import json
+        import numpy as np
+        from pipeline import write_packed
+        lines = [
+            "1 * X^0 - 3 * X^1 + 1 * X^2 = 0 * X^0",
+            "1 * X^0 + 1 * X^1 + 1 * X^2 = 0 * X^0",
+            "",
+            "2 * X^1 = 4 * X^0",
+            "5 * X^0 = 5 * X^0",
+            "1 * X^0 + 1 * X^3 - 2 * X^5 = 0 * X^0",
+            "1 * X^0 + 1 * X^4 = 0 * X^0",
+            "-8 * X^0 + 1 * X^6 = 0 * X^0",
+            "bad équation",
+        ]
+        expected = list(iter_records(lines))
+        for record in expected:
+            record.pop("reduced_form", None)
+        
+        output = io.BytesIO()
+        stats = write_packed(iter_records(lines, packed=True), output)
+        assert (stats.equations, stats.errors) == (8, 1)
+        data = output.getvalue()
+        assert data.startswith(MAGIC) and len(data) % 8 == 0
+        decoded = list(iter_binary(data))
+        assert [record.to_record() for record in decoded] == expected
+        
+        text = io.StringIO()
+        convert_to_jsonl(data, text)
+        assert [json.loads(line) for line in text.getvalue().splitlines()] == expected
+        
+        # Text conversion prints what main.py does, minus the reduced form
+        text = io.StringIO()
+        convert_to_text(data, text)
+        blocks = text.getvalue().split("\n\n")
+        assert len(blocks) == len(expected)
+        assert blocks[0] == "Polynomial degree: 2\n" + OutputFormatter.format_solution(
+            "positive", 5.0, Solver({0: 1.0, 1: -3.0, 2: 1.0}).solve().roots
+        )
+        assert blocks[-1].startswith("Error: ")
+        
+        # Roots are readable in place
+        assert decoded[0].root_array().tolist() == expected[0]["roots"]
+        complex_roots = decoded[1].root_array()
+        assert complex_roots.dtype == np.complex128 and complex_roots.base is not None
+        assert complex_roots[0] == complex(-0.5, 3 ** 0.5 / 2)
+        
+        assert list(solve_parallel(lines, workers=1, chunk_size=2, packed=True)) == \
+            list(iter_records(lines, packed=True))
+        try:
+            list(iter_binary(data[:-8]))
+            assert False, "truncated output accepted"
+        except ValueError:
+            pass
+        print("  ✓ Passed")
+    
+    # Test 11: Structured coefficients give the same records as text
+    def test_structured_input():
+        print("\nTest 11: Structured coefficient input")
+        import numpy as np
+        from pipeline import iter_terms_records
+        lines = [
+            "2 * X^0 - 3 * X^1 + 1 * X^2 = 0 * X^0",
+            "1 * X^0 + 1 * X^1 + 1 * X^2 = 0 * X^0",
+            "4 * X^0 + 2 * X^1 = 0 * X^0",
+            "1 * X^0 + 1 * X^3 - 2 * X^5 = 0 * X^0",
+        ]
+        rows = [[2, -3, 1, 0, 0, 0], [1, 1, 1, 0, 0, 0], [4, 2, 0, 0, 0, 0], [1, 0, 0, 1, 0, -2]]
+        expected = list(iter_records(lines))
+        
+        json_lines = ["[2, -3, 1]", '{"0": 1, "1": 1, "2": 1.0}', "", "[4, 2]", '{"3": 1, "0": 1, "5": -2}']
+        records = list(iter_terms_records(iter_json_equations(json_lines)))
+        for record, line_number in zip(records, (1, 2, 4, 5)):
+            assert record.pop("line") == line_number
+        assert records == [{k: v for k, v in r.items() if k != "line"} for r in expected]
+        
+        assert list(iter_terms_records(iter_array_equations(np.array(rows)))) == expected
+        packed = INPUT_MAGIC + b"".join(
+            pack_terms([(k, c) for k, c in enumerate(row) if c]) for row in rows
+        )
+        assert list(iter_terms_records(iter_packed_equations(packed))) == expected
+        assert list(iter_terms_records(iter_packed_equations(packed), packed=True)) == \
+            list(iter_records(lines, packed=True))
+        
+        # Bad input is an error record, not an aborted stream
+        bad = ['[1, "x"]', "[1, 2", '{"a": 1}', "[1e999]", '{"-1": 2}', "3", "[1, 1]"]
+        records = list(iter_terms_records(iter_json_equations(bad)))
+        assert all("error" in record for record in records[:-1])
+        assert records[-1]["roots"] == [-1.0]
+        nan = list(iter_terms_records(iter_array_equations(np.array([1.0, np.nan]))))
+        assert "finite" in nan[0]["error"]
+        print("  ✓ Passed")
+    
+    # Test 12: Verified batches carry residuals and condition estimates
+    def test_verify_records():
+        print("\nTest 12: Verified batch records")
+        from pipeline import iter_terms_records
+        lines = [
+            "2 * X^0 - 3 * X^1 + 1 * X^2 = 0 * X^0",
+            "1 * X^0 - 2 * X^1 + 1 * X^2 = 0 * X^0",
+            "1 * X^0 + 1 * X^1 + 1 * X^7 = 0 * X^0",
+            "5 * X^0 = 5 * X^0",
+            "not an equation",
+        ]
+        plain = list(iter_records(lines))
+        verified = list(iter_records(lines, verify=True))
+        for record, expected in zip(verified, plain):
+            stripped = {k: v for k, v in record.items() if k not in ("residuals", "conditions")}
+            assert stripped == expected, "verify must only add fields"
+            if "error" in record:
+                assert "residuals" not in record
+                continue
+            assert len(record["residuals"]) == len(record["conditions"]) == len(record["roots"])
+        assert verified[0]["residuals"] == [0.0, 0.0] and verified[0]["conditions"] == [12.0, 6.0]
+        # The double root is ill-conditioned: no finite estimate
+        assert verified[1]["conditions"] == [None]
+        assert all(r < 1e-12 for r in verified[2]["residuals"])
+        assert verified[3]["residuals"] == []
+        
+        terms = list(iter_terms_records([(1, {0: 2.0, 1: -3.0, 2: 1.0})], verify=True))
+        assert terms[0]["residuals"] == verified[0]["residuals"]
+        assert list(solve_parallel(lines, workers=2, verify=True)) == list(iter_records(lines, verify=True))
+        print("  ✓ Passed")
+    
+    # Test 13: Thread pools match the serial pipeline and share one cache
+    def test_threaded():
+        print("\nTest 13: Thread-pool batches")
+        import os
+        import tempfile
+        import threading
+        from cache import LRUCache
+        lines = [f"{k % 7} * X^0 + {k % 5 + 1} * X^1 + 1 * X^3 = 0 * X^0" for k in range(300)]
+        lines[17] = "not an equation"
+        expected = list(iter_records(lines))
+        assert list(solve_threaded(lines, workers=4, chunk_size=7)) == expected
+        unordered = list(solve_threaded(lines, workers=4, chunk_size=7, ordered=False))
+        assert sorted(unordered, key=lambda record: record["line"]) == expected
+        
+        # Every thread deduplicates through the caller's cache directly
+        cache = dedup_cache()
+        assert list(solve_threaded(lines, workers=4, chunk_size=7, solution_cache=cache)) == expected
+        # Threads may both miss a form before either stores it
+        assert cache.hits + cache.misses == 299 and cache.misses >= 35
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "batch.txt")
+            with open(path, "w") as f:
+                f.write("\n".join(lines) + "\n")
+            mapped = list(solve_mapped_threaded(path, workers=3, range_size=100))
+            assert [record["line"] for record in mapped] == [record["line"] for record in expected]
+            assert mapped[0]["roots"] == expected[0]["roots"]
+            with ResultStore(os.path.join(tmp, "results.db")) as store:
+                assert list(solve_threaded(lines, workers=4, chunk_size=7, solution_cache=store)) == expected
+                assert store.hits + store.misses == 299
+        
+        # A tiny cache hammered from many threads evicts without losing entries
+        shared = LRUCache(4)
+        failures = []
+        def hammer(offset):
+            try:
+                for k in range(2000):
+                    if shared.get((k + offset) % 9) is None:
+                        shared.put((k + offset) % 9, k)
+            except Exception as e:
+                failures.append(e)
+        threads = [threading.Thread(target=hammer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not failures and len(shared) == 4
+        assert shared.hits + shared.misses == 16000
+        print("  ✓ Passed")
+    
+    return run_test_group([
+        test_batch_records,
+        test_run_batch_output,
+        test_parallel_ordered,
+        test_server_pipelining,
+        test_benchmark_workload,
+        test_stage_stats,
+        test_mapped_reader,
+        test_dedup_batch,
+        test_result_store,
+        test_binary_output,
+        test_structured_input,
+        test_verify_records,
+        test_threaded,
+    ])
+
+
+def test_numeric():
+    """Test the numeric kernel used by the solver"""
+    
+    print("="*60)
+    print("TESTING NUMERIC KERNEL")
+    print("="*60)
+    
+    # Test 1: sqrt terminates with full relative precision at any scale
+    def test_sqrt_range():
+        print("\nTest 1: sqrt across the float range")
+        for x in [1e-320, 1e-300, 0.25, 2.0, 1e20, 1.5e20, 1e300, 1.7976931348623157e308]:
+            root = sqrt(x)
+            assert abs(root * root / x - 1) < 1e-15 or root > 1e154, f"sqrt({x}) = {root}"
+        print("  ✓ Passed")
+    
+    # Test 2: perfect squares are exact
+    def test_sqrt_exact():
+        print("\nTest 2: exact integer square roots")
+        assert sqrt(16.0) == 4.0
+        assert sqrt(10**40) == 1e20
+        assert sqrt(2**104) == 2.0**52
+        assert isqrt(10**40 - 1) == 10**20 - 1
+        print("  ✓ Passed")
+    
+    # Test 3: nth roots, including odd roots of negatives and high orders
+    def test_nth_root():
+        print("\nTest 3: nth_root")
+        assert nth_root(8, 3) == 2.0
+        assert nth_root(-27, 3) == -3.0
+        assert abs(nth_root(2, 500) ** 500 - 2) < 1e-12
+        assert abs(nth_root(1e-300, 3) / 1e-100 - 1) < 1e-15
+        try:
+            nth_root(-16, 4)
+            assert False, "Even root of a negative number should raise"
+        except ValueError:
+            pass
+        print("  ✓ Passed")
+    
+    # Test 4: trigonometry used to expand roots of complex numbers
+    def test_cos_sin_atan2():
+        print("\nTest 4: cos_sin and atan2")
+        assert cos_sin(0.0) == (1.0, 0.0)
+        cos_value, sin_value = cos_sin(PI / 3)
+        assert abs(cos_value - 0.5) < 1e-15 and abs(sin_value - sqrt(3) / 2) < 1e-15
+        for theta in (-6.0, -2.5, -0.1, 0.7, 2.0, 3.1, 6.2):
+            cos_value, sin_value = cos_sin(theta)
+            assert abs(cos_value ** 2 + sin_value ** 2 - 1) < 1e-15
+            assert abs(atan2(sin_value, cos_value) - (theta + 2 * PI * ((theta < -PI) - (theta > PI)))) < 1e-14
+        assert atan2(1.0, 1.0) == PI / 4 and atan2(0.0, -2.0) == PI and atan2(0.0, 0.0) == 0.0
+        assert atan2(-1.0, 0.0) == -PI / 2
+        print("  ✓ Passed")
+    
+    return run_test_group([
+        test_sqrt_range,
+        test_sqrt_exact,
+        test_nth_root,
+        test_cos_sin_atan2,
+    ])
+
+
+def test_polynomial():
+    """Test the Polynomial coefficient container"""
+    
+    print("="*60)
+    print("TESTING POLYNOMIAL")
+    print("="*60)
+    
+    # Test 1: Dict-like view with explicit zero terms kept
+    def test_mapping_view():
+        print("\nTest 1: Mapping view")
+        poly = Polynomial({3: -5.6, 0: 8.0, 2: 0.0})
+        poly.add_term(0, -3.0)
+        assert poly == {0: 5.0, 2: 0.0, 3: -5.6}, f"Got {poly}"
+        assert poly.keys() == [0, 2, 3]
+        assert 2 in poly and 1 not in poly
+        assert poly.get(1, 0) == 0
+        assert poly.degree == 3 and poly.leading_coefficient == -5.6
+        assert poly.dense_coefficients() == [5.0, 0.0, 0.0, -5.6]
+        print("  ✓ Passed")
+    
+    # Test 2: Huge exponents switch to sparse storage
+    def test_sparse_switch():
+        print("\nTest 2: Sparse storage for huge exponents")
+        poly = Polynomial({0: 1.0, 2: 2.0})
+        assert not poly.is_sparse
+        poly.add_term(DENSE_LIMIT * 100, 3.0)
+        poly.add_term(5, 4.0)
+        assert poly.is_sparse
+        assert poly.items() == [(0, 1.0), (2, 2.0), (5, 4.0), (DENSE_LIMIT * 100, 3.0)]
+        assert poly.degree == DENSE_LIMIT * 100
+        print("  ✓ Passed")
+    
+    # Test 3: In-place subtract and reduce keep the cached degree honest
+    def test_subtract_reduce():
+        print("\nTest 3: In-place subtract and reduce")
+        for poly in (Polynomial({0: 4.0, 2: 1.0}), Polynomial({0: 4.0, 2: 1.0, 1000: 0.0})):
+            assert poly.degree == 2
+            poly.subtract({2: 1.0, 1: -2.0})
+            poly.reduce(1e-10)
+            assert poly == {0: 4.0, 1: 2.0}, f"Got {poly}"
+            assert poly.degree == 1
+        print("  ✓ Passed")
+    
+    # Test 4: Assignment and deletion in both storage modes
+    def test_set_delete():
+        print("\nTest 4: Item assignment and deletion")
+        for poly in (Polynomial({0: 0.1, 2: 0.7}), Polynomial({0: 0.1, 2: 0.7, 1000: 1.0})):
+            poly[2] = 0.3
+            assert poly[2] == 0.3, "Assignment must not round through a difference"
+            del poly[2]
+            assert 2 not in poly and poly.degree == (1000 if poly.is_sparse else 0)
+            try:
+                del poly[2]
+                assert False, "Deleting a missing term should raise"
+            except KeyError:
+                pass
+        print("  ✓ Passed")
+    
+    # Test 5: Scalar multiples share one canonical form
+    def test_canonical_form():
+        print("\nTest 5: Canonical form")
+        key, lead = Polynomial({0: 2.0, 1: -6.0, 2: 4.0}).canonical_form()
+        assert key == ((0, 1), (1, -3), (2, 2)) and lead == 4.0
+        assert Polynomial({2: -0.5, 1: 0.75, 0: -0.25}).canonical_form()[0] == key
+        assert Polynomial({0: 0.3, 2: 0.6}).canonical_form()[0] == ((0, 1), (2, 2))
+        assert Polynomial({0: 1.0, 2: 2.0}).canonical_form()[0] != key
+        # Exact: ratios one rounding apart are different equations
+        assert Polynomial({0: 0.1 + 0.2, 2: 0.6}).canonical_form()[0] != ((0, 1), (2, 2))
+        double = Polynomial({0: 1.0, 1: -2.0, 2: 1.0}).canonical_form()[0]
+        assert Polynomial({0: 1.0, 1: -2.0000000000001, 2: 1.0}).canonical_form()[0] != double
+        print("  ✓ Passed")
+    
+    # Test 6: Horner evaluation over scalars, lists, arrays and sparse terms
+    def test_evaluate():
+        print("\nTest 6: Polynomial evaluation")
+        import numpy as np
+        from evaluation import evaluate, verify_roots
+        cubic = {0: -6.0, 1: 11.0, 2: -6.0, 3: 1.0}
+        assert evaluate(cubic, 4.0) == 6.0
+        assert evaluate(cubic, 4.0, derivative=True) == (6.0, 11.0)
+        assert evaluate([-6.0, 11.0, -6.0, 1.0], [0, 1, 1j]) == [-6.0, 0.0, 10j]
+        
+        x = np.linspace(-3, 3, 13) + 0.5j
+        values, slopes = evaluate(Polynomial(cubic), x, derivative=True)
+        assert np.allclose(values, np.polyval([1, -6, 11, -6], x))
+        assert np.allclose(slopes, np.polyval([3, -12, 11], x))
+        
+        # Sparse exponents step over the gaps instead of through them
+        sparse = Polynomial({0: 1.0, 3: -1.0, 1000: 2.0})
+        assert sparse.is_sparse
+        values, slopes = evaluate(sparse, np.array([1.0, -1.0, 1.0001]), derivative=True)
+        assert np.allclose(values, [2.0, 4.0, 1 - 1.0001 ** 3 + 2 * 1.0001 ** 1000])
+        assert np.allclose(slopes, [1997.0, -2003.0, -3 * 1.0001 ** 2 + 2000 * 1.0001 ** 999])
+        assert evaluate({}, [1.0, 2.0]) == [0.0, 0.0]
+        
+        # Simple roots: condition = sum |c_k| |x|^k / |p'(x)|; a double root has none
+        checks = verify_roots(cubic, [1.0, 2.0, ComplexNumber(3.0, 0.0)])
+        assert checks == [(0.0, 24 / 2), (0.0, 60 / 1), (0.0, 120 / 2)]
+        residual, condition = verify_roots(cubic, [1.5])[0]
+        assert residual == 0.375 and abs(condition - 39.375 / 0.25) < 1e-12
+        assert verify_roots({0: 1.0, 1: -2.0, 2: 1.0}, [1.0]) == [(0.0, float("inf"))]
+        print("  ✓ Passed")
+    
+    return run_test_group([
+        test_mapping_view,
+        test_sparse_switch,
+        test_subtract_reduce,
+        test_set_delete,
+        test_canonical_form,
+        test_evaluate,
+    ])
+
+
 if __name__ == "__main__":
     all_passed = unit_test_parser()
 
@@ -362,4 +1431,19 @@ if __name__ == "__main__":
     all_passed_solver = test_solver()
 
     if all_passed_solver:
-        print("=============SOLVER PASSED!==============")
\ No newline at end of file
+        print("=============SOLVER PASSED!==============")
+
+    all_passed_pipeline = test_pipeline()
+
+    if all_passed_pipeline:
+        print("=============PIPELINE PASSED!==============")
+
+    all_passed_numeric = test_numeric()
+
+    if all_passed_numeric:
+        print("=============NUMERIC PASSED!==============")
+
+    all_passed_polynomial = test_polynomial()
+
+    if all_passed_polynomial:
+        print("=============POLYNOMIAL PASSED!==============")